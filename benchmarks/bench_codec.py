@@ -0,0 +1,116 @@
+"""
+Benchmark decoding and encoding datafile listings with each JSON codec.
+
+Builds pages of realistic (Tastypie) DataFile records, then reports each
+installed codec's throughput for decoding a page (as response.json() or
+mtclient.utils.jsoncodec.decode_response would) and for encoding its
+records as NDJSON, e.g.
+
+    $ python benchmarks/bench_codec.py --page-size 1000 --pages 20
+"""
+from __future__ import print_function
+
+import argparse
+import json
+import time
+
+from mtclient.utils.jsoncodec import CODECS, load_codec
+
+
+def datafile_page(page_size, offset=0):
+    """
+    Return a page of DataFile records, as returned by the MyTardis API.
+    """
+    objects = []
+    for index in range(offset + 1, offset + page_size + 1):
+        objects.append({
+            "id": index,
+            "created_time": "2016-11-10T13:50:25.258483",
+            "dataset": "/api/v1/dataset/1/",
+            "deleted": False,
+            "deleted_time": None,
+            "directory": "run%03d/scan" % (index // 1000),
+            "filename": "image%07d.tif" % index,
+            "md5sum": "%032x" % (index * 2654435761),
+            "mimetype": "image/tiff",
+            "modification_time": None,
+            "parameter_sets": [],
+            "replicas": [{
+                "created_time": "2016-11-10T13:50:25.301245",
+                "datafile": "/api/v1/dataset_file/%s/" % index,
+                "id": index,
+                "last_verified_time": "2016-11-10T13:51:02.114720",
+                "location": "local box at /home/mytardis/var/local",
+                "resource_uri": "/api/v1/replica/%s/" % index,
+                "uri": "dataset-1/run%03d/scan/image%07d.tif"
+                       % (index // 1000, index),
+                "verified": True
+            }],
+            "resource_uri": "/api/v1/dataset_file/%s/" % index,
+            "sha512sum": "",
+            "size": index * 4096,
+            "version": 1
+        })
+    return {
+        "meta": {
+            "limit": page_size,
+            "next": "/api/v1/dataset_file/?limit=%s&offset=%s"
+                    % (page_size, offset + page_size),
+            "offset": offset,
+            "previous": None,
+            "total_count": 1000000
+        },
+        "objects": objects
+    }
+
+
+def bench_codec(codec, pages):
+    """
+    Return the seconds taken by codec to decode pages (a list of UTF-8
+    encoded response bodies) and to encode their records as NDJSON.
+    """
+    start = time.time()
+    decoded = [codec.loads(page) for page in pages]
+    decode_time = time.time() - start
+    start = time.time()
+    for page in decoded:
+        "\n".join(codec.dumps(record, sort_keys=True)
+                  for record in page['objects'])
+    encode_time = time.time() - start
+    return decode_time, encode_time
+
+
+def main():
+    """
+    Run the benchmark.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--page-size", type=int, default=1000,
+                        help="The number of records per page.")
+    parser.add_argument("--pages", type=int, default=20,
+                        help="The number of pages.")
+    args = parser.parse_args()
+
+    pages = [json.dumps(datafile_page(args.page_size,
+                                      offset=page * args.page_size))
+             .encode('utf-8')
+             for page in range(args.pages)]
+    megabytes = sum(len(page) for page in pages) / 1e6
+    num_records = args.page_size * args.pages
+    print("%d pages, %d records, %.1f MB" % (args.pages, num_records,
+                                             megabytes))
+    for name in CODECS:
+        try:
+            codec = load_codec(name)
+        except ImportError:
+            print("%-7s not installed" % name)
+            continue
+        decode_time, encode_time = bench_codec(codec, pages)
+        print("%-7s decode %7.1f MB/s %9.0f records/s   "
+              "encode %9.0f records/s"
+              % (name, megabytes / decode_time, num_records / decode_time,
+                 num_records / encode_time))
+
+
+if __name__ == "__main__":
+    main()
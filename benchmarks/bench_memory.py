@@ -0,0 +1,93 @@
+"""
+Benchmark the memory used by model objects.
+
+Measures (with tracemalloc) the peak and retained memory of decoding a
+list response into DataFile and Dataset objects, and of iterating over a
+QuerySet of DataFile records (with and without streaming) served by a fake
+MyTardis server in a child process, and reports the bytes per record, e.g.
+
+    $ PYTHONPATH=. python benchmarks/bench_memory.py --records 20000
+    $ PYTHONPATH=. python benchmarks/bench_memory.py --drop-response-dicts
+
+tracemalloc requires Python 3.4 or later.
+"""
+from __future__ import print_function
+
+import argparse
+
+from mtclient.conf import config
+from mtclient.models.datafile import DataFile
+from mtclient.models.dataset import Dataset
+from mtclient.testing import FakeMyTardis, SyntheticData
+from mtclient.testing.memory import (
+    list_response, measure, queryset_count, queryset_models,
+    resultset_models)
+
+
+def synthetic_data(num_records):
+    """
+    Return synthetic data with num_records datasets, and num_records
+    datafiles in the first dataset.
+    """
+    data = SyntheticData().generate(datasets_per_experiment=num_records,
+                                    datafiles_per_dataset=0,
+                                    parameters=False)
+    dataset = data.get('dataset', 1)
+    storage_box = data.get('storagebox', 1)
+    for index in range(num_records):
+        data.add_datafile(dataset, "file%07d.dat" % index, index,
+                          storage_box=storage_box)
+    return data
+
+
+def report(name, num_records, usage):
+    """
+    Print a scenario's memory usage.
+    """
+    print("%-28s %8d records %12d peak %12d retained %8.0f bytes/record"
+          % (name, num_records, usage.peak, usage.retained,
+             usage.retained / num_records))
+
+
+def main():
+    """
+    Run the benchmark.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--records", type=int, default=20000,
+                        help="The number of DataFile and Dataset records.")
+    parser.add_argument("--drop-response-dicts", action="store_true",
+                        help="Don't keep each model's deserialized JSON "
+                        "(config.keep_response_dicts = False).")
+    args = parser.parse_args()
+    config.keep_response_dicts = not args.drop_response_dicts
+
+    data = synthetic_data(args.records)
+    for name, model, resource in [("ResultSet DataFile", DataFile,
+                                   'dataset_file'),
+                                  ("ResultSet Dataset", Dataset, 'dataset')]:
+        body = list_response(data, resource)
+        records, usage = measure(resultset_models, model, body)
+        report(name, len(records), usage)
+        del records
+
+    saved_url = config.url
+    server = FakeMyTardis(data).start(process=True)
+    config.url = server.url
+    try:
+        for stream in (False, True):
+            suffix = " (stream)" if stream else ""
+            records, usage = measure(queryset_models, DataFile,
+                                     filters="dataset__id=1", stream=stream)
+            report("QuerySet DataFile" + suffix, len(records), usage)
+            del records
+            count, usage = measure(queryset_count, DataFile,
+                                   filters="dataset__id=1", stream=stream)
+            report("QuerySet iteration" + suffix, count, usage)
+    finally:
+        config.url = saved_url
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Benchmark rendering a large datafile listing as a table.
+
+Renders a result set of synthetic DataFile records with Texttable, with
+FastTable, and with FastTable's column widths computed from a sample of
+the rows and the table written to a stream one line at a time (as the
+CLI does), and reports how long each takes, e.g.
+
+    $ python benchmarks/bench_render.py --records 100000
+"""
+from __future__ import print_function
+
+import argparse
+import os
+import time
+
+from texttable import Texttable
+
+from mtclient.models.datafile import DataFile
+from mtclient.models.resultset import ResultSet
+from mtclient.views import datafile as datafile_views
+from mtclient.views.table import FastTable, SAMPLE_SIZE
+
+
+def synthetic_datafiles(num_records):
+    """
+    Return a ResultSet containing num_records synthetic DataFile records.
+    """
+    objects = [
+        dict(id=index, dataset="/api/v1/dataset/1/", directory="",
+             filename="file%07d.tif" % index, size=index * 1024,
+             md5sum="%032x" % index,
+             replicas=[dict(id=index, location="default",
+                            uri="dataset-1/file%07d.tif" % index,
+                            verified=index % 10 != 0)])
+        for index in range(1, num_records + 1)
+    ]
+    return ResultSet(DataFile, "/api/v1/dataset_file/", dict(
+        meta=dict(total_count=num_records, limit=num_records, offset=0,
+                  next=None),
+        objects=objects))
+
+
+def time_render(datafiles, table_class, stream=None):
+    """
+    Return the number of seconds taken to render datafiles as a table,
+    using table_class for the table, and writing it to stream (if
+    supplied).
+    """
+    original_new_table = datafile_views.new_table
+    datafile_views.new_table = lambda num_rows: table_class()
+    try:
+        start = time.time()
+        datafile_views.render_datafiles_as_table(datafiles, stream=stream)
+        return time.time() - start
+    finally:
+        datafile_views.new_table = original_new_table
+
+
+def main():
+    """
+    Run the benchmark.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--records", type=int, default=100000,
+                        help="The number of DataFile records to render.")
+    parser.add_argument("--skip-texttable", action="store_true",
+                        help="Only time FastTable.")
+    args = parser.parse_args()
+
+    datafiles = synthetic_datafiles(args.records)
+    renderers = [
+        ("FastTable", FastTable, False),
+        ("Streamed", lambda: FastTable(sample_size=SAMPLE_SIZE), True)]
+    if not args.skip_texttable:
+        renderers.insert(
+            0, ("Texttable", lambda: Texttable(max_width=0), False))
+    with open(os.devnull, 'w') as devnull:
+        for name, table_class, streamed in renderers:
+            elapsed = time_render(datafiles, table_class,
+                                  devnull if streamed else None)
+            print("%-10s %8d records %8.2f s %10.0f records/s"
+                  % (name, args.records, elapsed, args.records / elapsed))
+
+
+if __name__ == "__main__":
+    main()
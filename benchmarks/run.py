@@ -0,0 +1,207 @@
+"""
+Run the performance benchmark suite and compare with a stored baseline.
+
+The benchmarks (see benchmarks/suite.py) cover QuerySet iteration over
+many pages, rendering and decoding large result sets, DataFile and Dataset
+downloads, MD5 sums of a large file and of many small files, creating
+DataFile records for a directory tree and CLI startup.  They run offline,
+against an in-process fake MyTardis server (see mtclient.testing).  The
+wan_* benchmarks download and upload datafiles concurrently with the
+latency, bandwidth caps and faults of a fault profile (--faults,
+default: wan), and also report the median and tail latencies and the
+number of errors.
+
+Each benchmark is run --repeat times, and its best time is reported as a
+rate (e.g. records/s).  The results are written as JSON (--output), and
+compared with the rates for the same size (and fault profile) in the
+baseline file: if any benchmark's rate is more than --tolerance below its
+baseline, the regressions are listed and the exit status is 1, e.g.
+
+    $ PYTHONPATH=. python benchmarks/run.py --size small
+    $ PYTHONPATH=. python benchmarks/run.py --size small --save-baseline
+    $ PYTHONPATH=. python benchmarks/run.py --size large create_datafiles
+    $ PYTHONPATH=. python benchmarks/run.py --faults lossy_wan wan_upload
+
+The baseline rates depend on the machine, so no baseline is committed to
+the repository (benchmarks/baseline.json is ignored by git).  Save one with
+--save-baseline on the machine which runs the comparison (e.g. in CI, run
+the benchmarks with --save-baseline on the base branch before running them
+on the branch being tested).  Without a baseline for the size, the rates
+are reported but nothing is reported as a regression.
+"""
+from __future__ import print_function
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+
+from mtclient.testing.faults import PROFILES
+from suite import BENCHMARKS, DEFAULT_FAULT_PROFILE, SIZES
+
+DEFAULT_BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(
+    __file__)), "baseline.json")
+
+
+def run_benchmark(name, params, repeat):
+    """
+    Run a benchmark repeat times, each in a new temporary directory.
+
+    :return: A dictionary with the best time (seconds), the amount of work
+        done, the unit, the rate (amount per second) and any other metrics
+        returned by the benchmark, from the run with the best rate.
+    """
+    func, unit = BENCHMARKS[name]
+    best = None
+    for _ in range(repeat):
+        workdir = tempfile.mkdtemp(prefix="mtclient-bench-")
+        try:
+            returned = func(params, workdir)
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
+        seconds, amount = returned[:2]
+        result = dict(returned[2] if len(returned) > 2 else {},
+                      seconds=seconds, amount=amount, unit=unit,
+                      rate=amount / seconds if seconds else None)
+        if best is None or (result['rate'] or 0) > (best['rate'] or 0):
+            best = result
+    return best
+
+
+def environment():
+    """
+    Describe the environment the benchmarks were run in.
+    """
+    from mtclient.utils.jsoncodec import get_codec
+    from mtclient.version import VERSION
+
+    return dict(python=platform.python_version(),
+                implementation=platform.python_implementation(),
+                platform=platform.platform(), machine=platform.machine(),
+                json_codec=get_codec().name, mtclient=VERSION,
+                time=time.strftime("%Y-%m-%dT%H:%M:%S"))
+
+
+def compare(results, baseline, tolerance):
+    """
+    Compare each benchmark's rate with its baseline rate.
+
+    :return: A list of (name, rate, baseline rate, change) tuples for each
+        benchmark, and a list of the names of the benchmarks which have
+        regressed by more than tolerance (a fraction).
+    """
+    comparisons = []
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline or not result['rate']:
+            comparisons.append((name, result['rate'], None, None))
+            continue
+        baseline_rate = baseline[name]['rate']
+        change = result['rate'] / baseline_rate - 1
+        comparisons.append((name, result['rate'], baseline_rate, change))
+        if change < -tolerance:
+            regressions.append(name)
+    return comparisons, regressions
+
+
+def print_comparisons(comparisons, results, regressions):
+    """
+    Print a line for each benchmark, with its rate, baseline rate and the
+    change.
+    """
+    print("%-24s %20s %20s %8s" % ("Benchmark", "Rate", "Baseline",
+                                    "Change"))
+    for name, rate, baseline_rate, change in comparisons:
+        unit = "%s/s" % results[name]['unit']
+        print("%-24s %20s %20s %8s%s" % (
+            name, "%.1f %s" % (rate, unit) if rate else "-",
+            "%.1f %s" % (baseline_rate, unit) if baseline_rate else "-",
+            "%+.1f%%" % (change * 100) if change is not None else "-",
+            "  REGRESSION" if name in regressions else ""))
+        if 'p95' in results[name]:
+            print("%-24s p50 %.3f s, p95 %.3f s, p99 %.3f s, %s errors"
+                  % ("", results[name]['p50'] or 0, results[name]['p95'] or 0,
+                     results[name]['p99'] or 0, results[name]['errors']))
+
+
+def main():
+    """
+    Run the benchmarks.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("benchmarks", nargs="*", metavar="BENCHMARK",
+                        help="The benchmarks to run (default: all), from: "
+                        + ", ".join(BENCHMARKS))
+    parser.add_argument("--size", choices=list(SIZES), default="small",
+                        help="The size of the benchmarks' data.")
+    parser.add_argument("--faults", choices=sorted(PROFILES),
+                        help="The fault profile used by the wan_* "
+                        "benchmarks (default: %s)." % DEFAULT_FAULT_PROFILE)
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="The number of times to run each benchmark.")
+    parser.add_argument("--output", default="benchmark-results.json",
+                        help="The file to write the results to.")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE_PATH,
+                        help="The baseline file to compare with.")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="The fraction by which a benchmark's rate can "
+                        "fall below its baseline before it is reported as "
+                        "a regression.")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="Save the results as the baseline for the size.")
+    args = parser.parse_args()
+
+    names = args.benchmarks or list(BENCHMARKS)
+    unknown = [name for name in names if name not in BENCHMARKS]
+    if unknown:
+        parser.error("Unknown benchmark(s): %s" % ", ".join(unknown))
+
+    params = dict(SIZES[args.size], faults=args.faults)
+    results = {}
+    for name in names:
+        print("Running %s..." % name, file=sys.stderr)
+        results[name] = run_benchmark(name, params, args.repeat)
+
+    with open(args.output, 'w') as output_file:
+        json.dump(dict(size=args.size, faults=args.faults,
+                       environment=environment(), benchmarks=results),
+                  output_file, indent=2, sort_keys=True)
+
+    baselines = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as baseline_file:
+            baselines = json.load(baseline_file)
+    # Results with a non-default fault profile have their own baseline:
+    baseline_key = "%s-%s" % (args.size, args.faults) \
+        if args.faults else args.size
+    if baseline_key not in baselines and not args.save_baseline:
+        print("No %s baseline in %s, so regressions can't be detected.  "
+              "Save one with --save-baseline." % (baseline_key, args.baseline),
+              file=sys.stderr)
+    comparisons, regressions = compare(
+        results, baselines.get(baseline_key, {}), args.tolerance)
+    print_comparisons(comparisons, results, regressions)
+    print("Results written to %s" % args.output)
+
+    if args.save_baseline:
+        baseline = baselines.setdefault(baseline_key, {})
+        for name, result in results.items():
+            baseline[name] = dict(rate=result['rate'], unit=result['unit'])
+        with open(args.baseline, 'w') as baseline_file:
+            json.dump(baselines, baseline_file, indent=2, sort_keys=True)
+            baseline_file.write("\n")
+        print("Baseline saved to %s" % args.baseline)
+        return
+    if regressions:
+        print("%s benchmark(s) regressed by more than %.0f%%: %s"
+              % (len(regressions), args.tolerance * 100,
+                 ", ".join(regressions)), file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,418 @@
+"""
+The benchmarks run by benchmarks/run.py.
+
+Each benchmark is a function registered with :func:`benchmark`, which is
+called with the parameters of the selected size (see :data:`SIZES`) and a
+temporary working directory, does any setup it needs (e.g. generating
+records for the fake MyTardis server, or writing files), and returns the
+number of seconds taken by the code being measured and the amount of
+work done (in the benchmark's unit, e.g. records), optionally followed by
+a dictionary of other metrics (e.g. tail latencies).
+
+The wan_* benchmarks inject the latency and faults of the fault profile
+in the 'faults' parameter (see mtclient.testing.faults.PROFILES).
+"""
+from __future__ import print_function
+
+import os
+import subprocess
+import sys
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+from mtclient.conf import config
+from mtclient.testing import FakeMyTardis, FaultInjector, SyntheticData
+from mtclient.utils.instrumentation import percentile
+
+from bench_codec import datafile_page
+from bench_render import synthetic_datafiles
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+#: The parameters of each benchmark size.
+SIZES = OrderedDict([
+    ('small', dict(records_per_page=20, pages=50, render_records=10000,
+                   decode_pages=20, download_mb=16, dataset_files=100,
+                   md5_mb=64, md5_small_files=2000,
+                   tree_files=1000, startup_runs=5,
+                   wan_files=40, wan_file_kb=1024, wan_jobs=8)),
+    ('medium', dict(records_per_page=20, pages=500, render_records=100000,
+                    decode_pages=100, download_mb=256, dataset_files=1000,
+                    md5_mb=512, md5_small_files=10000,
+                    tree_files=10000, startup_runs=10,
+                    wan_files=200, wan_file_kb=4096, wan_jobs=8)),
+    ('large', dict(records_per_page=20, pages=5000, render_records=1000000,
+                   decode_pages=1000, download_mb=1024, dataset_files=10000,
+                   md5_mb=4096, md5_small_files=100000,
+                   tree_files=1000000, startup_runs=20,
+                   wan_files=1000, wan_file_kb=16384, wan_jobs=16)),
+])
+
+#: The registered benchmarks, keyed by name, with their functions and
+#: units.
+BENCHMARKS = OrderedDict()
+
+#: The fault profile used by the wan_* benchmarks by default.
+DEFAULT_FAULT_PROFILE = 'wan'
+
+#: The maximum number of times wan_upload resumes an upload after errors.
+MAX_UPLOAD_ATTEMPTS = 100
+
+USERNAME = "benchmark"
+API_KEY = "benchmark"
+
+
+def benchmark(name, unit):
+    """
+    Decorator which registers a benchmark function.
+    """
+    def decorator(func):
+        """
+        Register func.
+        """
+        BENCHMARKS[name] = (func, unit)
+        return func
+    return decorator
+
+
+@contextmanager
+def serving(data, faults=None):
+    """
+    Serve data from a fake MyTardis server (injecting faults, if
+    supplied), and point the client's configuration at it, within the
+    context.
+    """
+    saved = (config.url, config.username, config.apikey)
+    with FakeMyTardis(data, username=USERNAME, api_key=API_KEY,
+                      faults=faults) as server:
+        config.url = server.url
+        config.username = USERNAME
+        config.apikey = API_KEY
+        try:
+            yield server
+        finally:
+            config.url, config.username, config.apikey = saved
+
+
+@contextmanager
+def quiet():
+    """
+    Discard anything printed to stdout within the context (e.g. by
+    downloads).
+    """
+    stdout = sys.stdout
+    with open(os.devnull, 'w') as devnull:
+        sys.stdout = devnull
+        try:
+            yield
+        finally:
+            sys.stdout = stdout
+
+
+@contextmanager
+def working_directory(path):
+    """
+    Change to path within the context.
+    """
+    cwd = os.getcwd()
+    os.chdir(path)
+    try:
+        yield
+    finally:
+        os.chdir(cwd)
+
+
+def latency_metrics(latencies, errors):
+    """
+    Return the median and tail latencies (in seconds) and the number of
+    errors, as a benchmark's other metrics.
+    """
+    latencies = sorted(latencies)
+    return dict(p50=percentile(latencies, 50), p95=percentile(latencies, 95),
+                p99=percentile(latencies, 99), errors=errors)
+
+
+def write_file(path, megabytes):
+    """
+    Write a file of (incompressible) random blocks.
+    """
+    block = os.urandom(1048576)
+    with open(path, 'wb') as fileobj:
+        for _ in range(megabytes):
+            fileobj.write(block)
+
+
+@benchmark("queryset_iterate", "records")
+def bench_queryset_iterate(params, _):
+    """
+    Iterate over a QuerySet spanning many pages of DataFile records.
+    """
+    from mtclient.models.datafile import DataFile
+
+    num_records = params['records_per_page'] * params['pages']
+    data = SyntheticData().generate(datafiles_per_dataset=num_records,
+                                    datafile_size=0)
+    with serving(data):
+        start = time.time()
+        count = sum(1 for _ in DataFile.objects.filter(dataset__id=1))
+        elapsed = time.time() - start
+    assert count == num_records
+    return elapsed, count
+
+
+@benchmark("render_datafiles_table", "records")
+def bench_render_datafiles_table(params, _):
+    """
+    Render a large ResultSet of DataFile records as a table, writing it
+    one line at a time (as the CLI does).
+    """
+    from mtclient.views.datafile import render_datafiles_as_table
+
+    datafiles = synthetic_datafiles(params['render_records'])
+    with open(os.devnull, 'w') as devnull:
+        start = time.time()
+        render_datafiles_as_table(datafiles, stream=devnull)
+        elapsed = time.time() - start
+    return elapsed, params['render_records']
+
+
+@benchmark("render_datafiles_json", "records")
+def bench_render_datafiles_json(params, _):
+    """
+    Render a large ResultSet of DataFile records as JSON.
+    """
+    from mtclient.views.datafile import render_datafiles_as_json
+
+    datafiles = synthetic_datafiles(params['render_records'])
+    start = time.time()
+    render_datafiles_as_json(datafiles)
+    return time.time() - start, params['render_records']
+
+
+@benchmark("decode_datafile_pages", "records")
+def bench_decode_datafile_pages(params, _):
+    """
+    Decode pages of DataFile records with the configured JSON codec.
+    """
+    from mtclient.utils.jsoncodec import dumps, loads
+
+    page_size = 1000
+    pages = [dumps(datafile_page(page_size, offset=page * page_size))
+             .encode('utf-8') for page in range(params['decode_pages'])]
+    start = time.time()
+    for page in pages:
+        loads(page)
+    return time.time() - start, page_size * params['decode_pages']
+
+
+@benchmark("datafile_download", "MB")
+def bench_datafile_download(params, workdir):
+    """
+    Download a single large datafile.
+    """
+    from mtclient.models.datafile import DataFile
+
+    data = SyntheticData().generate(
+        datafiles_per_dataset=1, datafile_size=params['download_mb'] * 1048576,
+        parameters=False)
+    download_dir = os.path.join(workdir, "datafile_download")
+    with serving(data), quiet():
+        start = time.time()
+        DataFile.download(1, basedir=download_dir, force_overwrite=True)
+        elapsed = time.time() - start
+    return elapsed, params['download_mb']
+
+
+@benchmark("dataset_download", "files")
+def bench_dataset_download(params, workdir):
+    """
+    Download a dataset of many small datafiles.
+    """
+    from mtclient.models.dataset import Dataset
+
+    data = SyntheticData().generate(
+        datafiles_per_dataset=params['dataset_files'], datafile_size=65536,
+        parameters=False)
+    download_dir = os.path.join(workdir, "dataset_download")
+    os.makedirs(download_dir)
+    with serving(data), quiet(), working_directory(download_dir):
+        start = time.time()
+        Dataset.download(1)
+        elapsed = time.time() - start
+    return elapsed, params['dataset_files']
+
+
+@benchmark("md5_sum", "MB")
+def bench_md5_sum(params, workdir):
+    """
+    Calculate the MD5 sum of a large (cached) file.
+    """
+    from mtclient.models.datafile import md5_sum
+
+    path = os.path.join(workdir, "md5_sum.dat")
+    write_file(path, params['md5_mb'])
+    start = time.time()
+    md5_sum(path)
+    elapsed = time.time() - start
+    os.remove(path)
+    return elapsed, params['md5_mb']
+
+
+@benchmark("md5_sum_small_files", "files")
+def bench_md5_sum_small_files(params, workdir):
+    """
+    Calculate the MD5 sums of many small (100 byte) files.
+    """
+    from mtclient.models.datafile import md5_sum
+
+    paths = []
+    for index in range(params['md5_small_files']):
+        path = os.path.join(workdir, "small%07d.dat" % index)
+        with open(path, 'wb') as small_file:
+            small_file.write(os.urandom(100))
+        paths.append(path)
+    start = time.time()
+    for path in paths:
+        md5_sum(path)
+    return time.time() - start, len(paths)
+
+
+@benchmark("create_datafiles", "files")
+def bench_create_datafiles(params, workdir):
+    """
+    Create DataFile records for a directory tree of small files.
+    """
+    import mtclient.models.config
+    from mtclient.models.datafile import DataFile
+
+    tree = os.path.join(workdir, "tree")
+    for index in range(params['tree_files']):
+        subdir = os.path.join(tree, "dir%04d" % (index // 1000))
+        if index % 1000 == 0:
+            os.makedirs(subdir)
+        with open(os.path.join(subdir, "file%07d.dat" % index), 'w') \
+                as fileobj:
+            fileobj.write("%032d" % index)
+    data = SyntheticData().generate(datafiles_per_dataset=0,
+                                    parameters=False)
+    # Don't create the dataset's symlink in ~/.config/mytardisclient/:
+    datasets_path_prefix = mtclient.models.config.DATASETS_PATH_PREFIX
+    mtclient.models.config.DATASETS_PATH_PREFIX = \
+        os.path.join(workdir, "servers")
+    try:
+        with serving(data), quiet():
+            start = time.time()
+            count = DataFile.create_datafiles(1, "default", tree, tree)
+            elapsed = time.time() - start
+    finally:
+        mtclient.models.config.DATASETS_PATH_PREFIX = datasets_path_prefix
+    assert count == params['tree_files']
+    return elapsed, count
+
+
+@benchmark("cli_startup", "runs")
+def bench_cli_startup(params, workdir):
+    """
+    Run 'mytardis version' in new interpreters.
+    """
+    env = dict(os.environ, HOME=workdir)
+    code = ("import sys; import mtclient.client; "
+            "sys.argv = ['mytardis', 'version']; mtclient.client.run()")
+    with open(os.devnull, 'w') as devnull:
+        start = time.time()
+        for _ in range(params['startup_runs']):
+            subprocess.check_call([sys.executable, "-c", code], env=env,
+                                  cwd=REPO_DIR, stdout=devnull)
+        elapsed = time.time() - start
+    return elapsed, params['startup_runs']
+
+
+@benchmark("wan_parallel_download", "MB")
+def bench_wan_parallel_download(params, workdir):
+    """
+    Download many datafiles concurrently, with WAN latency and bandwidth,
+    reporting the latency of each datafile's download.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    from mtclient.models.datafile import DataFile
+    from mtclient.utils.session import set_pool_maxsize
+
+    data = SyntheticData().generate(
+        datafiles_per_dataset=params['wan_files'],
+        datafile_size=params['wan_file_kb'] * 1024, parameters=False)
+    faults = FaultInjector.from_profile(
+        params.get('faults') or DEFAULT_FAULT_PROFILE, seed=1)
+    download_dir = os.path.join(workdir, "wan_download")
+    os.makedirs(download_dir)
+    set_pool_maxsize(params['wan_jobs'])
+    latencies = []
+    errors = []
+
+    def download(datafile_id):
+        """
+        Download a datafile, recording its latency or error.
+        """
+        start = time.time()
+        try:
+            DataFile.download(datafile_id, basedir=download_dir,
+                              force_overwrite=True)
+        except Exception:  # pylint: disable=broad-except
+            errors.append(datafile_id)
+            return
+        latencies.append(time.time() - start)
+
+    with serving(data, faults=faults), quiet():
+        start = time.time()
+        with ThreadPoolExecutor(max_workers=params['wan_jobs']) as executor:
+            list(executor.map(download, range(1, params['wan_files'] + 1)))
+        elapsed = time.time() - start
+    megabytes = len(latencies) * params['wan_file_kb'] / 1024.0
+    return elapsed, megabytes, latency_metrics(latencies, len(errors))
+
+
+@benchmark("wan_upload", "files")
+def bench_wan_upload(params, workdir):
+    """
+    Upload a directory of datafiles concurrently, with WAN latency and
+    bandwidth, resuming the upload after any errors, and reporting the
+    latency of each upload request.
+    """
+    from mtclient.models.datafile import DataFile
+    from mtclient.utils.instrumentation import request_stats
+
+    tree = os.path.join(workdir, "wan_upload")
+    os.makedirs(tree)
+    block = os.urandom(1024)
+    for index in range(params['wan_files']):
+        with open(os.path.join(tree, "file%07d.dat" % index), 'wb') \
+                as fileobj:
+            fileobj.write(block * params['wan_file_kb'])
+    data = SyntheticData().generate(datafiles_per_dataset=0,
+                                    parameters=False)
+    faults = FaultInjector.from_profile(
+        params.get('faults') or DEFAULT_FAULT_PROFILE, seed=1)
+    state_path = os.path.join(workdir, "wan_upload.state")
+    errors = 0
+    request_stats.clear()
+    request_stats.enabled = True
+    try:
+        with serving(data, faults=faults), quiet():
+            start = time.time()
+            while errors < MAX_UPLOAD_ATTEMPTS:
+                try:
+                    DataFile.upload_datafiles(
+                        1, "default", tree, tree, jobs=params['wan_jobs'],
+                        state_path=state_path)
+                    break
+                except Exception:  # pylint: disable=broad-except
+                    errors += 1
+            elapsed = time.time() - start
+        latencies = [record.latency for record in request_stats.records
+                     if record.method == 'POST' and record.status == 201]
+    finally:
+        request_stats.enabled = False
+        request_stats.clear()
+    assert len(data.records['dataset_file']) == params['wan_files']
+    return elapsed, params['wan_files'], latency_metrics(latencies, errors)
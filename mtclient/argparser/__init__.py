@@ -1,9 +1,11 @@
 """
 argparser/__init__.py
 """
+import sys
 from argparse import ArgumentParser
 
 from .api import build_api_parser
+from .batch import build_batch_parser
 from .config import build_config_parser
 from .version import build_version_parser
 from .facility import build_facility_parser
@@ -13,6 +15,8 @@ from .dataset import build_dataset_parser
 from .datafile import build_datafile_parser
 from .storagebox import build_storagebox_parser
 from .schema import build_schema_parser
+from .serve import build_serve_parser
+from ..utils.profiling import DEFAULT_PROFILE_PATH
 
 
 class ArgParser(object):
@@ -26,15 +30,53 @@ class ArgParser(object):
             "--verbose", action='store_true', help="More verbose output.")
         self.parser.add_argument(
             "--version", action='store_true', help="Display version.")
+        self.parser.add_argument(
+            "--stats", action='store_true',
+            help="Display statistics for the HTTP requests made by the "
+            "command (on stderr).")
+        self.parser.add_argument(
+            "--profile", nargs='?', const=DEFAULT_PROFILE_PATH,
+            metavar="FILE",
+            help="Profile the command, writing the profile to FILE "
+            "(default: %s) and a report to stderr.  If FILE ends with "
+            "'.collapsed', all threads' stacks are sampled and written in "
+            "collapsed stack format." % DEFAULT_PROFILE_PATH)
+        self.parser.add_argument(
+            "--trace", metavar="FILE",
+            help="Write a trace of the command's operations and HTTP "
+            "requests to FILE in JSON format.")
         self.model_parsers = \
             self.parser.add_subparsers(help='available models', dest='model')
+        self.built = False
+
+    def get_args(self, argv=None):
+        """
+        Builds argument parser (if it hasn't been built already) and
+        retrieves arguments.
+
+        :param argv: The arguments to parse (excluding the program name).
+            Defaults to sys.argv[1:].
+        """
+        if not self.built:
+            self.build_parser()
+        if argv is None:
+            argv = sys.argv[1:]
+        return self.parser.parse_args(
+            self.expand_profile_option(argv))
 
-    def get_args(self):
+    def expand_profile_option(self, argv):
         """
-        Builds argument parser and retrieves arguments.
+        '--profile' takes an optional FILE, so in 'mytardis --profile
+        dataset list', argparse would take 'dataset' as the FILE.  A bare
+        '--profile' followed by a model is expanded to '--profile=FILE',
+        with the default FILE.
         """
-        self.build_parser()
-        return self.parser.parse_args()
+        argv = list(argv)
+        for index, arg in enumerate(argv[:-1]):
+            if arg == '--profile' and \
+                    argv[index + 1] in self.model_parsers.choices:
+                argv[index] = '--profile=%s' % DEFAULT_PROFILE_PATH
+        return argv
 
     def build_parser(self):
         """
@@ -43,6 +85,8 @@ class ArgParser(object):
         build_api_parser(self)
         build_config_parser(self)
         build_version_parser(self)
+        build_batch_parser(self)
+        build_serve_parser(self)
         build_facility_parser(self)
         build_instrument_parser(self)
         build_experiment_parser(self)
@@ -50,6 +94,7 @@ class ArgParser(object):
         build_datafile_parser(self)
         build_storagebox_parser(self)
         build_schema_parser(self)
+        self.built = True
 
         return self.parser
 
@@ -0,0 +1,40 @@
+"""
+argparser/batch.py
+"""
+import textwrap
+
+
+def build_batch_parser(argument_parser):
+    """
+    'mytardis batch' runs many commands in a single process
+    """
+    batch_help = "Run many commands in a single process."
+    batch_usage = textwrap.dedent("""\
+        mytardis batch [-h] [--stop-on-error] file
+
+          Reads one command per line from file (or from standard input
+          if file is '-'), and writes one JSON result per line to standard
+          output.  Each command can be written as it would be on the
+          command line (with or without the leading "mytardis"), or as a
+          JSON object with an "argv" list (or a "command" string), and an
+          optional "id" which is included in the command's result.
+          Blank lines and lines starting with '#' are ignored.
+
+          EXAMPLE
+
+          $ cat commands.txt
+          dataset get 35 --json
+          {"id": "df120", "argv": ["datafile", "get", "120", "--json"]}
+
+          $ mytardis batch commands.txt
+          {"argv": ["dataset", "get", "35", "--json"], "line": 1, "result": {...}, "status": "ok"}
+          {"argv": ["datafile", "get", "120", "--json"], "id": "df120", "line": 2, "result": {...}, "status": "ok"}
+        """)
+    batch_command_parser = \
+        argument_parser.model_parsers.add_parser("batch", help=batch_help,
+                                                 usage=batch_usage)
+    batch_command_parser.add_argument(
+        "--stop-on-error", dest="stop_on_error", action='store_true',
+        help="Stop after the first command which fails.")
+    batch_command_parser.add_argument(
+        "file", help="The file to read commands from, or '-' for stdin.")
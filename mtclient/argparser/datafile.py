@@ -1,8 +1,25 @@
 """
 argparser/datafile.py
 """
+import argparse
 import textwrap
 
+from .listing import add_list_output_arguments
+
+
+def digest_algorithm(algorithm):
+    """
+    Check that a --digest algorithm is supported, so that an unsupported
+    algorithm is rejected before any files are read.
+    """
+    # Imported here, to avoid slowing down the startup of other commands:
+    from mtclient.utils.hashing import new_hasher
+    try:
+        new_hasher(algorithm)
+    except ValueError as err:
+        raise argparse.ArgumentTypeError(str(err))
+    return algorithm
+
 
 def build_datafile_parser(argument_parser):
     """
@@ -12,7 +29,8 @@ def build_datafile_parser(argument_parser):
     datafile_help = \
         "Display a list of datafile records or a single datafile record."
     datafile_usage = \
-        "mytardis datafile [-h] {list,get,create,update,download,upload} ..."
+        "mytardis datafile [-h] " \
+        "{list,get,create,watch,update,download,upload,verify} ..."
     datafile_parser = \
         argument_parser.model_parsers.add_parser("datafile",
                                                  help=datafile_help,
@@ -26,6 +44,7 @@ def build_datafile_parser(argument_parser):
         mytardis datafile list
             [--dataset DATASET] [--directory DIRECTORY] [--filename FILENAME]
             [--limit LIMIT] [--offset OFFSET] [--order_by ORDER_BY] [--json]
+            [--format {ndjson,csv}] [--all]
             [--filter FILTER]
 
           EXAMPLE
@@ -50,6 +69,7 @@ def build_datafile_parser(argument_parser):
         datafile_command_parsers.add_parser("list",
                                             help=datafile_list_help,
                                             usage=datafile_list_usage)
+    add_list_output_arguments(datafile_command_list_parser)
     datafile_command_list_parser.add_argument("--dataset",
                                               help="The dataset ID.")
     datafile_command_list_parser.add_argument("--directory",
@@ -110,7 +130,11 @@ def build_datafile_parser(argument_parser):
         """)
     datafile_create_usage = textwrap.dedent("""\
         mytardis datafile create
-            [-s STORAGEBOX] [-d DATASET_PATH] dataset_id path
+            [-s STORAGEBOX] [-d DATASET_PATH] [--scan-threads SCAN_THREADS]
+            [--journal JOURNAL] [--resume] [--digest ALGORITHM]
+            [--drop-page-cache] [--order {inode,fiemap}] [--manifest MANIFEST]
+            [--manifest-format {md5sum,csv,json}]
+            dataset_id [path]
 
           EXAMPLE
 
@@ -153,9 +177,102 @@ def build_datafile_parser(argument_parser):
     datafile_command_create_parser.add_argument(
         "-d", "--dataset_path", help="The local dataset path.")
     datafile_command_create_parser.add_argument(
-        "path",
+        "--scan-threads", dest="scan_threads", type=int, default=1,
+        help="The number of threads to use for scanning subdirectories "
+        "when creating records for a directory.")
+    datafile_command_create_parser.add_argument(
+        "--journal",
+        help="Record each file's progress in this ingestion journal "
+        "when creating records for a directory.")
+    datafile_command_create_parser.add_argument(
+        "--resume", action='store_true',
+        help="Resume an interrupted directory ingestion from its journal.")
+    datafile_command_create_parser.add_argument(
+        "--digest", action='append', dest="digests", type=digest_algorithm,
+        help="Also calculate this checksum (e.g. sha512 or blake2b) on the "
+        "same read pass as the MD5 sum, and record it in the ingestion "
+        "journal.  Can be repeated.")
+    datafile_command_create_parser.add_argument(
+        "--drop-page-cache", dest="drop_page_cache", action='store_true',
+        help="Drop files from the page cache as they are read, to avoid "
+        "evicting other processes' data when reading large files.")
+    datafile_command_create_parser.add_argument(
+        "--order", choices=["inode", "fiemap"],
+        help="When reading a directory, read the files in physical layout "
+        "order (by inode number or by FIEMAP extent offset) instead of "
+        "directory listing order, to reduce seeking on rotational disks "
+        "and tape-backed filesystems.")
+    datafile_command_create_parser.add_argument(
+        "--manifest",
+        help="Create records for the files listed in this checksum manifest "
+        "(e.g. a BagIt manifest-md5.txt), using its MD5 sums instead of "
+        "reading the files.")
+    datafile_command_create_parser.add_argument(
+        "--manifest-format", dest="manifest_format",
+        choices=["md5sum", "csv", "json"],
+        help="The manifest's format.  By default, the format is determined "
+        "by the manifest's file extension.")
+    datafile_command_create_parser.add_argument(
+        "path", nargs="?",
         help="The file to be represented in the datafile record, or "
-        "a directory containing the datafiles to create records for.")
+        "a directory containing the datafiles to create records for.  "
+        "Not required with --manifest.")
+
+    datafile_watch_help = textwrap.dedent("""\
+        Watch a directory, creating datafile records for new files.
+        """)
+    datafile_watch_usage = textwrap.dedent("""\
+        mytardis datafile watch
+            [-s STORAGEBOX] [-d DATASET_PATH] [--journal JOURNAL]
+            [--interval INTERVAL] [--settle-time SETTLE_TIME]
+            [--batch-size BATCH_SIZE] [--poll] [--drop-page-cache]
+            dataset_id dir_path
+
+          EXAMPLE
+
+          $ mytardis datafile watch -d /data/instrument1/run1 \\
+              -s instrument1-box 31 /data/instrument1/run1
+
+          Files are registered once they have been closed after writing
+          (using inotify if the inotify_simple package is installed),
+          or once their size and modification time have stopped changing.
+          Progress is recorded in an ingestion journal, so restarting the
+          watch doesn't re-register existing files.
+            """)
+    datafile_command_watch_parser = \
+        datafile_command_parsers.add_parser(
+            "watch",
+            help=datafile_watch_help,
+            usage=datafile_watch_usage)
+    datafile_command_watch_parser.add_argument(
+        "dataset_id", help="The dataset ID.")
+    datafile_command_watch_parser.add_argument(
+        "-s", "--storagebox", help="The storage box containing the datafiles.")
+    datafile_command_watch_parser.add_argument(
+        "-d", "--dataset_path", help="The local dataset path.")
+    datafile_command_watch_parser.add_argument(
+        "--journal",
+        help="The ingestion journal recording which files have been "
+        "registered.")
+    datafile_command_watch_parser.add_argument(
+        "--interval", type=float, default=5.0,
+        help="How often (in seconds) to check for new files.")
+    datafile_command_watch_parser.add_argument(
+        "--settle-time", dest="settle_time", type=float, default=10.0,
+        help="How long (in seconds) a file must remain unmodified before "
+        "it is registered when polling.")
+    datafile_command_watch_parser.add_argument(
+        "--batch-size", dest="batch_size", type=int, default=100,
+        help="The maximum number of files to register per batch.")
+    datafile_command_watch_parser.add_argument(
+        "--poll", action='store_true',
+        help="Poll the directory tree, even if inotify is available.")
+    datafile_command_watch_parser.add_argument(
+        "--drop-page-cache", dest="drop_page_cache", action='store_true',
+        help="Drop files from the page cache as they are read, to avoid "
+        "evicting other processes' data when reading large files.")
+    datafile_command_watch_parser.add_argument(
+        "dir_path", help="The directory to watch.")
 
     datafile_download_help = "Download a datafile."
     datafile_download_usage = textwrap.dedent("""\
@@ -173,10 +290,13 @@ def build_datafile_parser(argument_parser):
     datafile_cmd_download_parser.add_argument("datafile_id",
                                               help="The datafile ID.")
 
-    datafile_upload_help = "Upload a datafile."
+    datafile_upload_help = "Upload a datafile or a directory of datafiles."
     datafile_upload_usage = textwrap.dedent("""\
         mytardis datafile upload
-            [-s STORAGEBOX] [-d DATASET_PATH] dataset_id file_path
+            [-s STORAGEBOX] [-d DATASET_PATH] [--stream]
+            [-j JOBS] [--limit-rate LIMIT_RATE] [--state STATE]
+            [--drop-page-cache] [--order {inode,fiemap}]
+            dataset_id file_path
 
           EXAMPLE
 
@@ -235,8 +355,36 @@ def build_datafile_parser(argument_parser):
         help="The storage box which will store the datafile.")
     datafile_cmd_upload_parser.add_argument(
         "-d", "--dataset_path", help="The local dataset path.")
-    datafile_cmd_upload_parser.add_argument("file_path",
-                                            help="The file to upload.")
+    datafile_cmd_upload_parser.add_argument(
+        "--stream", action='store_true',
+        help="Stream the file from disk, calculating its MD5 sum during "
+        "the upload and then updating the DataFile record with it.")
+    datafile_cmd_upload_parser.add_argument(
+        "-j", "--jobs", type=int, default=1,
+        help="The number of files to upload concurrently when uploading "
+        "a directory.")
+    datafile_cmd_upload_parser.add_argument(
+        "--limit-rate", dest="limit_rate",
+        help="The maximum combined upload speed in bytes per second, "
+        "optionally with a K, M or G suffix, e.g. 10M.")
+    datafile_cmd_upload_parser.add_argument(
+        "--state",
+        help="The state file used to resume an interrupted directory "
+        "upload.")
+    datafile_cmd_upload_parser.add_argument(
+        "--drop-page-cache", dest="drop_page_cache", action='store_true',
+        help="Drop files from the page cache as they are read, to avoid "
+        "evicting other processes' data when reading large files.")
+    datafile_cmd_upload_parser.add_argument(
+        "--order", choices=["inode", "fiemap"],
+        help="When reading a directory, read the files in physical layout "
+        "order (by inode number or by FIEMAP extent offset) instead of "
+        "directory listing order, to reduce seeking on rotational disks "
+        "and tape-backed filesystems.")
+    datafile_cmd_upload_parser.add_argument(
+        "file_path",
+        help="The file to upload, or a directory containing the files "
+        "to upload.")
 
     datafile_update_help = "Update a datafile record."
     datafile_update_usage = textwrap.dedent("""\
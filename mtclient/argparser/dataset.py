@@ -3,6 +3,8 @@ argparser/dataset.py
 """
 import textwrap
 
+from .listing import add_list_output_arguments
+
 
 def build_dataset_parser(argument_parser):
     """
@@ -24,6 +26,7 @@ def build_dataset_parser(argument_parser):
     dataset_list_usage = textwrap.dedent("""\
         mytardis dataset list
             [--exp EXP] [--limit LIMIT] [--offset OFFSET] [--order_by ORDER_BY] [--json]
+            [--format {ndjson,csv}] [--all]
             [--filter FILTER]
 
           EXAMPLE
@@ -51,6 +54,7 @@ def build_dataset_parser(argument_parser):
     dataset_command_list_parser = \
         dataset_command_parsers.add_parser("list", help=dataset_list_help,
                                            usage=dataset_list_usage)
+    add_list_output_arguments(dataset_command_list_parser)
     dataset_command_list_parser.add_argument("--exp",
                                              help="The experiment ID.")
     dataset_command_list_parser.add_argument(
@@ -3,6 +3,8 @@ argparser/experiment.py
 """
 import textwrap
 
+from .listing import add_list_output_arguments
+
 
 def build_experiment_parser(argument_parser):
     """
@@ -24,6 +26,7 @@ def build_experiment_parser(argument_parser):
     experiment_list_usage = textwrap.dedent("""\
         mytardis experiment list
             [--limit LIMIT] [--offset OFFSET] [--order_by ORDER_BY] [--json]
+            [--format {ndjson,csv}] [--all]
             [--filter FILTER]
 
           EXAMPLE
@@ -52,6 +55,7 @@ def build_experiment_parser(argument_parser):
         experiment_command_parsers.add_parser("list",
                                               help=experiment_list_help,
                                               usage=experiment_list_usage)
+    add_list_output_arguments(experiment_command_list_parser)
     experiment_command_list_parser.add_argument(
         "--limit", help="Maximum number of results to return.")
     experiment_command_list_parser.add_argument(
@@ -3,6 +3,8 @@ argparser/facility.py
 """
 import textwrap
 
+from .listing import add_list_output_arguments
+
 
 def build_facility_parser(argument_parser):
     """
@@ -24,6 +26,7 @@ def build_facility_parser(argument_parser):
     facility_list_usage = textwrap.dedent("""\
         mytardis facility list
             [--limit LIMIT] [--offset OFFSET] [--order_by ORDER_BY] [--json]
+            [--format {ndjson,csv}] [--all]
 
           EXAMPLE
 
@@ -46,6 +49,7 @@ def build_facility_parser(argument_parser):
     facility_command_list_parser = \
         facility_command_parsers.add_parser("list", help=facility_list_help,
                                             usage=facility_list_usage)
+    add_list_output_arguments(facility_command_list_parser)
     facility_command_list_parser.add_argument(
         "--limit", help="Maximum number of results to return.")
     facility_command_list_parser.add_argument(
@@ -3,6 +3,8 @@ argparser/instrument.py
 """
 import textwrap
 
+from .listing import add_list_output_arguments
+
 
 def build_instrument_parser(argument_parser):
     """
@@ -24,6 +26,7 @@ def build_instrument_parser(argument_parser):
     instrument_list_usage = textwrap.dedent("""\
         mytardis instrument list
             [--facility FACILITY] [--limit LIMIT] [--offset OFFSET] [--order_by ORDER_BY] [--json]
+            [--format {ndjson,csv}] [--all]
 
           EXAMPLE
 
@@ -49,6 +52,7 @@ def build_instrument_parser(argument_parser):
         instrument_command_parsers.add_parser("list",
                                               help=instrument_list_help,
                                               usage=instrument_list_usage)
+    add_list_output_arguments(instrument_command_list_parser)
     instrument_command_list_parser.add_argument("--facility",
                                                 help="The facility ID.")
     instrument_command_list_parser.add_argument(
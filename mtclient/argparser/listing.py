@@ -0,0 +1,18 @@
+"""
+argparser/listing.py
+"""
+
+
+def add_list_output_arguments(list_parser):
+    """
+    Adds the arguments for streaming large listings, which are shared by
+    every model's list command.
+    """
+    list_parser.add_argument(
+        "--format", choices=["ndjson", "csv"],
+        help="Write one record per line (as JSON or CSV) as each page of "
+        "results arrives, instead of displaying a table.  CSV columns are "
+        "taken from the first record's fields.")
+    list_parser.add_argument(
+        "--all", action='store_true',
+        help="Retrieve every page of results, using LIMIT as the page size.")
@@ -3,6 +3,8 @@ argparser/schema.py
 """
 import textwrap
 
+from .listing import add_list_output_arguments
+
 
 def build_schema_parser(argument_parser):
     """
@@ -24,6 +26,7 @@ def build_schema_parser(argument_parser):
     schema_list_usage = textwrap.dedent("""\
         mytardis schema list
             [--limit LIMIT] [--offset OFFSET] [--order_by ORDER_BY] [--json]
+            [--format {ndjson,csv}] [--all]
 
           EXAMPLE
 
@@ -55,6 +58,7 @@ def build_schema_parser(argument_parser):
         schema_command_parsers.add_parser("list",
                                           help=schema_list_help,
                                           usage=schema_list_usage)
+    add_list_output_arguments(schema_command_list_parser)
     schema_command_list_parser.add_argument(
         "--limit", help="Maximum number of results to return.")
     schema_command_list_parser.add_argument(
@@ -0,0 +1,41 @@
+"""
+argparser/serve.py
+"""
+import textwrap
+
+from ..models.config import SOCKET_PATH
+
+
+def build_serve_parser(argument_parser):
+    """
+    'mytardis serve' runs a daemon which executes commands on behalf of
+    other 'mytardis' processes
+    """
+    serve_help = "Run a daemon which keeps connections and metadata warm."
+    serve_usage = textwrap.dedent("""\
+        mytardis serve [-h] [--socket SOCKET]
+
+          Listens on a Unix socket until interrupted.  While the daemon is
+          running, 'mytardis ... list' and 'mytardis ... get' commands are
+          forwarded to it (if their socket is the default socket, or the
+          socket specified by the MYTARDISCLIENT_SOCKET environment
+          variable), and are run using its pooled connections and cached
+          schemas and parameter names.  Commands are run locally instead if
+          their config (MyTardis URL, username or API key) differs from the
+          daemon's, if their output is streamed (with --all or --format),
+          or if the daemon doesn't respond.
+
+          EXAMPLE
+
+          $ mytardis serve &
+          Listening on /Users/wettenhj/.config/mytardisclient/mytardisclient.sock
+
+          $ mytardis dataset get 35
+        """)
+    serve_command_parser = \
+        argument_parser.model_parsers.add_parser("serve", help=serve_help,
+                                                 usage=serve_usage)
+    serve_command_parser.add_argument(
+        "--socket", default=SOCKET_PATH,
+        help="The Unix socket to listen on.  Default: "
+        "~/.config/mytardisclient/mytardisclient.sock")
@@ -3,6 +3,8 @@ argparser/storagebox.py
 """
 import textwrap
 
+from .listing import add_list_output_arguments
+
 
 def build_storagebox_parser(argument_parser):
     """
@@ -24,6 +26,7 @@ def build_storagebox_parser(argument_parser):
     storagebox_list_usage = textwrap.dedent("""\
         mytardis storagebox list
             [--limit LIMIT] [--offset OFFSET] [--order_by ORDER_BY] [--json]
+            [--format {ndjson,csv}] [--all]
 
           EXAMPLE
 
@@ -47,6 +50,7 @@ def build_storagebox_parser(argument_parser):
         storagebox_command_parsers.add_parser("list",
                                               help=storagebox_list_help,
                                               usage=storagebox_list_usage)
+    add_list_output_arguments(storagebox_command_list_parser)
     storagebox_command_list_parser.add_argument(
         "--limit", help="Maximum number of results to return.")
     storagebox_command_list_parser.add_argument(
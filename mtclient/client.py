@@ -8,30 +8,106 @@ import os
 import sys
 import logging
 import logging.config
+from importlib import import_module
 
 from . import __version__ as VERSION
 from .models.config import Config
 from .models.config import DEFAULT_CONFIG_PATH
-from .controllers.api import ApiController
-from .controllers.config import ConfigController
-from .controllers.facility import FacilityController
-from .controllers.instrument import InstrumentController
-from .controllers.experiment import ExperimentController
-from .controllers.dataset import DatasetController
-from .controllers.datafile import DataFileController
-from .controllers.storagebox import StorageBoxController
-from .controllers.schema import SchemaController
+from .models.config import SOCKET_PATH
 from .argparser import ArgParser
+from .utils.daemon import config_identity, should_forward, forward_command
+
+#: The controller module and class for each model subcommand.  Only the
+#: requested subcommand's controller is imported (along with its model
+#: and views), so that the CLI starts quickly.
+CONTROLLERS = dict(
+    api=('api', 'ApiController'),
+    batch=('batch', 'BatchController'),
+    serve=('serve', 'ServeController'),
+    facility=('facility', 'FacilityController'),
+    instrument=('instrument', 'InstrumentController'),
+    experiment=('experiment', 'ExperimentController'),
+    dataset=('dataset', 'DatasetController'),
+    datafile=('datafile', 'DataFileController'),
+    storagebox=('storagebox', 'StorageBoxController'),
+    schema=('schema', 'SchemaController'))
+
+
+def get_controller(model):
+    """
+    Import and return the controller class for a model subcommand.
+    """
+    module_name, class_name = CONTROLLERS[model]
+    module = import_module("%s.controllers.%s" % (__package__, module_name))
+    return getattr(module, class_name)
 
 
 def run():
     """
     Main function for command-line interface.
-    """
-    # pylint: disable=too-many-branches
 
+    If a 'mytardis serve' daemon is running, list and get commands are
+    forwarded to it, falling back to running them locally if the daemon
+    can't be reached or is using a different config.
+    """
+    socket_path = os.environ.get("MYTARDISCLIENT_SOCKET", SOCKET_PATH)
+    if should_forward(sys.argv[1:], socket_path):
+        result = forward_command(sys.argv[1:], socket_path,
+                                 config_identity(Config()))
+        if result is not None:
+            sys.stdout.write(result.get('output', ''))
+            if result['status'] != 'ok':
+                sys.stderr.write("%s\n" % result['error'])
+                sys.exit(1)
+            return
     args = ArgParser().get_args()
+    configure(args)
+    if args.profile:
+        from .utils.profiling import profiled
+        with profiled(args.profile):
+            run_command(args)
+    else:
+        run_command(args)
+
+
+def run_command(args):
+    """
+    Run a command, displaying statistics for its HTTP requests afterwards
+    if requested (with --stats), and writing a trace of it to a file if
+    requested (with --trace).
+    """
+    if not args.stats and not args.trace:
+        dispatch(args)
+        return
+    from .utils.instrumentation import request_stats
+    from .utils.tracing import span, tracer
+
+    request_stats.enabled = args.stats
+    tracer.enabled = bool(args.trace)
+    try:
+        with span("mytardis %s %s" % (args.model,
+                                      getattr(args, 'command', None) or "")):
+            dispatch(args)
+    finally:
+        if args.stats:
+            sys.stderr.write(request_stats.render())
+        if args.trace:
+            tracer.export_json(args.trace)
+            sys.stderr.write("Trace written to %s\n" % args.trace)
+        request_stats.enabled = False
+        request_stats.clear()
+        tracer.enabled = False
+        tracer.clear()
+
+
+def configure(args):
+    """
+    Handle the version and config commands, then load and validate the
+    config and set up logging.  This only needs to be done once per
+    process, even if many commands are run (see 'mytardis batch').
 
+    :return: The validated :class:`mtclient.models.config.Config`.
+    """
     if args.model == 'version':
         print("MyTardis Client v%s" % VERSION)
         sys.exit(0)
@@ -41,13 +117,14 @@ def run():
     config_path = DEFAULT_CONFIG_PATH
     if not os.path.exists(config_path) or \
             args.model == 'config':
+        from .controllers.config import ConfigController
         ConfigController(config_path).configure(args)
         if args.model == 'config':
             sys.exit(0)
     config = Config(config_path)
     config.validate()
 
-    logging.config.fileConfig(config.logging_config_path,
+    logging.config.fileConfig(config.ensure_logging_config(),
                               disable_existing_loggers=False)
     logging.getLogger("requests").setLevel(logging.WARNING)
     if args.version:
@@ -59,22 +136,15 @@ def run():
         print("MyTardis URL: %s" % config.url)
         print("Username: %s" % config.username)
 
-    if args.model == 'api':
-        ApiController().run_command(args)
-    elif args.model == 'facility':
-        FacilityController().run_command(args)
-    elif args.model == 'instrument':
-        InstrumentController().run_command(args)
-    elif args.model == 'experiment':
-        ExperimentController().run_command(args)
-    elif args.model == 'dataset':
-        DatasetController().run_command(args)
-    elif args.model == 'datafile':
-        DataFileController().run_command(args)
-    elif args.model == 'storagebox':
-        StorageBoxController().run_command(args)
-    elif args.model == 'schema':
-        SchemaController().run_command(args)
+    return config
+
+
+def dispatch(args):
+    """
+    Run a command, using the controller for its model subcommand.
+    """
+    if args.model in CONTROLLERS:
+        get_controller(args.model)().run_command(args)
 
 
 if __name__ == "__main__":
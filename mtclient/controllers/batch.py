@@ -0,0 +1,183 @@
+"""
+Controller class for running many commands in a single process.
+"""
+from __future__ import print_function
+
+import io
+import logging
+import shlex
+import sys
+from contextlib import contextmanager
+
+from .. import __version__ as VERSION
+from ..argparser import ArgParser
+from ..utils.cache import metadata_cache
+from ..utils.capture import captured_output, original_stdout
+from ..utils.jsoncodec import dumps, loads
+
+#: Commands which can't be run from within a batch (or by a daemon).
+UNSUPPORTED_MODELS = ('batch', 'config', 'serve')
+
+#: Options which apply to the whole process, so they can be given for
+#: the batch command itself, but not for the commands within a batch.
+UNSUPPORTED_OPTIONS = ('stats', 'trace', 'profile')
+
+
+def parse_request(line):
+    """
+    Parse a line of a batch file.
+
+    :return: A tuple containing the command's argument list and its
+        request ID (or None), or None if the line is blank or a comment.
+
+    :raises ValueError: If the line is invalid.
+    """
+    line = line.strip()
+    if not line or line.startswith('#'):
+        return None
+    request_id = None
+    if line.startswith('{'):
+        request = loads(line)
+        request_id = request.get('id')
+        if 'argv' in request:
+            argv = [str(arg) for arg in request['argv']]
+        elif 'command' in request:
+            argv = shlex.split(request['command'])
+        else:
+            raise ValueError("JSON requests require an argv list or a "
+                             "command string.")
+    else:
+        argv = shlex.split(line)
+    if argv and argv[0] == 'mytardis':
+        argv = argv[1:]
+    return argv, request_id
+
+
+def execute(arg_parser, argv, parse_json=True):
+    """
+    Parse and run a single command, capturing its output.  Commands are
+    run non-interactively, because stdin may be the batch file.
+
+    :param arg_parser: A :class:`mtclient.argparser.ArgParser`.
+    :param argv: The command's arguments, e.g. ['dataset', 'get', '35'].
+    :param parse_json: Parse the output of commands run with --json.
+
+    :return: A dictionary containing the command's status ('ok' or
+        'error'), and its output, which is parsed into 'result' if the
+        command was run with --json (and parse_json is True), or returned
+        as a string in 'output' otherwise.  Failed commands also have an
+        'error' message.
+    """
+    from ..client import dispatch
+    from ..utils.confirmation import non_interactive
+
+    result = dict(argv=argv)
+    args = None
+    error = None
+    with captured_output() as (stdout, stderr):
+        try:
+            args = arg_parser.get_args(argv)
+            if args.model in UNSUPPORTED_MODELS:
+                raise NotImplementedError(
+                    "The %s command can't be run in a batch." % args.model)
+            for option in UNSUPPORTED_OPTIONS:
+                if getattr(args, option, None):
+                    raise NotImplementedError(
+                        "The --%s option can't be used in a batch." % option)
+            if args.model == 'version':
+                print("MyTardis Client v%s" % VERSION)
+            else:
+                with non_interactive():
+                    dispatch(args)
+        except SystemExit as err:
+            # argparse exits after printing usage errors to stderr:
+            if err.code:
+                messages = stderr.getvalue().strip().splitlines()
+                error = messages[-1] if messages else \
+                    "Exited with status %s" % err.code
+        except Exception as err:  # pylint: disable=broad-except
+            error = str(err) or err.__class__.__name__
+    output = stdout.getvalue()
+    result['status'] = 'error' if error else 'ok'
+    if error:
+        result['error'] = error
+    if parse_json and getattr(args, 'json', False) and not error:
+        try:
+            result['result'] = loads(output)
+        except ValueError:
+            result['output'] = output
+    else:
+        result['output'] = output
+    return result
+
+
+@contextmanager
+def stdout_logging_redirected_to_stderr():
+    """
+    Send log messages which would be written to stdout to stderr instead,
+    so that they don't get mixed up with the JSON results.
+    """
+    stdout = original_stdout()
+    handlers = [handler for handler in logging.getLogger().handlers
+                if getattr(handler, 'stream', None) is stdout]
+    for handler in handlers:
+        handler.stream = sys.stderr
+    try:
+        yield
+    finally:
+        for handler in handlers:
+            handler.stream = stdout
+
+
+class BatchController(object):
+    """
+    Controller class for running many commands in a single process.
+
+    Running commands in a single process avoids paying the interpreter
+    startup and config loading costs for each command, and allows
+    connections and metadata (schemas and parameter names) to be reused
+    from one command to the next.
+    """
+    # pylint: disable=too-few-public-methods
+    def __init__(self):
+        self.arg_parser = ArgParser()
+
+    def run_command(self, args):
+        """
+        Run each command in the batch file, writing a JSON result for
+        each one to stdout.  Exits with status 1 if any command failed.
+        """
+        num_failed = 0
+        metadata_cache.enabled = True
+        if args.file == '-':
+            batch_file = sys.stdin
+        else:
+            batch_file = io.open(args.file, 'r', encoding='utf-8')
+        try:
+            with stdout_logging_redirected_to_stderr():
+                for line_number, line in enumerate(batch_file, 1):
+                    try:
+                        request = parse_request(line)
+                    except ValueError as err:
+                        result = dict(status='error', error=str(err))
+                    else:
+                        if not request:
+                            continue
+                        argv, request_id = request
+                        result = execute(self.arg_parser, argv)
+                        if request_id is not None:
+                            result['id'] = request_id
+                    result['line'] = line_number
+                    sys.stdout.write(dumps(result, sort_keys=True) + "\n")
+                    sys.stdout.flush()
+                    if result['status'] != 'ok':
+                        num_failed += 1
+                        if args.stop_on_error:
+                            break
+        finally:
+            metadata_cache.enabled = False
+            metadata_cache.clear()
+            if batch_file is not sys.stdin:
+                batch_file.close()
+        if num_failed:
+            sys.exit(1)
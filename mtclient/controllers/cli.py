@@ -3,6 +3,10 @@ Controller base class for running commands (list, get, create, update)
 """
 from __future__ import print_function
 
+import itertools
+import sys
+
+from ..models.queryset import QuerySet
 from ..utils import get_render_format
 from ..views import render
 
@@ -34,9 +38,43 @@ class ModelCliController(object):
         """
         if not self.model:
             return
-        result_set = self.model.list(
-            args.limit, args.offset, args.order_by)
-        print(render(result_set, render_format))
+        self.list_records(self.model, None, args, render_format)
+
+    def list_records(self, model, filters, args, render_format):
+        """
+        Display a page of records, or with --all, every page of records.
+
+        The 'ndjson' and 'csv' formats (and 'json' with --all) are written
+        one record at a time as each page arrives, and for models whose
+        list method supports streaming (supports_streaming = True), as
+        each record is decoded from the response.  Tables are displayed
+        one page at a time, and large tables are written one line at a
+        time.
+        """
+        # pylint: disable=no-self-use
+        from ..views.stream import STREAM_FORMATS, render_pages
+
+        fetch_all = getattr(args, 'all', False)
+        streamed = render_format in STREAM_FORMATS or \
+            (fetch_all and render_format == 'json')
+        query_set = QuerySet(
+            model, filters=filters, limit=args.limit, offset=args.offset,
+            order_by=args.order_by,
+            stream=streamed and getattr(model, 'supports_streaming', False))
+        pages = query_set.pages()
+        if not fetch_all:
+            pages = itertools.islice(pages, 1)
+        if streamed:
+            render_pages(pages, render_format)
+            return
+        for index, result_set in enumerate(pages):
+            output = render(result_set, render_format,
+                            display_heading=index == 0, stream=sys.stdout)
+            if output is None:
+                # The table has been written to stdout:
+                print()
+            else:
+                print(output)
 
     def get(self, args, render_format):
         """
@@ -1,13 +1,15 @@
 """
-Controller class for running commands (list, get, download, upload, update,
-                                       verify)
+Controller class for running commands (list, get, create, watch, download,
+                                       upload, update, verify)
 on datafile records.
 """
 from __future__ import print_function
 
 import os
 
+from mtclient.conf import config
 from mtclient.models.datafile import DataFile
+from mtclient.utils import parse_size_string
 from mtclient.views import render
 
 from .cli import ModelCliController
@@ -15,17 +17,33 @@ from .cli import ModelCliController
 
 class DataFileController(ModelCliController):
     """
-    Controller class for running commands (list, get, download, upload, update,
-                                           verify))
+    Controller class for running commands (list, get, create, watch, download,
+                                           upload, update, verify)
     on datafile records.
     """
     def __init__(self):
         super(DataFileController, self).__init__()
         self.allowed_commands = [
-            "list", "get", "create", "update", "download", "upload", "verify"]
+            "list", "get", "create", "watch", "update", "download", "upload",
+            "verify"]
         self.primary_key_arg = "datafile_id"
         self.model = DataFile
 
+    def run_command(self, args):
+        """
+        Run command, applying any I/O options shared by several commands.
+        The options only apply to this command, because several commands
+        can be run in one process (see 'mytardis batch' and 'mytardis
+        serve').
+        """
+        saved_drop_page_cache = config.drop_page_cache
+        if getattr(args, 'drop_page_cache', False):
+            config.drop_page_cache = True
+        try:
+            super(DataFileController, self).run_command(args)
+        finally:
+            config.drop_page_cache = saved_drop_page_cache
+
     def list(self, args, render_format):
         """
         Display list of datafile records.
@@ -41,9 +59,7 @@ class DataFileController(ModelCliController):
             filters += "&filename=%s" % args.filename
         if args.filter:
             filters += "&%s" % args.filter
-        datafiles = DataFile.list(
-            filters, args.limit, args.offset, args.order_by)
-        print(render(datafiles, render_format))
+        self.list_records(DataFile, filters, args, render_format)
 
     def get(self, args, render_format):
         """
@@ -60,9 +76,23 @@ class DataFileController(ModelCliController):
         within a directory.
         """
         # pylint: disable=no-self-use
-        if os.path.isdir(args.path):
+        if args.digests and (args.manifest or not args.path or
+                             not os.path.isdir(args.path)):
+            raise Exception(
+                "--digest requires a directory path, because the extra "
+                "checksums are recorded in the ingestion journal.")
+        if args.manifest:
+            num_created = DataFile.create_datafiles_from_manifest(
+                args.dataset_id, args.storagebox, args.dataset_path,
+                args.manifest, manifest_format=args.manifest_format)
+            print("%s datafiles created." % num_created)
+        elif not args.path:
+            raise Exception("Either a path or a manifest is required.")
+        elif os.path.isdir(args.path):
             num_created = DataFile.create_datafiles(
-                args.dataset_id, args.storagebox, args.dataset_path, args.path)
+                args.dataset_id, args.storagebox, args.dataset_path, args.path,
+                scan_threads=args.scan_threads, journal_path=args.journal,
+                resume=args.resume, digests=args.digests, order=args.order)
             print("%s datafiles created." % num_created)
         else:
             datafile = DataFile.create_datafile(
@@ -70,6 +100,20 @@ class DataFileController(ModelCliController):
             print(render(datafile, render_format))
             print("DataFile created successfully.")
 
+    def watch(self, args, _render_format):
+        """
+        Watch a directory, creating datafile records for new files.
+        """
+        # pylint: disable=no-self-use
+        try:
+            DataFile.watch(
+                args.dataset_id, args.storagebox, args.dataset_path,
+                args.dir_path, journal_path=args.journal,
+                interval=args.interval, settle_time=args.settle_time,
+                batch_size=args.batch_size, use_inotify=not args.poll)
+        except KeyboardInterrupt:
+            print("Stopped watching %s." % args.dir_path)
+
     def download(self, args, _render_format):
         """
         Download datafile.
@@ -79,12 +123,23 @@ class DataFileController(ModelCliController):
 
     def upload(self, args, _render_format):
         """
-        Upload datafile.
+        Upload datafile, or all files within a directory.
         """
         # pylint: disable=no-self-use
-        DataFile.upload(
-            args.dataset_id, args.storagebox, args.dataset_path,
-            args.file_path)
+        if os.path.isdir(args.file_path):
+            bandwidth_limit = None
+            if args.limit_rate:
+                bandwidth_limit = parse_size_string(args.limit_rate)
+            num_uploaded = DataFile.upload_datafiles(
+                args.dataset_id, args.storagebox, args.dataset_path,
+                args.file_path, jobs=args.jobs, stream=args.stream,
+                bandwidth_limit=bandwidth_limit, state_path=args.state,
+                order=args.order)
+            print("%s datafiles uploaded." % num_uploaded)
+        else:
+            DataFile.upload(
+                args.dataset_id, args.storagebox, args.dataset_path,
+                args.file_path, stream=args.stream)
 
     def update(self, args, render_format):
         """
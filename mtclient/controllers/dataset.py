@@ -32,9 +32,7 @@ class DatasetController(ModelCliController):
             filters = ""
         if args.filter:
             filters += "&%s" % args.filter
-        datasets = Dataset.list(
-            filters, args.limit, args.offset, args.order_by)
-        print(render(datasets, render_format))
+        self.list_records(Dataset, filters, args, render_format)
 
     def get(self, args, render_format):
         """
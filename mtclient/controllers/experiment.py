@@ -27,9 +27,7 @@ class ExperimentController(ModelCliController):
         Display list of experiment records.
         """
         # pylint: disable=no-self-use
-        experiments = Experiment.list(
-            args.filter, args.limit, args.offset, args.order_by)
-        print(render(experiments, render_format))
+        self.list_records(Experiment, args.filter, args, render_format)
 
     def get(self, args, render_format):
         """
@@ -30,9 +30,7 @@ class InstrumentController(ModelCliController):
         filters = ""
         if facility_id:
             filters = "facility__id=%s" % facility_id
-        instruments = Instrument.list(
-            filters, args.limit, args.offset, args.order_by)
-        print(render(instruments, render_format))
+        self.list_records(Instrument, filters, args, render_format)
 
     def get(self, args, render_format):
         """
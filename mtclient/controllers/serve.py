@@ -0,0 +1,118 @@
+"""
+Controller class for running a daemon which executes commands on behalf
+of short-lived 'mytardis' processes.
+"""
+from __future__ import print_function
+
+import logging
+import os
+import socket
+
+from six.moves import socketserver
+
+from ..argparser import ArgParser
+from ..conf import config
+from ..utils.cache import metadata_cache
+from ..utils.daemon import (
+    REFUSED, config_identity, receive_request, send_request)
+from .batch import execute
+
+logger = logging.getLogger(__name__)  # pylint: disable=invalid-name
+
+
+class CommandRequestHandler(socketserver.StreamRequestHandler):
+    """
+    Runs the command sent by a client and sends back its result, unless
+    the client's config differs from the daemon's, e.g. because it uses
+    a different MyTardis server or username.
+    """
+    def handle(self):
+        try:
+            request = receive_request(self.rfile)
+        except ValueError as err:
+            send_request(self.connection, dict(status='error',
+                                               error=str(err)))
+            return
+        if request is None:
+            return
+        if request.get('config') != config_identity(config):
+            send_request(self.connection, dict(
+                status=REFUSED,
+                error="The client's config differs from the daemon's."))
+            return
+        result = execute(self.server.arg_parser, request.get('argv', []),
+                         parse_json=False)
+        send_request(self.connection, result)
+
+
+class CommandServer(socketserver.ThreadingMixIn,
+                    socketserver.UnixStreamServer):
+    """
+    Unix socket server which runs each client's command on its own thread.
+    """
+    daemon_threads = True
+
+    def __init__(self, socket_path):
+        self.arg_parser = ArgParser()
+        self.arg_parser.build_parser()
+        socketserver.UnixStreamServer.__init__(
+            self, socket_path, CommandRequestHandler)
+
+
+def remove_stale_socket(socket_path):
+    """
+    Remove a socket left behind by a daemon which is no longer running.
+
+    :raises Exception: If a daemon is already listening on socket_path.
+    """
+    if not os.path.exists(socket_path):
+        return
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(socket_path)
+    except (IOError, OSError):
+        os.remove(socket_path)
+        return
+    finally:
+        sock.close()
+    raise Exception("A daemon is already listening on %s" % socket_path)
+
+
+class ServeController(object):
+    """
+    Controller class for running a daemon which executes commands on
+    behalf of short-lived 'mytardis' processes, keeping its pooled HTTP
+    session and cached metadata warm between commands.
+    """
+    # pylint: disable=too-few-public-methods
+    def __init__(self):
+        self.server = None
+
+    def run_command(self, args):
+        """
+        Listen on args.socket until interrupted.
+        """
+        socket_dir = os.path.dirname(os.path.abspath(args.socket))
+        if not os.path.exists(socket_dir):
+            os.makedirs(socket_dir)
+        remove_stale_socket(args.socket)
+        metadata_cache.enabled = True
+        # Only the current user should be able to run commands with
+        # their API key:
+        old_umask = os.umask(0o177)
+        try:
+            self.server = CommandServer(args.socket)
+        finally:
+            os.umask(old_umask)
+        print("Listening on %s" % args.socket)
+        logger.info("Listening on %s", args.socket)
+        try:
+            self.server.serve_forever()
+        except KeyboardInterrupt:
+            print("Stopped listening on %s." % args.socket)
+        finally:
+            self.server.server_close()
+            if os.path.exists(args.socket):
+                os.remove(args.socket)
+            metadata_cache.enabled = False
+            metadata_cache.clear()
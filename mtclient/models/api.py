@@ -10,10 +10,11 @@ The 'schema' request above requires authentication.
 """
 from __future__ import print_function
 
-import requests
 import six
 
 from ..conf import config
+from ..utils.jsoncodec import decode_response
+from ..utils.session import get_session
 
 
 class ApiEndpoint(object):
@@ -60,9 +61,9 @@ class ApiEndpoint(object):
             an :class:`ApiEndpoints` object.
         """
         url = "%s/api/v1/?format=json" % config.url
-        response = requests.get(url=url, headers=config.default_headers)
+        response = get_session().get(url=url, headers=config.default_headers)
         response.raise_for_status()
-        return ApiEndpoints(response.json())
+        return ApiEndpoints(decode_response(response))
 
 
 class ApiSchema(object):
@@ -104,9 +105,9 @@ class ApiSchema(object):
         if model == "datafile":
             model = "dataset_file"
         url = "%s/api/v1/%s/schema/?format=json" % (config.url, model)
-        response = requests.get(url=url, headers=config.default_headers)
+        response = get_session().get(url=url, headers=config.default_headers)
         response.raise_for_status()
-        return ApiSchema(model, response.json())
+        return ApiSchema(model, decode_response(response))
 
 
 class ApiEndpoints(object):
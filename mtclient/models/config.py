@@ -14,6 +14,12 @@ DEFAULT_CONFIG_PATH = os.path.join(os.path.expanduser('~'), '.config',
                                    'mytardisclient', 'mytardisclient.cfg')
 DATASETS_PATH_PREFIX = os.path.join(os.path.expanduser('~'), '.config',
                                     'mytardisclient', 'servers')
+JOURNAL_PATH_PREFIX = os.path.join(os.path.expanduser('~'), '.config',
+                                   'mytardisclient', 'journals')
+UPLOAD_STATE_PATH_PREFIX = os.path.join(os.path.expanduser('~'), '.config',
+                                        'mytardisclient', 'uploads')
+SOCKET_PATH = os.path.join(os.path.expanduser('~'), '.config',
+                           'mytardisclient', 'mytardisclient.sock')
 LOGFILE_PATH = os.path.join(os.path.expanduser('~'), '.mytardisclient.log')
 LOGGING_CONFIG_PATH = os.path.join(os.path.expanduser('~'), '.config',
                                    'mytardisclient', 'logging.cfg')
@@ -63,12 +69,9 @@ class Config(object):
 
         #: The logging config path.
         #: Default: ~/.config/mytardisclient/logging.cfg
+        #: It is created by :func:`ensure_logging_config` when needed,
+        #: so that constructing a Config doesn't write to the filesystem.
         self.logging_config_path = LOGGING_CONFIG_PATH
-        if not os.path.exists(os.path.dirname(self.logging_config_path)):
-            os.makedirs(os.path.dirname(self.logging_config_path))
-        if not os.path.exists(self.logging_config_path):
-            with open(self.logging_config_path, 'w') as logging_config:
-                logging_config.write(DEFAULT_LOGGING_CONF)
         self.logfile_path = LOGFILE_PATH
 
         #: The MyTardis URL, e.g. 'http://mytardisdemo.erc.monash.edu.au'
@@ -80,6 +83,18 @@ class Config(object):
         #: The MyTardis API key, e.g. '644be179cc6773c30fc471bad61b50c90897146c'
         self.apikey = ""
 
+        #: Drop files' pages from the page cache as they are read for
+        #: hashing or uploading, to avoid evicting other processes' working
+        #: sets when reading large amounts of data.
+        self.drop_page_cache = False
+
+        #: Keep the deserialized JSON each model object was constructed
+        #: from.  Setting this to False reduces the memory used by large
+        #: numbers of records, at the cost of response_dict (e.g. in JSON
+        #: views) being rebuilt from the model's fields, so it only
+        #: includes the fields the model stores.
+        self.keep_response_dicts = True
+
         if path:
             self.load()
 
@@ -90,6 +105,8 @@ class Config(object):
                      url=self.url,
                      username=self.username,
                      apikey=self.apikey,
+                     drop_page_cache=self.drop_page_cache,
+                     keep_response_dicts=self.keep_response_dicts,
                      datasets_path=self.datasets_path)
         return json.dumps(attrs, indent=2)
 
@@ -118,6 +135,20 @@ class Config(object):
             os.makedirs(datasets_path)
         return datasets_path
 
+    def ensure_logging_config(self):
+        """
+        Write the default logging config to logging_config_path
+        if it doesn't exist yet.
+
+        :return: The logging config path.
+        """
+        if not os.path.exists(self.logging_config_path):
+            if not os.path.exists(os.path.dirname(self.logging_config_path)):
+                os.makedirs(os.path.dirname(self.logging_config_path))
+            with open(self.logging_config_path, 'w') as logging_config:
+                logging_config.write(DEFAULT_LOGGING_CONF)
+        return self.logging_config_path
+
     def load(self, path=None):
         """
         Sets some default values for settings fields, then loads a config
@@ -129,6 +160,11 @@ class Config(object):
         self.url = os.environ.get("MYTARDISCLIENT_URL", "")
         self.username = os.environ.get("MYTARDISCLIENT_USERNAME", "")
         self.apikey = os.environ.get("MYTARDISCLIENT_APIKEY", "")
+        self.drop_page_cache = os.environ.get(
+            "MYTARDISCLIENT_DROP_PAGE_CACHE", "").lower() in ("1", "true", "yes")
+        self.keep_response_dicts = os.environ.get(
+            "MYTARDISCLIENT_KEEP_RESPONSE_DICTS",
+            "true").lower() in ("1", "true", "yes")
 
         if path:
             self.path = path
@@ -145,6 +181,12 @@ class Config(object):
                 if config_parser.has_option(section, field):
                     self.__dict__[field] = \
                         config_parser.get(section, field)
+            if config_parser.has_option(section, "drop_page_cache"):
+                self.drop_page_cache = \
+                    config_parser.getboolean(section, "drop_page_cache")
+            if config_parser.has_option(section, "keep_response_dicts"):
+                self.keep_response_dicts = \
+                    config_parser.getboolean(section, "keep_response_dicts")
 
     @property
     def default_headers(self):
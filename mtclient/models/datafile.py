@@ -11,31 +11,42 @@ import hashlib
 import logging
 from datetime import datetime
 
-import requests
 from six.moves import urllib
 
 from ..conf import config
 from ..utils import extend_url, add_filters
 from ..utils.exceptions import DuplicateKey
-from .model import Model
-from .resultset import ResultSet
+from ..utils.hashing import DEFAULT_BLOCKSIZE, digest_file, hash_file
+from ..utils.journal import IngestionJournal, CREATED
+from ..utils.jsoncodec import decode_response
+from ..utils.layout import sort_by_physical_layout
+from ..utils.manifest import read_manifest
+from ..utils.multipart import MultipartEncoder
+from ..utils.scan import scan_directory
+from ..utils.session import get_session, set_pool_maxsize
+from ..utils.throttle import BandwidthLimiter
+from ..utils.tracing import activated, current_span, traced
+from ..utils.uploadstate import UploadState
+from ..utils.watch import DirectoryWatcher
+from .config import JOURNAL_PATH_PREFIX, UPLOAD_STATE_PATH_PREFIX
+from .model import Model, Record
+from .resultset import ResultSet, StreamingResultSet
 from .schema import Schema
 from .schema import ParameterName
 
 logger = logging.getLogger(__name__)  # pylint: disable=invalid-name
 
 
-def md5_sum(file_path, blocksize=65536):
+def md5_sum(file_path, blocksize=DEFAULT_BLOCKSIZE, pipelined=True,
+            use_mmap=False, drop_cache=False):
     """
     Calculate MD5 checksum without reading the whole file into memory.
+
+    See :func:`mtclient.utils.hashing.hash_file`.
     """
-    hasher = hashlib.md5()
-    with open(file_path, 'rb') as datafile:
-        buf = datafile.read(blocksize)
-        while buf:
-            hasher.update(buf)
-            buf = datafile.read(blocksize)
-        return hasher.hexdigest()
+    return hash_file(file_path, 'md5', blocksize=blocksize,
+                     pipelined=pipelined, use_mmap=use_mmap,
+                     drop_cache=drop_cache)
 
 
 class DataFile(Model):
@@ -43,6 +54,12 @@ class DataFile(Model):
     Model class for MyTardis API v1's DataFileResource.
     """
     # pylint: disable=too-many-instance-attributes
+    __slots__ = ('id', 'dataset', 'directory', 'filename', 'size', 'md5sum',
+                 'replicas', 'parameter_sets')
+
+    #: DataFile.list supports stream=True (see :class:`StreamingResultSet`).
+    supports_streaming = True
+
     def __init__(self, response_dict, include_metadata=False):
         from .replica import Replica
 
@@ -62,6 +79,18 @@ class DataFile(Model):
                 self.parameter_sets.append(
                     DataFileParameterSet(datafile_param_set_json))
 
+    def to_dict(self):
+        """
+        Return a dictionary of the datafile's fields
+        """
+        return dict(
+            id=self.id, dataset=self.dataset, directory=self.directory,
+            filename=self.filename, size=self.size, md5sum=self.md5sum,
+            replicas=[replica.to_dict() for replica in self.replicas],
+            parameter_sets=[parameter_set.to_dict()
+                            for parameter_set in self.parameter_sets],
+            resource_uri="/api/v1/dataset_file/%s/" % self.id)
+
     def __str__(self):
         """
         Return a string representation of a datafile
@@ -83,7 +112,8 @@ class DataFile(Model):
         return True
 
     @staticmethod
-    def list(filters=None, limit=None, offset=None, order_by=None):
+    def list(filters=None, limit=None, offset=None, order_by=None,
+             stream=False):
         """
         Retrieve a list of datafiles.
 
@@ -91,15 +121,22 @@ class DataFile(Model):
         :param limit: Maximum number of results to return.
         :param offset: Skip this many records from the start of the result set.
         :param order_by: Order by this field.
+        :param stream: Decode each record as it is received, instead of
+            decoding the whole response before returning, so that large
+            pages (e.g. with limit=0) don't need to be held in memory.
 
-        :return: A list of :class:`DataFile` records.
+        :return: A list of :class:`DataFile` records, or with stream=True,
+            a :class:`mtclient.models.resultset.StreamingResultSet`.
         """
         url = "%s/api/v1/dataset_file/?format=json" % config.url
         url = add_filters(url, filters)
         url = extend_url(url, limit, offset, order_by)
-        response = requests.get(url=url, headers=config.default_headers)
+        response = get_session().get(url=url, headers=config.default_headers,
+                                     stream=stream)
         response.raise_for_status()
-        return ResultSet(DataFile, url, response.json())
+        if stream:
+            return StreamingResultSet(DataFile, url, response)
+        return ResultSet(DataFile, url, decode_response(response))
 
     @staticmethod
     def get(**kwargs):
@@ -125,9 +162,10 @@ class DataFile(Model):
         include_metadata = kwargs.get("include_metadata", False)
         url = "%s/api/v1/dataset_file/%s/?format=json" % \
             (config.url, datafile_id)
-        response = requests.get(url=url, headers=config.default_headers)
+        response = get_session().get(url=url, headers=config.default_headers)
         response.raise_for_status()
-        return DataFile(response.json(), include_metadata=include_metadata)
+        return DataFile(decode_response(response),
+                        include_metadata=include_metadata)
 
     @staticmethod
     def create(dataset_id, storagebox, dataset_path, path,
@@ -170,7 +208,10 @@ class DataFile(Model):
             create_dataset_symlink=create_dataset_symlink)
 
     @staticmethod
-    def create_datafiles(dataset_id, storagebox, dataset_path, dir_path):
+    @traced("DataFile.create_datafiles", "dataset_id", "dir_path")
+    def create_datafiles(dataset_id, storagebox, dataset_path, dir_path,
+                         scan_threads=1, journal_path=None, resume=False,
+                         digests=None, order=None):
         """
         Create a DataFile record for each file within the dir_path directory.
 
@@ -200,29 +241,241 @@ class DataFile(Model):
             '/home/james/dataset1/subdir1/', then the dataset_path
             argument must be used to specified the dataset path, e.g.
             '/home/james/dataset1'.
+        :param scan_threads: The number of threads to use for scanning
+            subdirectories of dir_path concurrently, which can speed up
+            scanning large directory trees on network filesystems.
+        :param journal_path: The location of an ingestion journal
+            (see :class:`mtclient.utils.journal.IngestionJournal`) recording
+            each file's progress.  If resume is True and journal_path is
+            not specified, a journal in ~/.config/mytardisclient/journals/
+            named after the dataset ID and dir_path is used.
+        :param resume: If True, continue from the state recorded in the
+            journal, skipping files whose records have already been created
+            and reusing MD5 sums which have already been calculated.
+            Otherwise, any existing journal entries are discarded.
+        :param digests: A list of checksum algorithms (e.g. ['sha512']) to
+            calculate on the same read pass as the MD5 sum, and store in
+            the journal.  See :func:`mtclient.utils.hashing.new_hasher`.
+            If digests are requested, a journal is used even if
+            journal_path isn't specified.
+        :param order: Read the files in physical layout order ('inode' or
+            'fiemap') rather than directory listing order, to reduce seeking
+            on rotational disks and tape-backed filesystems.  See
+            :func:`mtclient.utils.layout.sort_by_physical_layout`.
+
+        :return: The number of DataFile records created.
         """
+        # pylint: disable=too-many-arguments
+        # pylint: disable=too-many-locals
         num_datafiles_created = 0
 
         def log_error(err):
             """
-            Log an error if os.listdir(...) fails during os.walk(...)
+            Log an error if a directory can't be scanned
             """
             logger.error(str(err))
 
-        for root, _, files in os.walk(dir_path, onerror=log_error):
-            for filename in files:
-                file_path = os.path.join(root, filename)
-                try:
-                    DataFile.create_datafile(dataset_id, storagebox,
-                                             dataset_path, file_path,
-                                             return_new_datafile=False)
+        journal = None
+        if (resume or digests) and not journal_path:
+            journal_path = DataFile.default_journal_path(dataset_id, dir_path)
+        if journal_path:
+            journal = IngestionJournal(journal_path, reset=not resume)
+
+        try:
+            scan_entries = scan_directory(dir_path, threads=scan_threads,
+                                          onerror=log_error)
+            if order:
+                scan_entries = sort_by_physical_layout(scan_entries,
+                                                       dir_path, order)
+            for scan_entry in scan_entries:
+                if DataFile.ingest_scan_entry(dataset_id, storagebox,
+                                              dataset_path, dir_path,
+                                              scan_entry, journal, digests):
                     num_datafiles_created += 1
-                except DuplicateKey:
-                    logger.warning("A DataFile record already exists for %s",
-                                   file_path)
+        finally:
+            if journal:
+                journal.close()
         return num_datafiles_created
 
     @staticmethod
+    def default_journal_path(dataset_id, dir_path):
+        """
+        Return the default location of the ingestion journal for creating
+        DataFile records in dataset_id for the files within dir_path.
+        """
+        dir_path_hash = hashlib.md5(
+            os.path.abspath(dir_path).encode('utf-8')).hexdigest()
+        return os.path.join(
+            JOURNAL_PATH_PREFIX, "%s-%s.sqlite" % (dataset_id, dir_path_hash))
+
+    @staticmethod
+    def ingest_scan_entry(dataset_id, storagebox, dataset_path, dir_path,
+                          scan_entry, journal=None, digests=None):
+        """
+        Create a DataFile record for a file found by
+        :func:`mtclient.utils.scan.scan_directory`, recording its progress
+        in the ingestion journal (if supplied).
+
+        :param dataset_id: The ID of the dataset to create the datafile in.
+        :param storagebox: The storage box containing the datafile.
+        :param dataset_path: The path to the directory which is to be mapped
+            to a MyTardis dataset.
+        :param dir_path: The directory which was scanned.
+        :param scan_entry: The :class:`mtclient.utils.scan.ScanEntry`.
+        :param journal: An optional
+            :class:`mtclient.utils.journal.IngestionJournal`.
+        :param digests: Checksum algorithms to calculate on the same read
+            pass as the MD5 sum, and record in the journal.
+
+        :return: True if a new DataFile record was created.
+        """
+        # pylint: disable=too-many-arguments
+        file_path = os.path.join(dir_path, scan_entry.relpath)
+        md5sum = None
+        if journal:
+            journal_entry = journal.get(scan_entry.relpath)
+            if journal_entry and \
+                    journal_entry.size == scan_entry.size and \
+                    journal_entry.mtime == scan_entry.mtime:
+                md5sum = journal_entry.md5sum
+                journaled_digests = journal_entry.digests or {}
+            else:
+                journal.record_scanned(
+                    scan_entry.relpath, scan_entry.size, scan_entry.mtime)
+                journal_entry = None
+                journaled_digests = {}
+            # When resuming, only calculate the requested checksums which
+            # haven't been journaled already:
+            algorithms = [algorithm for algorithm in digests or []
+                          if algorithm not in journaled_digests]
+            if not md5sum:
+                algorithms.insert(0, 'md5')
+            if algorithms:
+                checksums = digest_file(file_path, algorithms,
+                                        drop_cache=config.drop_page_cache)
+                md5sum = checksums.pop('md5', md5sum)
+                checksums.update(journaled_digests)
+                if journal_entry and journal_entry.state == CREATED:
+                    journal.record_digests(scan_entry.relpath, checksums)
+                else:
+                    journal.record_hashed(
+                        scan_entry.relpath, md5sum, checksums)
+            if journal_entry and journal_entry.state == CREATED:
+                return False
+        created = False
+        try:
+            datafile_id = DataFile.create_datafile(
+                dataset_id, storagebox, dataset_path, file_path,
+                return_new_datafile=False, check_local_paths=False,
+                size=str(scan_entry.size), md5sum=md5sum)
+            created = True
+        except DuplicateKey:
+            logger.warning("A DataFile record already exists for %s",
+                           file_path)
+            datafile_id = None
+        if journal:
+            journal.record_created(scan_entry.relpath, datafile_id)
+        return created
+
+    @staticmethod
+    def create_datafiles_from_manifest(dataset_id, storagebox, dataset_path,
+                                       manifest_path, manifest_format=None):
+        """
+        Create a DataFile record for each file listed in a checksum
+        manifest, using the manifest's MD5 sums instead of reading the
+        files to calculate them.
+
+        :param dataset_id: The ID of the dataset to create the datafiles in.
+        :param storagebox: The storage box containing the datafiles.
+        :param dataset_path: The path to the directory which is to be mapped
+            to a MyTardis dataset, e.g. the "data" directory of a BagIt bag.
+        :param manifest_path: The path to the manifest.  Relative paths
+            within the manifest are relative to the manifest's directory.
+        :param manifest_format: 'md5sum' (which includes BagIt manifests),
+            'csv' or 'json'.  See :mod:`mtclient.utils.manifest`.  If not
+            specified, the format is guessed from the file extension.
+
+        :return: The number of DataFile records created.
+        """
+        if not dataset_path:
+            raise Exception("The dataset_path argument is required.")
+        num_datafiles_created = 0
+        for entry in read_manifest(manifest_path, manifest_format):
+            size = entry.size
+            if size is None:
+                size = os.stat(entry.path).st_size
+            try:
+                DataFile.create_datafile(
+                    dataset_id, storagebox, dataset_path, entry.path,
+                    return_new_datafile=False, check_local_paths=False,
+                    size=str(size), md5sum=entry.md5sum,
+                    mimetype=entry.mimetype)
+                num_datafiles_created += 1
+            except DuplicateKey:
+                logger.warning("A DataFile record already exists for %s",
+                               entry.path)
+        return num_datafiles_created
+
+    @staticmethod
+    def watch(dataset_id, storagebox, dataset_path, dir_path,
+              journal_path=None, interval=5.0, settle_time=10.0,
+              batch_size=100, use_inotify=True, max_polls=None):
+        """
+        Watch the dir_path directory, creating a DataFile record for each
+        file once it is complete, i.e. once it has been closed after
+        writing (when inotify is available) or once its size and
+        modification time have stopped changing (when polling).
+
+        Each file's progress is recorded in an ingestion journal (see
+        :func:`mtclient.models.datafile.DataFile.create_datafiles`), so
+        when watching is restarted, files whose records have already been
+        created are skipped without querying MyTardis.
+
+        :param dataset_id: The ID of the dataset to create the datafiles in.
+        :param storagebox: The storage box containing the datafiles.
+        :param dataset_path: The path to the directory which is to be mapped
+            to a MyTardis dataset.
+        :param dir_path: The directory to watch.
+        :param journal_path: The location of the ingestion journal.
+        :param interval: How often (in seconds) to poll for new files.
+        :param settle_time: How long (in seconds) a file must remain
+            unmodified before it is considered complete when polling.
+        :param batch_size: The maximum number of files to process per batch.
+        :param use_inotify: Use inotify (if the inotify_simple package is
+            installed) rather than polling the directory tree.
+        :param max_polls: Stop after this many polls (default: never stop).
+
+        :return: The number of DataFile records created.
+        """
+        # pylint: disable=too-many-arguments
+        if not dataset_path:
+            raise Exception("The dataset_path argument is required.")
+        if not journal_path:
+            journal_path = DataFile.default_journal_path(dataset_id, dir_path)
+        journal = IngestionJournal(journal_path)
+        watcher = DirectoryWatcher(
+            dir_path, interval=interval, settle_time=settle_time,
+            use_inotify=use_inotify)
+        num_datafiles_created = 0
+        try:
+            for batch in watcher.batches(batch_size, max_polls=max_polls):
+                num_created = 0
+                for scan_entry in batch:
+                    if DataFile.ingest_scan_entry(dataset_id, storagebox,
+                                                  dataset_path, dir_path,
+                                                  scan_entry, journal):
+                        num_created += 1
+                logger.info("Created %s DataFile records for a batch of "
+                            "%s files in %s", num_created, len(batch),
+                            dir_path)
+                num_datafiles_created += num_created
+        finally:
+            watcher.close()
+            journal.close()
+        return num_datafiles_created
+
+    @staticmethod
+    @traced("DataFile.create_datafile", "dataset_id", "file_path")
     def create_datafile(dataset_id, storagebox, dataset_path, file_path,
                         return_new_datafile=True, check_local_paths=True,
                         create_dataset_symlink=True,
@@ -249,7 +502,8 @@ class DataFile(Model):
             recorded in the DataFile record(s) will be determined
             automatically by compareing the dataset_path with the file_path.
 
-        :return: A new :class:`DataFile` record.
+        :return: A new :class:`DataFile` record, or the new record's ID if
+            return_new_datafile is False.
 
         See also: :func:`mtclient.models.datafile.DataFile.upload`
 
@@ -337,7 +591,7 @@ class DataFile(Model):
         if not size:
             size = str(os.stat(file_path).st_size)
         if not md5sum:
-            md5sum = md5_sum(file_path)
+            md5sum = md5_sum(file_path, drop_cache=config.drop_page_cache)
         if not mimetype:
             mimetype = mimetypes.guess_type(file_path)[0]
         replicas = [{
@@ -357,17 +611,18 @@ class DataFile(Model):
             'parameter_sets': []
         }
         url = "%s/api/v1/dataset_file/" % config.url
-        response = requests.post(headers=config.default_headers, url=url,
-                                 data=json.dumps(new_datafile_json))
+        response = get_session().post(headers=config.default_headers, url=url,
+                                      data=json.dumps(new_datafile_json))
         response.raise_for_status()
         logger.info("Created a DataFile record for %s", file_path)
+        datafile_id = response.headers['location'].split("/")[-2]
         if return_new_datafile:
-            datafile_id = response.headers['location'].split("/")[-2]
             new_datafile = DataFile.objects.get(id=datafile_id)
             return new_datafile
-        return None
+        return int(datafile_id)
 
     @staticmethod
+    @traced("DataFile.download", "datafile_id")
     def download(datafile_id, basedir=None, overwrite=False,
                  force_overwrite=False):
         """
@@ -392,7 +647,7 @@ class DataFile(Model):
         headers = {
             "Authorization": "ApiKey %s:%s" % (config.username,
                                                config.apikey)}
-        response = requests.get(url=url, headers=headers, stream=True)
+        response = get_session().get(url=url, headers=headers, stream=True)
         response.raise_for_status()
         datafile = DataFile.objects.get(id=datafile_id)
         try:
@@ -445,7 +700,9 @@ class DataFile(Model):
                 print("Downloaded: %s" % filepath)
 
     @staticmethod
-    def upload(dataset_id, storagebox, dataset_path, file_path):
+    @traced("DataFile.upload", "dataset_id", "file_path")
+    def upload(dataset_id, storagebox, dataset_path, file_path,
+               stream=False, bandwidth_limiter=None):
         """
         Upload datafile to dataset with ID dataset_id,
         using HTTP POST.
@@ -467,16 +724,25 @@ class DataFile(Model):
             the DataFile record.  If dataset_path is not specified,
             file_path must be a relative (not absolute) path, e.g.
             'dataset1/subdir1/datafile1.txt'.
+        :param stream: If set to True, the MD5 sum is calculated on the
+            same read pass as the upload, rather than reading the whole
+            file once to calculate its MD5 sum and then again to upload it.
+            The DataFile record is created with an empty MD5 sum which is
+            then updated using
+            :func:`mtclient.models.datafile.DataFile.update`, so this
+            requires a MyTardis server which allows DataFile records to be
+            updated.
+        :param bandwidth_limiter: An optional
+            :class:`mtclient.utils.throttle.BandwidthLimiter`, which can be
+            shared between concurrent uploads to cap their combined
+            throughput.
         """
         # pylint: disable=too-many-locals
-        # pylint: disable=too-many-branches
         if not dataset_path:
             raise Exception("The dataset_path argument is required.")
         if not os.path.exists(file_path):
             raise Exception("Path doesn't exist: %s" % file_path)
         url = "%s/api/v1/dataset_file/" % config.url
-        created_time = datetime.fromtimestamp(
-            os.stat(file_path).st_ctime).isoformat()
         file_path_without_dataset = os.path.relpath(file_path,
                                                     dataset_path)
         directory, filename = os.path.split(file_path_without_dataset)
@@ -488,14 +754,63 @@ class DataFile(Model):
             raise DuplicateKey("A DataFile record already exists for file "
                                "'%s' in dataset ID %s." % (_file_path,
                                                            dataset_id))
-        md5sum = md5_sum(file_path)
+        md5sum = "" if stream else \
+            md5_sum(file_path, drop_cache=config.drop_page_cache)
+        file_data = DataFile.upload_json_data(
+            dataset_id, storagebox, directory, filename, file_path, md5sum)
+        hasher = hashlib.md5() if stream else None
+
+        def read_callback(buf):
+            """
+            Called with each block of the file as it is uploaded.
+            """
+            if hasher:
+                hasher.update(buf)
+            if bandwidth_limiter:
+                bandwidth_limiter.consume(len(buf))
+
+        body = MultipartEncoder(
+            {"json_data": json.dumps(file_data)}, 'attached_file',
+            file_path, callback=read_callback,
+            drop_cache=config.drop_page_cache)
+        headers = {
+            "Authorization": "ApiKey %s:%s" % (config.username,
+                                               config.apikey),
+            "Content-Type": body.content_type}
+        response = get_session().post(url, headers=headers, data=body)
+        response.raise_for_status()
+        if stream:
+            datafile_id = response.headers['location'].split("/")[-2]
+            DataFile.update(datafile_id, hasher.hexdigest())
+        if directory:
+            print("Uploaded: %s/%s" % (directory, file_path))
+        else:
+            print("Uploaded: %s" % file_path)
+
+    @staticmethod
+    def upload_json_data(dataset_id, storagebox, directory, filename,
+                         file_path, md5sum):
+        """
+        Return the DataFile record fields to be submitted as the "json_data"
+        field of an upload request.
+
+        :param dataset_id: The ID of the dataset to create the datafile in.
+        :param storagebox: The storage box which will store the datafile.
+        :param directory: The directory within the dataset.
+        :param filename: The datafile's name.
+        :param file_path: The local path to the file being uploaded.
+        :param md5sum: The MD5 sum of the file being uploaded.
+        """
+        # pylint: disable=too-many-arguments
+        file_stat = os.stat(file_path)
         file_data = {"dataset": "/api/v1/dataset/%s/" % dataset_id,
                      "filename": filename,
                      "directory": directory,
                      "md5sum": md5sum,
-                     "size": str(os.stat(file_path).st_size),
+                     "size": str(file_stat.st_size),
                      "mimetype": mimetypes.guess_type(file_path)[0],
-                     "created_time": created_time}
+                     "created_time": datetime.fromtimestamp(
+                         file_stat.st_ctime).isoformat()}
         if storagebox:
             file_data['replicas'] = [
                 {
@@ -504,19 +819,99 @@ class DataFile(Model):
                     "location": storagebox
                 }
             ]
-        file_obj = open(file_path, 'rb')
-        headers = {
-            "Authorization": "ApiKey %s:%s" % (config.username,
-                                               config.apikey)}
-        response = requests.post(url, headers=headers,
-                                 data={"json_data": json.dumps(file_data)},
-                                 files={'attached_file': file_obj})
-        file_obj.close()
-        response.raise_for_status()
-        if directory:
-            print("Uploaded: %s/%s" % (directory, file_path))
-        else:
-            print("Uploaded: %s" % file_path)
+        return file_data
+
+    @staticmethod
+    @traced("DataFile.upload_datafiles", "dataset_id", "dir_path")
+    def upload_datafiles(dataset_id, storagebox, dataset_path, dir_path,
+                         jobs=1, stream=False, bandwidth_limit=None,
+                         state_path=None, order=None):
+        """
+        Upload each file within the dir_path directory, using up to `jobs`
+        concurrent uploads.
+
+        The upload is resumable:  files which have been uploaded are recorded
+        in a state file, so if the upload is interrupted, running it again
+        will only upload the remaining files.
+
+        :param dataset_id: The ID of the dataset to create the datafiles in.
+        :param storagebox: The storage box which will store the datafiles.
+        :param dataset_path: The path to the directory which is to be mapped
+            to a MyTardis dataset.  See
+            :func:`mtclient.models.datafile.DataFile.upload`.
+        :param dir_path: The path to a directory containing file(s) to upload.
+        :param jobs: The number of files to upload concurrently.
+        :param stream: Calculate each file's MD5 sum on the same read pass
+            as its upload.  See
+            :func:`mtclient.models.datafile.DataFile.upload`.
+        :param bandwidth_limit: The maximum combined upload throughput
+            (in bytes per second) of all of the concurrent uploads.
+        :param state_path: The location of the state file used to resume
+            an interrupted upload.  Defaults to a file in
+            ~/.config/mytardisclient/uploads/ named after the dataset ID
+            and the directory being uploaded.
+        :param order: Upload the files in physical layout order ('inode' or
+            'fiemap') rather than directory listing order.  See
+            :func:`mtclient.utils.layout.sort_by_physical_layout`.
+
+        :return: The number of datafiles uploaded.
+        """
+        # pylint: disable=too-many-arguments
+        from concurrent.futures import ThreadPoolExecutor
+
+        if not dataset_path:
+            raise Exception("The dataset_path argument is required.")
+        if not state_path:
+            dir_path_hash = hashlib.md5(
+                os.path.abspath(dir_path).encode('utf-8')).hexdigest()
+            state_path = os.path.join(
+                UPLOAD_STATE_PATH_PREFIX,
+                "%s-%s.state" % (dataset_id, dir_path_hash))
+        state = UploadState(state_path)
+        bandwidth_limiter = \
+            BandwidthLimiter(bandwidth_limit) if bandwidth_limit else None
+        set_pool_maxsize(jobs)
+
+        def log_error(err):
+            """
+            Log an error if a directory can't be scanned
+            """
+            logger.error(str(err))
+
+        scan_entries = scan_directory(dir_path, onerror=log_error)
+        if order:
+            scan_entries = sort_by_physical_layout(scan_entries, dir_path,
+                                                   order)
+        file_paths = []
+        for scan_entry in scan_entries:
+            file_path = os.path.join(dir_path, scan_entry.relpath)
+            if os.path.relpath(file_path, dataset_path) not in state:
+                file_paths.append(file_path)
+        if len(state) > 0:
+            logger.info("Resuming upload of %s: %s files already uploaded, "
+                        "%s remaining.", dir_path, len(state), len(file_paths))
+
+        parent_span = current_span()
+
+        def upload_file(file_path):
+            """
+            Upload one file and record it in the state file.
+            """
+            try:
+                with activated(parent_span):
+                    DataFile.upload(dataset_id, storagebox, dataset_path,
+                                    file_path, stream=stream,
+                                    bandwidth_limiter=bandwidth_limiter)
+                uploaded = True
+            except DuplicateKey:
+                logger.warning("A DataFile record already exists for %s",
+                               file_path)
+                uploaded = False
+            state.mark_done(os.path.relpath(file_path, dataset_path))
+            return uploaded
+
+        with ThreadPoolExecutor(max_workers=jobs) as executor:
+            return sum(executor.map(upload_file, file_paths))
 
     @staticmethod
     def update(datafile_id, md5sum):
@@ -537,10 +932,11 @@ class DataFile(Model):
         updated_fields_json = {'md5sum': md5sum}
         url = "%s/api/v1/dataset_file/%s/" % \
             (config.url, datafile_id)
-        response = requests.patch(headers=config.default_headers, url=url,
-                                  data=json.dumps(updated_fields_json))
+        response = get_session().patch(headers=config.default_headers,
+                                       url=url,
+                                       data=json.dumps(updated_fields_json))
         response.raise_for_status()
-        datafile_json = response.json()
+        datafile_json = decode_response(response)
         return DataFile(datafile_json)
 
     @staticmethod
@@ -552,7 +948,7 @@ class DataFile(Model):
         """
         url = "%s/api/v1/dataset_file/%s/verify/" \
             % (config.url, datafile_id)
-        response = requests.get(url=url, headers=config.default_headers)
+        response = get_session().get(url=url, headers=config.default_headers)
         response.raise_for_status()
         print("Requested verification of datafile ID %s." % datafile_id)
 
@@ -577,19 +973,21 @@ class DataFile(Model):
         url += "&filename=%s" % urllib.parse.quote(filename)
         if directory and directory != "":
             url += "&directory=%s" % urllib.parse.quote(directory)
-        response = requests.get(url=url, headers=config.default_headers)
+        response = get_session().get(url=url, headers=config.default_headers)
         logger.debug("GET %s %s", url, response.status_code)
         if response.status_code < 200 or response.status_code >= 300:
             raise Exception("Failed to check for existing file '%s' "
                             "in dataset ID %s." % (filename, dataset_id))
-        return response.json()['meta']['total_count'] > 0
+        return decode_response(response)['meta']['total_count'] > 0
 
 
-class DataFileParameterSet(object):
+class DataFileParameterSet(Record):
     """
     Model class for MyTardis API v1's DataFileParameterSetResource.
     """
     # pylint: disable=too-few-public-methods
+    __slots__ = ('id', 'datafile', 'schema', 'parameters')
+
     def __init__(self, response_dict):
         self.response_dict = response_dict
         self.id = response_dict['id']  # pylint: disable=invalid-name
@@ -599,6 +997,15 @@ class DataFileParameterSet(object):
         for datafile_param_json in response_dict['parameters']:
             self.parameters.append(DataFileParameter(datafile_param_json))
 
+    def to_dict(self):
+        """
+        Return a dictionary of the parameter set's fields
+        """
+        return dict(id=self.id, datafile=self.datafile,
+                    schema=self.schema.to_dict(),
+                    parameters=[parameter.to_dict()
+                                for parameter in self.parameters])
+
     @staticmethod
     def list(filters=None, limit=None, offset=None, order_by=None):
         """
@@ -615,17 +1022,21 @@ class DataFileParameterSet(object):
         url = "%s/api/v1/datafileparameterset/?format=json" % config.url
         url = add_filters(url, filters)
         url = extend_url(url, limit, offset, order_by)
-        response = requests.get(url=url, headers=config.default_headers)
+        response = get_session().get(url=url, headers=config.default_headers)
         response.raise_for_status()
-        return ResultSet(DataFileParameterSet, url, response.json())
+        return ResultSet(DataFileParameterSet, url,
+                         decode_response(response))
 
 
-class DataFileParameter(object):
+class DataFileParameter(Record):
     """
     Model class for MyTardis API v1's DataFileParameterResource.
     """
     # pylint: disable=too-few-public-methods
     # pylint: disable=too-many-instance-attributes
+    __slots__ = ('id', 'name', 'string_value', 'numerical_value',
+                 'datetime_value', 'link_id', 'value')
+
     def __init__(self, response_dict):
         self.response_dict = response_dict
         self.id = response_dict['id']  # pylint: disable=invalid-name
@@ -637,6 +1048,17 @@ class DataFileParameter(object):
         self.link_id = response_dict['link_id']
         self.value = response_dict['value']
 
+    def to_dict(self):
+        """
+        Return a dictionary of the parameter's fields
+        """
+        return dict(id=self.id,
+                    name="/api/v1/parametername/%s/" % self.name.id,
+                    string_value=self.string_value,
+                    numerical_value=self.numerical_value,
+                    datetime_value=self.datetime_value,
+                    link_id=self.link_id, value=self.value)
+
     @staticmethod
     def list(filters=None, limit=None, offset=None, order_by=None):
         """
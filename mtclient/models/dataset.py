@@ -5,17 +5,19 @@ from __future__ import print_function
 
 import logging
 
-import requests
 from six.moves import urllib
 
 from ..conf import config
 from ..utils import extend_url, add_filters
+from ..utils.jsoncodec import decode_response
+from ..utils.session import get_session
+from ..utils.tracing import traced
 
 from .resultset import ResultSet
 from .schema import Schema
 from .schema import ParameterName
 from .instrument import Instrument
-from .model import Model
+from .model import Model, Record
 
 logger = logging.getLogger(__name__)  # pylint: disable=invalid-name
 
@@ -24,15 +26,15 @@ class Dataset(Model):
     """
     Model class for MyTardis API v1's DatasetResource.
     """
+    __slots__ = ('id', 'description', 'instrument', 'experiments',
+                 'parameter_sets')
+
     def __init__(self, response_dict=None, include_metadata=False):
         self.response_dict = response_dict
-        self.id = None  # pylint: disable=invalid-name
-        self.description = None
+        self.id = response_dict.get('id')  # pylint: disable=invalid-name
+        self.description = response_dict.get('description')
+        self.experiments = response_dict.get('experiments', [])
         self.instrument = None
-        self.experiments = []
-        for key in self.__dict__:
-            if key in response_dict:
-                self.__dict__[key] = response_dict[key]
         if response_dict['instrument']:
             self.instrument = Instrument(response_dict['instrument'])
         self.parameter_sets = []
@@ -41,6 +43,18 @@ class Dataset(Model):
                 self.parameter_sets.append(
                     DatasetParameterSet(dataset_param_set_json))
 
+    def to_dict(self):
+        """
+        Return a dictionary of the dataset's fields
+        """
+        return dict(
+            id=self.id, description=self.description,
+            experiments=self.experiments,
+            instrument=self.instrument.to_dict() if self.instrument else None,
+            parameter_sets=[parameter_set.to_dict()
+                            for parameter_set in self.parameter_sets],
+            resource_uri="/api/v1/dataset/%s/" % self.id)
+
     def __str__(self):
         """
         Return a string representation of a dataset
@@ -64,9 +78,9 @@ class Dataset(Model):
 
         url = add_filters(url, filters)
         url = extend_url(url, limit, offset, order_by)
-        response = requests.get(url=url, headers=config.default_headers)
+        response = get_session().get(url=url, headers=config.default_headers)
         response.raise_for_status()
-        return ResultSet(Dataset, url, response.json())
+        return ResultSet(Dataset, url, decode_response(response))
 
     @staticmethod
     def get(**kwargs):
@@ -91,9 +105,9 @@ class Dataset(Model):
                 "at this stage.")
         include_metadata = kwargs.get("include_metadata", False)
         url = "%s/api/v1/dataset/%s/?format=json" % (config.url, dataset_id)
-        response = requests.get(url=url, headers=config.default_headers)
+        response = get_session().get(url=url, headers=config.default_headers)
         response.raise_for_status()
-        return Dataset(response_dict=response.json(),
+        return Dataset(response_dict=decode_response(response),
                        include_metadata=include_metadata)
 
     @staticmethod
@@ -127,10 +141,10 @@ class Dataset(Model):
             with open(params_file_json) as params_file:
                 new_dataset_json['parameter_sets'] = json.load(params_file)
         url = "%s/api/v1/dataset/" % config.url
-        response = requests.post(headers=config.default_headers, url=url,
-                                 data=json.dumps(new_dataset_json))
+        response = get_session().post(headers=config.default_headers, url=url,
+                                      data=json.dumps(new_dataset_json))
         response.raise_for_status()
-        return Dataset(response.json())
+        return Dataset(decode_response(response))
 
     @staticmethod
     def update(dataset_id, description):
@@ -141,13 +155,14 @@ class Dataset(Model):
 
         updated_fields_json = {'description': description}
         url = "%s/api/v1/dataset/%s/" % (config.url, dataset_id)
-        response = requests.patch(headers=config.default_headers, url=url,
-                                  data=json.dumps(updated_fields_json))
+        response = get_session().patch(headers=config.default_headers, url=url,
+                                       data=json.dumps(updated_fields_json))
         response.raise_for_status()
-        dataset_json = response.json()
+        dataset_json = decode_response(response)
         return Dataset(dataset_json)
 
     @staticmethod
+    @traced("Dataset.download", "dataset_id")
     def download(dataset_id):
         """
         Download a dataset
@@ -170,11 +185,13 @@ class Dataset(Model):
         print("Downloaded to: %s/" % path)
 
 
-class DatasetParameterSet(object):
+class DatasetParameterSet(Record):
     """
     Model class for MyTardis API v1's DatasetParameterSetResource.
     """
     # pylint: disable=too-few-public-methods
+    __slots__ = ('id', 'dataset', 'schema', 'parameters')
+
     def __init__(self, response_dict):
         self.response_dict = response_dict
         self.id = response_dict['id']  # pylint: disable=invalid-name
@@ -184,6 +201,15 @@ class DatasetParameterSet(object):
         for dataset_param_json in response_dict['parameters']:
             self.parameters.append(DatasetParameter(dataset_param_json))
 
+    def to_dict(self):
+        """
+        Return a dictionary of the parameter set's fields
+        """
+        return dict(id=self.id, dataset=self.dataset,
+                    schema=self.schema.to_dict(),
+                    parameters=[parameter.to_dict()
+                                for parameter in self.parameters])
+
     @staticmethod
     def list(filters=None, limit=None, offset=None, order_by=None):
         """
@@ -197,17 +223,21 @@ class DatasetParameterSet(object):
         url = "%s/api/v1/datasetparameterset/?format=json" % config.url
         url = add_filters(url, filters)
         url = extend_url(url, limit, offset, order_by)
-        response = requests.get(url=url, headers=config.default_headers)
+        response = get_session().get(url=url, headers=config.default_headers)
         response.raise_for_status()
-        return ResultSet(DatasetParameterSet, url, response.json())
+        return ResultSet(DatasetParameterSet, url,
+                         decode_response(response))
 
 
-class DatasetParameter(object):
+class DatasetParameter(Record):
     """
     Model class for MyTardis API v1's DatasetParameterResource.
     """
     # pylint: disable=too-few-public-methods
     # pylint: disable=too-many-instance-attributes
+    __slots__ = ('id', 'name', 'string_value', 'numerical_value',
+                 'datetime_value', 'link_id', 'value')
+
     def __init__(self, response_dict):
         self.response_dict = response_dict
         self.id = response_dict['id']  # pylint: disable=invalid-name
@@ -219,6 +249,17 @@ class DatasetParameter(object):
         self.link_id = response_dict['link_id']
         self.value = response_dict['value']
 
+    def to_dict(self):
+        """
+        Return a dictionary of the parameter's fields
+        """
+        return dict(id=self.id,
+                    name="/api/v1/parametername/%s/" % self.name.id,
+                    string_value=self.string_value,
+                    numerical_value=self.numerical_value,
+                    datetime_value=self.datetime_value,
+                    link_id=self.link_id, value=self.value)
+
     @staticmethod
     def list(filters=None, limit=None, offset=None, order_by=None):
         """
@@ -5,11 +5,11 @@ from __future__ import print_function
 
 import logging
 
-import requests
-
 from ..conf import config
 from ..utils import extend_url, add_filters
-from .model import Model
+from ..utils.jsoncodec import decode_response
+from ..utils.session import get_session
+from .model import Model, Record
 from .resultset import ResultSet
 
 logger = logging.getLogger(__name__)  # pylint: disable=invalid-name
@@ -19,21 +19,32 @@ class Experiment(Model):
     """
     Model class for MyTardis API v1's ExperimentResource.
     """
+    __slots__ = ('id', 'title', 'description', 'institution_name',
+                 'parameter_sets')
+
     def __init__(self, response_dict, include_metadata=False):
         self.response_dict = response_dict
-        self.id = None  # pylint: disable=invalid-name
-        self.title = None
-        self.description = None
-        self.institution_name = None
-        for key in self.__dict__:
-            if key in response_dict:
-                self.__dict__[key] = response_dict[key]
+        self.id = response_dict.get('id')  # pylint: disable=invalid-name
+        self.title = response_dict.get('title')
+        self.description = response_dict.get('description')
+        self.institution_name = response_dict.get('institution_name')
         self.parameter_sets = []
         if include_metadata:
             for exp_param_set_json in response_dict['parameter_sets']:
                 self.parameter_sets.append(
                     ExperimentParameterSet(exp_param_set_json))
 
+    def to_dict(self):
+        """
+        Return a dictionary of the experiment's fields
+        """
+        return dict(
+            id=self.id, title=self.title, description=self.description,
+            institution_name=self.institution_name,
+            parameter_sets=[parameter_set.to_dict()
+                            for parameter_set in self.parameter_sets],
+            resource_uri="/api/v1/experiment/%s/" % self.id)
+
     def __str__(self):
         """
         Return a string representation of an experiment
@@ -56,9 +67,9 @@ class Experiment(Model):
         url = "%s/api/v1/experiment/?format=json" % config.url
         url = add_filters(url, filters)
         url = extend_url(url, limit, offset, order_by)
-        response = requests.get(url=url, headers=config.default_headers)
+        response = get_session().get(url=url, headers=config.default_headers)
         response.raise_for_status()
-        return ResultSet(Experiment, url, response.json())
+        return ResultSet(Experiment, url, decode_response(response))
 
     @staticmethod
     def get(**kwargs):
@@ -83,9 +94,10 @@ class Experiment(Model):
                 "at this stage.")
         include_metadata = kwargs.get("include_metadata", False)
         url = "%s/api/v1/experiment/%s/?format=json" % (config.url, exp_id)
-        response = requests.get(url=url, headers=config.default_headers)
+        response = get_session().get(url=url, headers=config.default_headers)
         response.raise_for_status()
-        return Experiment(response.json(), include_metadata=include_metadata)
+        return Experiment(decode_response(response),
+                          include_metadata=include_metadata)
 
     @staticmethod
     def create(title, description="", institution=None, params_file_json=None):
@@ -115,10 +127,10 @@ class Experiment(Model):
             with open(params_file_json) as params_file:
                 new_exp_json['parameter_sets'] = json.load(params_file)
         url = config.url + "/api/v1/experiment/"
-        response = requests.post(headers=config.default_headers, url=url,
-                                 data=json.dumps(new_exp_json))
+        response = get_session().post(headers=config.default_headers, url=url,
+                                      data=json.dumps(new_exp_json))
         response.raise_for_status()
-        return Experiment(response.json())
+        return Experiment(decode_response(response))
 
     @staticmethod
     def update(experiment_id, title, description):
@@ -132,17 +144,19 @@ class Experiment(Model):
         updated_fields_json['description'] = description
         url = "%s/api/v1/experiment/%s/" % \
             (config.url, experiment_id)
-        response = requests.patch(headers=config.default_headers, url=url,
-                                  data=json.dumps(updated_fields_json))
+        response = get_session().patch(headers=config.default_headers, url=url,
+                                       data=json.dumps(updated_fields_json))
         response.raise_for_status()
-        return Experiment(response.json())
+        return Experiment(decode_response(response))
 
 
-class ExperimentParameterSet(object):
+class ExperimentParameterSet(Record):
     """
     Model class for MyTardis API v1's ExperimentParameterSetResource.
     """
     # pylint: disable=too-few-public-methods
+    __slots__ = ('id', 'experiment', 'schema', 'parameters')
+
     def __init__(self, response_dict):
         from .schema import Schema
         self.response_dict = response_dict
@@ -153,6 +167,15 @@ class ExperimentParameterSet(object):
         for exp_param_json in response_dict['parameters']:
             self.parameters.append(ExperimentParameter(exp_param_json))
 
+    def to_dict(self):
+        """
+        Return a dictionary of the parameter set's fields
+        """
+        return dict(id=self.id, experiment=self.experiment,
+                    schema=self.schema.to_dict(),
+                    parameters=[parameter.to_dict()
+                                for parameter in self.parameters])
+
     @staticmethod
     def list(filters=None, limit=None, offset=None, order_by=None):
         """
@@ -166,17 +189,21 @@ class ExperimentParameterSet(object):
         url = "%s/api/v1/experimentparameterset/?format=json" % config.url
         url = add_filters(url, filters)
         url = extend_url(url, limit, offset, order_by)
-        response = requests.get(url=url, headers=config.default_headers)
+        response = get_session().get(url=url, headers=config.default_headers)
         response.raise_for_status()
-        return ResultSet(ExperimentParameterSet, url, response.json())
+        return ResultSet(ExperimentParameterSet, url,
+                         decode_response(response))
 
 
-class ExperimentParameter(object):
+class ExperimentParameter(Record):
     """
     Model class for MyTardis API v1's ExperimentParameterResource.
     """
     # pylint: disable=too-few-public-methods
     # pylint: disable=too-many-instance-attributes
+    __slots__ = ('id', 'name', 'string_value', 'numerical_value',
+                 'datetime_value', 'link_id', 'value')
+
     def __init__(self, response_dict):
         from .schema import ParameterName
         self.response_dict = response_dict
@@ -189,6 +216,17 @@ class ExperimentParameter(object):
         self.link_id = response_dict['link_id']
         self.value = response_dict['value']
 
+    def to_dict(self):
+        """
+        Return a dictionary of the parameter's fields
+        """
+        return dict(id=self.id,
+                    name="/api/v1/parametername/%s/" % self.name.id,
+                    string_value=self.string_value,
+                    numerical_value=self.numerical_value,
+                    datetime_value=self.datetime_value,
+                    link_id=self.link_id, value=self.value)
+
     @staticmethod
     def list(filters=None, limit=None, offset=None, order_by=None):
         """
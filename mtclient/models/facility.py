@@ -3,9 +3,10 @@ Model class for MyTardis API v1's FacilityResource.
 """
 
 import logging
-import requests
 
 from ..conf import config
+from ..utils.jsoncodec import decode_response
+from ..utils.session import get_session
 from .model import Model
 from .group import Group
 
@@ -16,6 +17,8 @@ class Facility(Model):
     """
     Model class for MyTardis API v1's FacilityResource.
     """
+    __slots__ = ('id', 'name', 'manager_group')
+
     def __init__(self, response_dict):
         self.id = response_dict['id']  # pylint: disable=invalid-name
         self.name = response_dict['name']
@@ -23,6 +26,14 @@ class Facility(Model):
         self.manager_group = \
             Group(group_json=response_dict['manager_group'])
 
+    def to_dict(self):
+        """
+        Return a dictionary of the facility's fields
+        """
+        return dict(id=self.id, name=self.name,
+                    manager_group=self.manager_group.group_json,
+                    resource_uri="/api/v1/facility/%s/" % self.id)
+
     def __str__(self):
         """
         Return a string representation of a facility
@@ -48,9 +59,9 @@ class Facility(Model):
         url = "%s/api/v1/facility/?format=json" % config.url
         url = add_filters(url, filters)
         url = extend_url(url, limit, offset, order_by)
-        response = requests.get(url=url, headers=config.default_headers)
+        response = get_session().get(url=url, headers=config.default_headers)
         response.raise_for_status()
-        return ResultSet(Facility, url, response.json())
+        return ResultSet(Facility, url, decode_response(response))
 
     @staticmethod
     def get(**kwargs):
@@ -75,6 +86,6 @@ class Facility(Model):
                 "at this stage.")
         url = "%s/api/v1/facility/%s/?format=json" % (config.url,
                                                       facility_id)
-        response = requests.get(url=url, headers=config.default_headers)
+        response = get_session().get(url=url, headers=config.default_headers)
         response.raise_for_status()
-        return Facility(response.json())
+        return Facility(decode_response(response))
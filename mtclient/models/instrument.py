@@ -6,9 +6,9 @@ from __future__ import print_function
 import json
 import logging
 
-import requests
-
 from ..conf import config
+from ..utils.jsoncodec import decode_response
+from ..utils.session import get_session
 from .facility import Facility
 from .model import Model
 from .resultset import ResultSet
@@ -20,12 +20,22 @@ class Instrument(Model):
     """
     Model class for MyTardis API v1's InstrumentResource.
     """
+    __slots__ = ('id', 'name', 'facility')
+
     def __init__(self, response_dict):
         self.id = response_dict['id']  # pylint: disable=invalid-name
         self.name = response_dict['name']
         self.response_dict = response_dict
         self.facility = Facility(response_dict['facility'])
 
+    def to_dict(self):
+        """
+        Return a dictionary of the instrument's fields
+        """
+        return dict(id=self.id, name=self.name,
+                    facility=self.facility.to_dict(),
+                    resource_uri="/api/v1/instrument/%s/" % self.id)
+
     def __str__(self):
         """
         Return a string representation of an instrument
@@ -50,9 +60,9 @@ class Instrument(Model):
         url = "%s/api/v1/instrument/?format=json" % config.url
         url = add_filters(url, filters)
         url = extend_url(url, limit, offset, order_by)
-        response = requests.get(url=url, headers=config.default_headers)
+        response = get_session().get(url=url, headers=config.default_headers)
         response.raise_for_status()
-        return ResultSet(Instrument, url, response.json())
+        return ResultSet(Instrument, url, decode_response(response))
 
     @staticmethod
     def get(**kwargs):
@@ -77,9 +87,9 @@ class Instrument(Model):
                 "at this stage.")
         url = "%s/api/v1/instrument/%s/?format=json" % \
             (config.url, instrument_id)
-        response = requests.get(url=url, headers=config.default_headers)
+        response = get_session().get(url=url, headers=config.default_headers)
         response.raise_for_status()
-        return Instrument(response.json())
+        return Instrument(decode_response(response))
 
     @staticmethod
     def create(facility_id, name):
@@ -96,10 +106,10 @@ class Instrument(Model):
             "facility": "/api/v1/facility/%s/" % facility_id
         }
         url = "%s/api/v1/instrument/" % config.url
-        response = requests.post(headers=config.default_headers, url=url,
-                                 data=json.dumps(new_instrument_json))
+        response = get_session().post(headers=config.default_headers, url=url,
+                                      data=json.dumps(new_instrument_json))
         response.raise_for_status()
-        return Instrument(response.json())
+        return Instrument(decode_response(response))
 
     @staticmethod
     def update(instrument_id, name):
@@ -115,7 +125,7 @@ class Instrument(Model):
             "name": name,
         }
         url = "%s/api/v1/instrument/%s/" % (config.url, instrument_id)
-        response = requests.patch(headers=config.default_headers, url=url,
-                                  data=json.dumps(updated_fields_json))
+        response = get_session().patch(headers=config.default_headers, url=url,
+                                       data=json.dumps(updated_fields_json))
         response.raise_for_status()
-        return Instrument(response.json())
+        return Instrument(decode_response(response))
@@ -4,8 +4,10 @@ Base class for models to inherit from
 import six
 from six import with_metaclass
 
+from ..conf import config
 from .queryset import QuerySet
 
+
 class Manager(object):
     """
     Each Model.objects instance will be an instance of this
@@ -91,11 +93,50 @@ class ModelMetaclass(type):
         return cls._objects
 
 
-class Model(with_metaclass(ModelMetaclass, object)):
+class Record(object):
+    """
+    Base class for models and the records nested in them (replicas,
+    parameter sets, parameters etc.)
+
+    Records store their fields in __slots__ rather than a per-instance
+    __dict__, and only retain the deserialized JSON they were constructed
+    from (response_dict) if config.keep_response_dicts is True.  Otherwise,
+    response_dict is rebuilt from the record's fields by :meth:`to_dict`,
+    which omits any fields of the original response that the record
+    doesn't store.
+    """
+    __slots__ = ('_response_dict',)
+
+    @property
+    def response_dict(self):
+        """
+        The deserialized JSON the record was constructed from, or if it
+        wasn't retained, a dictionary rebuilt from the record's fields
+        """
+        if self._response_dict is None:
+            return self.to_dict()
+        return self._response_dict
+
+    @response_dict.setter
+    def response_dict(self, response_dict):
+        self._response_dict = \
+            response_dict if config.keep_response_dicts else None
+
+    def to_dict(self):
+        """
+        Return a dictionary of the record's fields, in the form returned
+        by the MyTardis API
+        """
+        raise NotImplementedError
+
+
+class Model(with_metaclass(ModelMetaclass, Record)):
     """
     Base class for models to inherit from
     """
     # pylint: disable=too-few-public-methods
+    __slots__ = ()
+
     def __repr__(self):
         """
         Return a string representation
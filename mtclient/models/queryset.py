@@ -14,16 +14,21 @@ class QuerySet(object):
     """
     # pylint: disable=too-few-public-methods
     def __init__(self, model, filters=None, limit=None, offset=None,
-                 order_by=None):
+                 order_by=None, stream=False):
         """
         Each record in the query set can be
         represented as an object of class model
+
+        With stream=True (for models with supports_streaming = True), each
+        page's records are decoded as they are received, and each page
+        must be consumed before the next page is requested.
         """
         self.model = model
         self._filters = filters
         self._limit = limit
         self._offset = offset or 0
         self._order_by = order_by
+        self._stream = stream
 
         self._result_set = None
 
@@ -38,9 +43,10 @@ class QuerySet(object):
         """
         The user has requested something which requires evaluating the query
         """
+        kwargs = dict(stream=True) if self._stream else {}
         self._result_set = self.model.list(
             filters=self._filters, limit=self._limit, offset=self._offset,
-            order_by=self._order_by)
+            order_by=self._order_by, **kwargs)
 
     def __repr__(self):
         """
@@ -60,21 +66,31 @@ class QuerySet(object):
             ", ".join(str(obj) for obj in self._result_set),
             post_ellipsis)
 
-    def __iter__(self):
+    def pages(self):
         """
-        Return an iterator for the QuerySet
+        Yield each page of results as a
+        :class:`mtclient.models.resultset.ResultSet`, requesting the next
+        page only when the previous one has been consumed.  Each streamed
+        page is closed before the next page is requested, or when the
+        iteration stops, even if not all of its records have been read.
         """
         if not self._result_set:
             self._execute_query()
-        for index in range(0, len(self._result_set)):
-            response_dict = \
-                self._result_set.response_dict['objects'][index]
-            yield self.model(response_dict)
+        try:
+            yield self._result_set
 
-        while self._result_set.next:
-            self._offset += self._result_set.limit
-            self._execute_query()
-            for index in range(0, len(self._result_set)):
-                response_dict = \
-                    self._result_set.response_dict['objects'][index]
+            while self._result_set.next:
+                self._result_set.close()
+                self._offset += self._result_set.limit
+                self._execute_query()
+                yield self._result_set
+        finally:
+            self._result_set.close()
+
+    def __iter__(self):
+        """
+        Return an iterator for the QuerySet
+        """
+        for result_set in self.pages():
+            for response_dict in result_set.records():
                 yield self.model(response_dict)
@@ -1,13 +1,16 @@
 """
 Model class for MyTardis API v1's ReplicaResource.
 """
+from .model import Record
 
 
-class Replica(object):
+class Replica(Record):
     """
     Model class for MyTardis API v1's ReplicaResource.
     """
     # pylint: disable=too-few-public-methods
+    __slots__ = ('id', 'location', 'uri', 'verified')
+
     def __init__(self, response_dict):
         self.response_dict = response_dict
         self.id = response_dict['id']  # pylint: disable=invalid-name
@@ -17,3 +20,10 @@ class Replica(object):
             self.location = ''
         self.uri = response_dict['uri']
         self.verified = response_dict['verified']
+
+    def to_dict(self):
+        """
+        Return a dictionary of the replica's fields
+        """
+        return dict(id=self.id, location=self.location, uri=self.uri,
+                    verified=self.verified)
@@ -2,7 +2,12 @@
 This module contains the :class:`ResultSet` class, an abstraction to represent
 the JSON returned by the MyTardis API, particularly for queries which return
 multiple records and could be subject to pagination.
+
+The :class:`StreamingResultSet` class represents the same JSON, but decodes
+each record as it is received, rather than decoding the whole response
+before returning.
 """
+from ..utils.jsonstream import CHUNK_SIZE, iter_list_response
 
 
 class ResultSet(object):
@@ -65,6 +70,19 @@ class ResultSet(object):
                               include_metadata=False)
         return self.model(self.response_dict['objects'][key])
 
+    def records(self):
+        """
+        Yield the API response dictionary for each record.
+        """
+        for record in self.response_dict['objects']:
+            yield record
+
+    def close(self):
+        """
+        Do nothing, because the whole response has already been read.
+        (For compatibility with :class:`StreamingResultSet`.)
+        """
+
     def __iter__(self):
         """
         Return the ResultSet's iterator object, which is itself.
@@ -93,3 +111,104 @@ class ResultSet(object):
             ]
         }
         return ResultSet(model, None, response_dict)
+
+
+class StreamingResultSet(object):
+    """
+    Abstraction to represent a streamed list response from the MyTardis
+    API.  The meta information (e.g. total_count and next) is available
+    as soon as the result set has been created, but each record is only
+    decoded from the response as the result set is iterated over, so the
+    whole response is never held in memory.  A streaming result set can
+    only be iterated over once.
+
+    The response is closed once all of its records have been iterated
+    over.  A result set which is abandoned before then should be closed
+    with :meth:`close` (or used as a context manager), so that its
+    connection can be reused.
+    """
+    # pylint: disable=too-many-instance-attributes
+    def __init__(self, model, url, response):
+        """
+        Read the response until its meta information has been decoded.
+
+        :param model: The class of each record.
+        :param url: The URL which was queried.
+        :param response: A :class:`requests.Response` from a request made
+            with stream=True.
+        """
+        self.model = model
+        self.url = url
+        self.response = response
+        self.closed = False
+        self._events = iter_list_response(
+            response.iter_content(chunk_size=CHUNK_SIZE))
+        # MyTardis sorts the response's keys, so 'meta' comes before
+        # 'objects', but any records received before it are kept:
+        self._early_records = []
+        meta = None
+        for key, value in self._events:
+            if key == 'object':
+                self._early_records.append(value)
+            elif key == 'meta':
+                meta = value
+                break
+        if meta is None:
+            self.close()
+            raise ValueError("The response from %s has no meta information."
+                             % url)
+        self.total_count = meta['total_count']
+        self.limit = meta['limit']
+        self.offset = meta['offset']
+        self.next = meta['next']
+
+    def __repr__(self):
+        """
+        String representation
+        """
+        return "<StreamingResultSet: %s %s>" % (self.model.__name__,
+                                                self.url)
+
+    def close(self):
+        """
+        Close the response, releasing its connection, even if some of its
+        records haven't been read.
+        """
+        if not self.closed:
+            self.closed = True
+            self.response.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __del__(self):
+        if hasattr(self, 'closed'):
+            self.close()
+
+    def records(self):
+        """
+        Yield the API response dictionary for each record, as it is
+        decoded from the response.
+        """
+        try:
+            while self._early_records:
+                yield self._early_records.pop(0)
+            for key, value in self._events:
+                if key == 'object':
+                    yield value
+        finally:
+            self.close()
+
+    def __iter__(self):
+        """
+        Yield a model instance for each record, as it is decoded from the
+        response.
+        """
+        kwargs = {}
+        if 'include_metadata' in self.model.__init__.__code__.co_varnames:
+            kwargs['include_metadata'] = False
+        for record in self.records():
+            yield self.model(record, **kwargs)
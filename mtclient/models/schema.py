@@ -6,21 +6,39 @@ from __future__ import print_function
 import logging
 import re
 
-import requests
-
 from ..conf import config
 from ..utils import extend_url, add_filters
+from ..utils.cache import metadata_cache
+from ..utils.jsoncodec import decode_response
+from ..utils.session import get_session
+from ..utils.tracing import traced
 from .model import Model
 from .resultset import ResultSet
 
 logger = logging.getLogger(__name__)  # pylint: disable=invalid-name
 
+#: Schema types, indexed by the type codes used by the MyTardis API.
+SCHEMA_TYPES = ['', 'Experiment schema', 'Dataset schema', 'Datafile schema',
+                'None', 'Instrument schema']
+
+#: Parameter name data types, indexed by the API's data type codes.
+DATA_TYPES = ['', 'Numeric', 'String', 'URL', 'Link',
+              'Filename', 'DateTime', 'Long String', 'JSON']
+
+#: Parameter name comparison types, indexed by the API's codes.
+COMPARISON_TYPES = ['', 'Exact value', 'Not equal',
+                    'Range', 'Greater than', 'Greater than or equal to',
+                    'Less than', 'Less than or equal to', 'Contains']
+
 
 class Schema(Model):
     """
     Model class for MyTardis API v1's SchemaResource.
     """
     # pylint: disable=too-many-instance-attributes
+    __slots__ = ('id', 'name', 'hidden', 'immutable', 'namespace', 'type',
+                 'subtype', 'parameter_names')
+
     def __init__(self, response_dict, param_names=False):
         self.response_dict = response_dict
         self.id = response_dict['id']  # pylint: disable=invalid-name
@@ -28,10 +46,7 @@ class Schema(Model):
         self.hidden = response_dict['hidden']
         self.immutable = response_dict['immutable']
         self.namespace = response_dict['namespace']
-        type_index = response_dict['type']
-        _schema_types = ['', 'Experiment schema', 'Dataset schema', 'Datafile schema',
-                         'None', 'Instrument schema']
-        self.type = _schema_types[type_index]  # pylint: disable=invalid-name
+        self.type = SCHEMA_TYPES[response_dict['type']]  # pylint: disable=invalid-name
         self.subtype = response_dict['subtype']
 
         if param_names:
@@ -40,6 +55,16 @@ class Schema(Model):
         else:
             self.parameter_names = ResultSet.empty(ParameterName)
 
+    def to_dict(self):
+        """
+        Return a dictionary of the schema's fields
+        """
+        return dict(id=self.id, name=self.name, hidden=self.hidden,
+                    immutable=self.immutable, namespace=self.namespace,
+                    type=SCHEMA_TYPES.index(self.type),
+                    subtype=self.subtype,
+                    resource_uri="/api/v1/schema/%s/" % self.id)
+
     def __str__(self):
         """
         Return a string representation of a schema
@@ -62,11 +87,12 @@ class Schema(Model):
         url = "%s/api/v1/schema/?format=json" % config.url
         url = add_filters(url, filters)
         url = extend_url(url, limit, offset, order_by)
-        response = requests.get(url=url, headers=config.default_headers)
+        response = get_session().get(url=url, headers=config.default_headers)
         response.raise_for_status()
-        return ResultSet(Schema, url, response.json())
+        return ResultSet(Schema, url, decode_response(response))
 
     @staticmethod
+    @traced("Schema.get", "id", "param_names")
     def get(**kwargs):
         r"""
         Retrieve a single schema record
@@ -89,9 +115,8 @@ class Schema(Model):
                 "at this stage.")
         param_names = kwargs.get("param_names", False)
         url = "%s/api/v1/schema/%s/?format=json" % (config.url, schema_id)
-        response = requests.get(url=url, headers=config.default_headers)
-        response.raise_for_status()
-        return Schema(response.json(), param_names)
+        return Schema(metadata_cache.get_json(url, config.default_headers),
+                      param_names)
 
 
 class ParameterName(Model):
@@ -100,6 +125,10 @@ class ParameterName(Model):
     """
     # pylint: disable=too-few-public-methods
     # pylint: disable=too-many-instance-attributes
+    __slots__ = ('schema', 'id', 'name', 'full_name', 'data_type', 'units',
+                 'immutable', 'is_searchable', 'order', 'choices',
+                 'comparison_type')
+
     def __init__(self, response_dict):
         self.response_dict = response_dict
         schema_id = response_dict['schema'].split('/')[-2]
@@ -107,20 +136,27 @@ class ParameterName(Model):
         self.id = response_dict['id']  # pylint: disable=invalid-name
         self.name = response_dict['name']
         self.full_name = response_dict['full_name']
-        _type_choices = ['', 'Numeric', 'String', 'URL', 'Link',
-                         'Filename', 'DateTime', 'Long String', 'JSON']
-        self.data_type = _type_choices[response_dict['data_type']]
+        self.data_type = DATA_TYPES[response_dict['data_type']]
         self.units = response_dict['units']
         self.immutable = response_dict['immutable']
         self.is_searchable = response_dict['is_searchable']
         self.order = response_dict['order']
         self.choices = response_dict['choices']
-        _comparison_types = \
-            ['', 'Exact value', 'Not equal',
-             'Range', 'Greater than', 'Greater than or equal to',
-             'Less than', 'Less than or equal to', 'Contains']
         self.comparison_type = \
-            _comparison_types[response_dict['comparison_type']]
+            COMPARISON_TYPES[response_dict['comparison_type']]
+
+    def to_dict(self):
+        """
+        Return a dictionary of the parameter name's fields
+        """
+        return dict(
+            id=self.id, schema="/api/v1/schema/%s/" % self.schema.id,
+            name=self.name, full_name=self.full_name,
+            data_type=DATA_TYPES.index(self.data_type), units=self.units,
+            immutable=self.immutable, is_searchable=self.is_searchable,
+            order=self.order, choices=self.choices,
+            comparison_type=COMPARISON_TYPES.index(self.comparison_type),
+            resource_uri="/api/v1/parametername/%s/" % self.id)
 
     def __str__(self):
         """
@@ -129,6 +165,7 @@ class ParameterName(Model):
         return "<%s: %s>" % (type(self).__name__, self.full_name)
 
     @staticmethod
+    @traced("ParameterName.list", "filters")
     def list(filters=None, limit=None, offset=None, order_by=None):
         """
         Retrieve a list of parameter names.
@@ -144,9 +181,9 @@ class ParameterName(Model):
         url = "%s/api/v1/parametername/?format=json" % config.url
         url = add_filters(url, filters)
         url = extend_url(url, limit, offset, order_by)
-        response = requests.get(url=url, headers=config.default_headers)
+        response = get_session().get(url=url, headers=config.default_headers)
         response.raise_for_status()
-        parameter_names_dict = response.json()
+        parameter_names_dict = decode_response(response)
         num_records = len(parameter_names_dict['objects'])
 
         schema_id = None
@@ -170,9 +207,10 @@ class ParameterName(Model):
             offset += limit
             url = "%s/api/v1/parametername/?format=json" % config.url
             url += "&offset=%s" % offset
-            response = requests.get(url=url, headers=config.default_headers)
+            response = get_session().get(url=url,
+                                         headers=config.default_headers)
             response.raise_for_status()
-            parameter_names_page_dict = response.json()
+            parameter_names_page_dict = decode_response(response)
             num_records += len(parameter_names_page_dict['objects'])
             parameter_names_page_dict['objects'] = \
                 [pn for pn in parameter_names_page_dict['objects']
@@ -202,6 +240,5 @@ class ParameterName(Model):
                 "get at this stage.")
         url = "%s/api/v1/parametername/%s/?format=json" % (config.url,
                                                            pname_id)
-        response = requests.get(url=url, headers=config.default_headers)
-        response.raise_for_status()
-        return ParameterName(response.json())
+        return ParameterName(
+            metadata_cache.get_json(url, config.default_headers))
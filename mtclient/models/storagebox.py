@@ -4,10 +4,11 @@ Model class for MyTardis API v1's StorageBoxResource.
 from __future__ import print_function
 
 import logging
-import requests
 
 from ..conf import config
-from .model import Model
+from ..utils.jsoncodec import decode_response
+from ..utils.session import get_session
+from .model import Model, Record
 
 logger = logging.getLogger(__name__)  # pylint: disable=invalid-name
 
@@ -17,6 +18,9 @@ class StorageBox(Model):
     Model class for MyTardis API v1's StorageBoxResource.
     """
     # pylint: disable=too-many-instance-attributes
+    __slots__ = ('id', 'name', 'description', 'django_storage_class',
+                 'max_size', 'status', 'attributes', 'options')
+
     def __init__(self, response_dict):
         self.id = response_dict['id']  # pylint: disable=invalid-name
         self.name = response_dict['name']
@@ -32,6 +36,18 @@ class StorageBox(Model):
         for option_json in response_dict['options']:
             self.options.append(StorageBoxOption(option_json))
 
+    def to_dict(self):
+        """
+        Return a dictionary of the storage box's fields
+        """
+        return dict(
+            id=self.id, name=self.name, description=self.description,
+            django_storage_class=self.django_storage_class,
+            max_size=self.max_size, status=self.status,
+            attributes=[attribute.to_dict() for attribute in self.attributes],
+            options=[option.to_dict() for option in self.options],
+            resource_uri="/api/v1/storagebox/%s/" % self.id)
+
     def __str__(self):
         """
         Return a string representation of a storage box
@@ -57,9 +73,9 @@ class StorageBox(Model):
         url = "%s/api/v1/storagebox/?format=json" % config.url
         url = add_filters(url, filters)
         url = extend_url(url, limit, offset, order_by)
-        response = requests.get(url=url, headers=config.default_headers)
+        response = get_session().get(url=url, headers=config.default_headers)
         response.raise_for_status()
-        return ResultSet(StorageBox, url, response.json())
+        return ResultSet(StorageBox, url, decode_response(response))
 
     @staticmethod
     def get(**kwargs):
@@ -84,28 +100,44 @@ class StorageBox(Model):
                 "at this stage.")
         url = "%s/api/v1/storagebox/%s/?format=json" % \
             (config.url, storage_box_id)
-        response = requests.get(url=url, headers=config.default_headers)
+        response = get_session().get(url=url, headers=config.default_headers)
         response.raise_for_status()
-        return StorageBox(response.json())
+        return StorageBox(decode_response(response))
 
 
-class StorageBoxAttribute(object):
+class StorageBoxAttribute(Record):
     """
     Model class for MyTardis API v1's StorageBoxAttributeResource.
     """
     # pylint: disable=too-few-public-methods
+    __slots__ = ('key', 'value')
+
     def __init__(self, response_dict):
         self.key = response_dict['key']
         self.value = response_dict['value']
         self.response_dict = response_dict
 
+    def to_dict(self):
+        """
+        Return a dictionary of the key and value
+        """
+        return dict(key=self.key, value=self.value)
+
 
-class StorageBoxOption(object):
+class StorageBoxOption(Record):
     """
     Model class for MyTardis API v1's StorageBoxOptionResource.
     """
     # pylint: disable=too-few-public-methods
+    __slots__ = ('key', 'value')
+
     def __init__(self, response_dict):
         self.key = response_dict['key']
         self.value = response_dict['value']
         self.response_dict = response_dict
+
+    def to_dict(self):
+        """
+        Return a dictionary of the key and value
+        """
+        return dict(key=self.key, value=self.value)
@@ -0,0 +1,7 @@
+"""
+Tools for testing and benchmarking code which uses mytardisclient
+against a local, in-process fake MyTardis server.
+"""
+from .data import SyntheticData  # noqa
+from .faults import FaultInjector, FaultRule  # noqa
+from .server import FakeMyTardis  # noqa
@@ -0,0 +1,332 @@
+"""
+Synthetic MyTardis records for the fake MyTardis server.
+
+:class:`SyntheticData` holds the records served by
+:class:`mtclient.testing.server.FakeMyTardis`, in the same (Tastypie)
+format as the MyTardis API, and can generate a facility, instrument,
+storage box, schemas, experiments, datasets and datafiles with
+deterministic contents, e.g.
+
+    data = SyntheticData()
+    data.generate(experiments=1, datasets_per_experiment=2,
+                  datafiles_per_dataset=1000, datafile_size=4096)
+"""
+import hashlib
+import threading
+from collections import OrderedDict
+from datetime import datetime
+
+#: The resources served by the fake MyTardis API.
+RESOURCES = ('facility', 'instrument', 'experiment', 'dataset',
+             'dataset_file', 'replica', 'storagebox', 'schema',
+             'parametername', 'experimentparameterset',
+             'datasetparameterset', 'datafileparameterset', 'group')
+
+#: Schema types, as used by MyTardis (see mtclient.models.schema.Schema).
+EXPERIMENT_SCHEMA, DATASET_SCHEMA, DATAFILE_SCHEMA = 1, 2, 3
+
+CREATED_TIME = "2016-11-10T13:50:25.258483"
+
+
+def resource_uri(resource, record_id):
+    """
+    Return the resource URI of a record, e.g. "/api/v1/dataset/1/".
+    """
+    return "/api/v1/%s/%s/" % (resource, record_id)
+
+
+def id_from_uri(uri):
+    """
+    Return the ID from a resource URI, e.g. 1 for "/api/v1/dataset/1/".
+    """
+    return int(uri.rstrip("/").split("/")[-1])
+
+
+def index_key(value):
+    """
+    Return the string form of a field value, as it would appear in a
+    query parameter, e.g. "true" for True.
+    """
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if value is None:
+        return ""
+    return u"%s" % value
+
+
+def datafile_content(datafile_id, size):
+    """
+    Return deterministic contents for a synthetic datafile.
+    """
+    block = hashlib.sha512(str(datafile_id).encode('utf-8')).digest() * 64
+    repeats = size // len(block) + 1
+    return (block * repeats)[:size]
+
+
+class SyntheticData(object):
+    """
+    Thread-safe store of MyTardis records, keyed by resource name and ID,
+    and of each datafile's contents.
+    """
+    def __init__(self):
+        #: The records of each resource, in order of their IDs.
+        self.records = dict((resource, OrderedDict())
+                            for resource in RESOURCES)
+        #: The contents of each datafile (keyed by ID), for datafiles
+        #: which have been uploaded.  The contents of generated datafiles
+        #: are calculated when they are downloaded.
+        self.contents = {}
+        self.lock = threading.RLock()
+        self._next_ids = dict((resource, 1) for resource in RESOURCES)
+        #: Indexes of records by the value of a field, built on demand by
+        #: :meth:`find`, keyed by (resource, field).
+        self._indexes = {}
+
+    def add(self, resource, record):
+        """
+        Add a record, assigning its ID and resource URI.
+
+        :return: The record.
+        """
+        with self.lock:
+            record_id = self._next_ids[resource]
+            self._next_ids[resource] += 1
+            record['id'] = record_id
+            record['resource_uri'] = resource_uri(resource, record_id)
+            self.records[resource][record_id] = record
+            for (index_resource, field), index in self._indexes.items():
+                if index_resource == resource:
+                    index.setdefault(index_key(record.get(field)),
+                                     []).append(record)
+            return record
+
+    def update(self, resource, record, fields):
+        """
+        Update a record's fields (except for its ID and resource URI).
+        """
+        with self.lock:
+            for field, value in fields.items():
+                if field not in ('id', 'resource_uri'):
+                    record[field] = value
+            for key in [key for key in self._indexes if key[0] == resource]:
+                del self._indexes[key]
+
+    def get(self, resource, record_id):
+        """
+        Return a record, or None if it doesn't exist.
+        """
+        with self.lock:
+            return self.records[resource].get(int(record_id))
+
+    def find(self, resource, field, value):
+        """
+        Return the records whose field has the (string form of) value,
+        using an index so that lookups (e.g. of a filename among a million
+        datafiles) don't scan every record.
+        """
+        with self.lock:
+            index = self._indexes.get((resource, field))
+            if index is None:
+                index = {}
+                for record in self.records[resource].values():
+                    index.setdefault(index_key(record.get(field)),
+                                     []).append(record)
+                self._indexes[(resource, field)] = index
+            return list(index.get(value, []))
+
+    def add_facility(self, name="Test Facility"):
+        """
+        Add a facility with a manager group.
+        """
+        group = self.add('group', dict(name="%s Managers" % name))
+        return self.add('facility', dict(
+            name=name, manager_group=group, created_time=CREATED_TIME,
+            modified_time=None))
+
+    def add_instrument(self, facility, name="Test Instrument"):
+        """
+        Add an instrument to a facility.
+        """
+        return self.add('instrument', dict(
+            name=name, facility=facility, created_time=CREATED_TIME,
+            modified_time=None))
+
+    def add_storage_box(self, name="default"):
+        """
+        Add a storage box.
+        """
+        return self.add('storagebox', dict(
+            name=name, description="Default storage",
+            django_storage_class="django.core.files.storage.FileSystemStorage",
+            max_size=1000000000000, status="online",
+            attributes=[], options=[]))
+
+    def add_schema(self, schema_type, name, parameter_names=()):
+        """
+        Add a schema, and a string parameter name for each of
+        parameter_names.
+        """
+        schema = self.add('schema', dict(
+            name=name, namespace="http://example.com/schemas/%s" % name,
+            type=schema_type, subtype="", hidden=False, immutable=False))
+        for order, parameter_name in enumerate(parameter_names):
+            self.add('parametername', dict(
+                schema=schema['resource_uri'], name=parameter_name,
+                full_name=parameter_name.replace("_", " ").title(),
+                data_type=2, units="", immutable=False, is_searchable=True,
+                order=order, choices="", comparison_type=1))
+        return schema
+
+    def add_parameter_set(self, resource, parent_field, parent, schema,
+                          values):
+        """
+        Add a parameter set (e.g. a 'datasetparameterset') for a record,
+        with a string parameter for each of the schema's parameter names.
+        """
+        parameter_names = [
+            name for name in self.records['parametername'].values()
+            if name['schema'] == schema['resource_uri']]
+        parameters = [
+            dict(id=index + 1, name=name['resource_uri'],
+                 string_value=value, numerical_value=None,
+                 datetime_value=None, link_id=None, value=value)
+            for index, (name, value) in enumerate(zip(parameter_names,
+                                                      values))]
+        parameter_set = self.add(resource, {
+            parent_field: parent['resource_uri'],
+            'schema': schema, 'parameters': parameters})
+        parent.setdefault('parameter_sets', []).append(parameter_set)
+        return parameter_set
+
+    def add_experiment(self, title="Test Experiment"):
+        """
+        Add an experiment.
+        """
+        return self.add('experiment', dict(
+            title=title, description="", institution_name="Test University",
+            start_time=None, end_time=None, created_time=CREATED_TIME,
+            update_time=CREATED_TIME, handle=None, locked=False,
+            public_access=1, license=None, owner_ids=[1],
+            parameter_sets=[]))
+
+    def add_dataset(self, experiments, description="Test Dataset",
+                    instrument=None):
+        """
+        Add a dataset to one or more experiments.
+        """
+        return self.add('dataset', dict(
+            description=description, directory=None,
+            experiments=[experiment['resource_uri']
+                         for experiment in experiments],
+            immutable=False, instrument=instrument, parameter_sets=[],
+            created_time=CREATED_TIME, modified_time=None))
+
+    def add_datafile(self, dataset, filename, size, directory="",
+                     storage_box=None, md5sum=None, verified=True,
+                     content=None):
+        """
+        Add a datafile to a dataset, with a replica in storage_box (if
+        supplied).  If content isn't supplied, deterministic contents are
+        generated (see :func:`datafile_content`).
+        """
+        with self.lock:
+            datafile = self.add('dataset_file', dict(
+                dataset=dataset['resource_uri'], filename=filename,
+                directory=directory, size=size, md5sum=md5sum or "",
+                sha512sum="", mimetype="application/octet-stream",
+                created_time=CREATED_TIME, modification_time=None,
+                deleted=False, deleted_time=None, version=1,
+                parameter_sets=[], replicas=[]))
+            if content is not None:
+                self.contents[datafile['id']] = content
+            if md5sum is None:
+                datafile['md5sum'] = hashlib.md5(
+                    self.content(datafile['id'])).hexdigest()
+            if storage_box is not None:
+                self.add_replica(datafile, storage_box['name'],
+                                 verified=verified)
+            return datafile
+
+    def add_replica(self, datafile, location, uri=None, verified=False):
+        """
+        Add a replica (DataFileObject) of a datafile.
+        """
+        dataset_id = id_from_uri(datafile['dataset'])
+        replica = self.add('replica', dict(
+            datafile=datafile['resource_uri'], location=location,
+            uri=uri or "dataset-%s/%s" % (
+                dataset_id, "/".join(filter(None, [datafile['directory'],
+                                                   datafile['filename']]))),
+            verified=verified, created_time=CREATED_TIME,
+            last_verified_time=CREATED_TIME if verified else None))
+        datafile['replicas'].append(replica)
+        return replica
+
+    def content(self, datafile_id):
+        """
+        Return a datafile's contents.
+        """
+        with self.lock:
+            if datafile_id in self.contents:
+                return self.contents[datafile_id]
+            datafile = self.records['dataset_file'][datafile_id]
+        return datafile_content(datafile_id, int(datafile['size']))
+
+    def generate(self, experiments=1, datasets_per_experiment=1,
+                 datafiles_per_dataset=10, datafile_size=1024,
+                 datafiles_per_directory=None, parameters=True):
+        """
+        Generate a facility, instrument, storage box, schemas (if
+        parameters is True), and the requested numbers of experiments,
+        datasets and datafiles.
+
+        :param datafiles_per_directory: If supplied, each dataset's
+            datafiles are split into subdirectories containing this many
+            datafiles each.
+        :return: self
+        """
+        # pylint: disable=too-many-arguments,too-many-locals
+        facility = self.add_facility()
+        instrument = self.add_instrument(facility)
+        storage_box = self.add_storage_box()
+        schemas = {}
+        if parameters:
+            for schema_type, name in ((EXPERIMENT_SCHEMA, "experiment"),
+                                      (DATASET_SCHEMA, "dataset"),
+                                      (DATAFILE_SCHEMA, "datafile")):
+                schemas[schema_type] = self.add_schema(
+                    schema_type, "%s_metadata" % name,
+                    ["sample_name", "operator"])
+        for experiment_index in range(experiments):
+            experiment = self.add_experiment(
+                "Experiment %s" % (experiment_index + 1))
+            if parameters:
+                self.add_parameter_set(
+                    'experimentparameterset', 'experiment', experiment,
+                    schemas[EXPERIMENT_SCHEMA], ["Sample 1", "Operator 1"])
+            for dataset_index in range(datasets_per_experiment):
+                dataset = self.add_dataset(
+                    [experiment], "Dataset %s-%s" % (experiment_index + 1,
+                                                     dataset_index + 1),
+                    instrument=instrument)
+                if parameters:
+                    self.add_parameter_set(
+                        'datasetparameterset', 'dataset', dataset,
+                        schemas[DATASET_SCHEMA], ["Sample 1", "Operator 1"])
+                for datafile_index in range(datafiles_per_dataset):
+                    directory = ""
+                    if datafiles_per_directory:
+                        directory = "dir%04d" % (
+                            datafile_index // datafiles_per_directory)
+                    self.add_datafile(
+                        dataset, "file%07d.dat" % (datafile_index + 1),
+                        datafile_size, directory=directory,
+                        storage_box=storage_box)
+        return self
+
+    @staticmethod
+    def timestamp():
+        """
+        Return the current time in the format used by MyTardis.
+        """
+        return datetime.now().isoformat()
@@ -0,0 +1,257 @@
+"""
+Fault and latency injection for the fake MyTardis server.
+
+A :class:`FaultInjector` holds a list of :class:`FaultRule` objects, each
+applying to the requests whose method and endpoint (the URL path with IDs
+replaced by "{id}", e.g. "/api/v1/dataset_file/{id}/download/") match
+it.  The first matching rule can delay the response (latency), reject it
+with a 5xx or 429 (Too Many Requests) response, cap its bandwidth, delay
+its body after its headers (slow first byte), or reset the connection
+part of the way through a download.  Random choices use the injector's
+own random number generator, so a seed makes them reproducible, e.g.
+
+    faults = FaultInjector([
+        FaultRule(endpoint="/download/$", bandwidth=10 * 1024 ** 2,
+                  first_byte_delay=0.2, reset_rate=0.01),
+        FaultRule(latency=LogNormal(median=0.04, sigma=0.5),
+                  error_rate=0.01, throttle_rate=0.01),
+    ], seed=42)
+    with FakeMyTardis(data, faults=faults) as server:
+        ...
+
+:data:`PROFILES` defines some typical network conditions, which can be
+used with :meth:`FaultInjector.from_profile`.
+"""
+import math
+import random
+import re
+import threading
+
+from ..utils.instrumentation import endpoint_template
+
+
+class Constant(object):
+    """
+    A fixed delay.
+    """
+    # pylint: disable=too-few-public-methods
+    def __init__(self, seconds):
+        self.seconds = seconds
+
+    def sample(self, _):
+        """
+        Return the delay in seconds.
+        """
+        return self.seconds
+
+
+class Uniform(object):
+    """
+    Delays uniformly distributed between low and high seconds.
+    """
+    # pylint: disable=too-few-public-methods
+    def __init__(self, low, high):
+        self.low = low
+        self.high = high
+
+    def sample(self, rng):
+        """
+        Return a delay in seconds, using the random number generator rng.
+        """
+        return rng.uniform(self.low, self.high)
+
+
+class Exponential(object):
+    """
+    Exponentially distributed delays with a mean of mean seconds.
+    """
+    # pylint: disable=too-few-public-methods
+    def __init__(self, mean):
+        self.mean = mean
+
+    def sample(self, rng):
+        """
+        Return a delay in seconds, using the random number generator rng.
+        """
+        return rng.expovariate(1.0 / self.mean) if self.mean else 0.0
+
+
+class LogNormal(object):
+    """
+    Log-normally distributed delays (typical of WAN round trip times, with
+    a long tail), with a median of median seconds.
+
+    :param sigma: The standard deviation of the delay's logarithm; larger
+        values give a longer tail.
+    """
+    # pylint: disable=too-few-public-methods
+    def __init__(self, median, sigma=0.5):
+        self.median = median
+        self.sigma = sigma
+
+    def sample(self, rng):
+        """
+        Return a delay in seconds, using the random number generator rng.
+        """
+        return rng.lognormvariate(math.log(self.median), self.sigma)
+
+
+def distribution(delay):
+    """
+    Return delay as a distribution, converting a number of seconds to a
+    :class:`Constant` delay.
+    """
+    if delay is None or hasattr(delay, 'sample'):
+        return delay
+    return Constant(delay)
+
+
+class FaultRule(object):
+    """
+    The faults injected into matching requests.
+
+    :param endpoint: A regular expression searched for in the request's
+        endpoint, e.g. "/download/$" (default: all endpoints).
+    :param method: The HTTP method (default: all methods).
+    :param latency: The delay (in seconds, or a distribution such as
+        :class:`LogNormal`) before responding.
+    :param first_byte_delay: The delay (in seconds, or a distribution)
+        between sending the response's headers and its body.
+    :param bandwidth: The maximum rate (in bytes per second) at which
+        each request body is received and each response body is sent.
+    :param error_rate: The fraction of requests which fail with
+        error_status.
+    :param error_status: The status of failed requests (default: 503).
+    :param throttle_rate: The fraction of requests which are rejected with
+        429 (Too Many Requests) and a Retry-After header.
+    :param retry_after: The Retry-After header's value, in seconds.
+    :param reset_rate: The fraction of downloads whose connection is reset
+        part of the way through.
+    :param reset_after: The fraction of the download sent before the
+        connection is reset.
+    """
+    # pylint: disable=too-many-instance-attributes,too-many-arguments
+    def __init__(self, endpoint=None, method=None, latency=None,
+                 first_byte_delay=None, bandwidth=None, error_rate=0.0,
+                 error_status=503, throttle_rate=0.0, retry_after=1,
+                 reset_rate=0.0, reset_after=0.5):
+        self.endpoint = re.compile(endpoint) if endpoint else None
+        self.method = method.upper() if method else None
+        self.latency = distribution(latency)
+        self.first_byte_delay = distribution(first_byte_delay)
+        self.bandwidth = bandwidth
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self.reset_rate = reset_rate
+        self.reset_after = reset_after
+
+    def matches(self, method, endpoint):
+        """
+        Return True if the rule applies to a request.
+        """
+        if self.method and self.method != method:
+            return False
+        return self.endpoint is None or bool(self.endpoint.search(endpoint))
+
+
+class Faults(object):
+    """
+    The faults chosen for a single request by :meth:`FaultInjector.choose`.
+    """
+    # pylint: disable=too-few-public-methods,too-many-instance-attributes
+    def __init__(self, latency=0.0, first_byte_delay=0.0, bandwidth=None,
+                 status=None, headers=None, reset_after=None):
+        #: The delay before responding, in seconds.
+        self.latency = latency
+        #: The delay between the response's headers and body, in seconds.
+        self.first_byte_delay = first_byte_delay
+        #: The maximum rate at which the request body is received and the
+        #: response body is sent, in bytes per second.
+        self.bandwidth = bandwidth
+        #: The status of an error response to send instead of handling the
+        #: request, or None.
+        self.status = status
+        #: Extra headers for the error response.
+        self.headers = headers or {}
+        #: The fraction of a download to send before resetting the
+        #: connection, or None.
+        self.reset_after = reset_after
+
+
+class FaultInjector(object):
+    """
+    Chooses the faults to inject into each request, from the first
+    matching rule.
+
+    :param rules: A list of :class:`FaultRule` objects.
+    :param seed: A seed for the random number generator, to make the
+        faults reproducible.
+    """
+    def __init__(self, rules, seed=None):
+        self.rules = list(rules)
+        self.rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def from_profile(name, seed=None):
+        """
+        Return a FaultInjector for one of the :data:`PROFILES`.
+        """
+        return FaultInjector(
+            [FaultRule(**rule) for rule in PROFILES[name]], seed=seed)
+
+    def rule_for(self, method, path):
+        """
+        Return the first rule matching a request, or None.
+        """
+        endpoint = endpoint_template(path)
+        for rule in self.rules:
+            if rule.matches(method, endpoint):
+                return rule
+        return None
+
+    def choose(self, method, path):
+        """
+        Choose the faults to inject into a request.
+
+        :return: A :class:`Faults` object, or None if no rule matches.
+        """
+        rule = self.rule_for(method, path)
+        if rule is None:
+            return None
+        with self._lock:
+            faults = Faults(
+                latency=rule.latency.sample(self.rng) if rule.latency else 0.0,
+                first_byte_delay=rule.first_byte_delay.sample(self.rng)
+                if rule.first_byte_delay else 0.0,
+                bandwidth=rule.bandwidth)
+            draw = self.rng.random()
+            if draw < rule.error_rate:
+                faults.status = rule.error_status
+            elif draw < rule.error_rate + rule.throttle_rate:
+                faults.status = 429
+                faults.headers['Retry-After'] = str(rule.retry_after)
+            if rule.reset_rate and self.rng.random() < rule.reset_rate:
+                faults.reset_after = rule.reset_after
+        return faults
+
+
+#: Fault rules (as FaultRule keyword arguments) for typical conditions.
+PROFILES = dict(
+    # A lossless, low latency local network:
+    lan=[dict(latency=Uniform(0.0002, 0.001))],
+    # A long distance link with ~10 MB/s per connection:
+    wan=[dict(endpoint="/download/$", latency=LogNormal(0.04, 0.5),
+              first_byte_delay=LogNormal(0.05, 0.7),
+              bandwidth=10 * 1024 ** 2),
+         dict(latency=LogNormal(0.04, 0.5), bandwidth=10 * 1024 ** 2)],
+    # The wan profile, plus errors, throttling and connection resets:
+    lossy_wan=[dict(endpoint="/download/$", latency=LogNormal(0.04, 0.5),
+                    first_byte_delay=LogNormal(0.05, 0.7),
+                    bandwidth=10 * 1024 ** 2, error_rate=0.02,
+                    throttle_rate=0.02, reset_rate=0.02),
+               dict(latency=LogNormal(0.04, 0.5), bandwidth=10 * 1024 ** 2,
+                    error_rate=0.02, throttle_rate=0.02)],
+)
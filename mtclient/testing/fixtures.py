@@ -0,0 +1,34 @@
+"""
+pytest fixtures for running tests against a fake MyTardis server, e.g.
+
+    from mtclient.testing.fixtures import fake_mytardis  # noqa
+
+    def test_list(fake_mytardis):
+        fake_mytardis.data.generate(datafiles_per_dataset=50)
+        datafiles = DataFile.list(filters="dataset__id=1")
+        ...
+"""
+import pytest
+
+from ..conf import config
+from .server import FakeMyTardis
+
+USERNAME = "testuser"
+API_KEY = "bogus"
+
+
+@pytest.fixture
+def fake_mytardis():
+    """
+    Run a fake MyTardis server (with no records, until the test adds or
+    generates some) and point the client's configuration at it.
+    """
+    saved = (config.url, config.username, config.apikey)
+    with FakeMyTardis(username=USERNAME, api_key=API_KEY) as server:
+        config.url = server.url
+        config.username = USERNAME
+        config.apikey = API_KEY
+        try:
+            yield server
+        finally:
+            config.url, config.username, config.apikey = saved
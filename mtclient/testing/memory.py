@@ -0,0 +1,91 @@
+"""
+Measuring the memory used by model objects, with tracemalloc.
+
+:func:`measure` runs a function while tracing memory allocations, and
+reports the peak memory allocated while it ran and the memory still
+allocated when it returned (while its result is still referenced), e.g.
+the memory retained by a list of DataFile objects:
+
+    page = list_response(data, 'dataset_file')
+    datafiles, usage = measure(resultset_models, DataFile, page)
+    print(usage.retained / len(datafiles), "bytes per DataFile")
+
+tracemalloc requires Python 3.4 or later.
+"""
+import gc
+from collections import namedtuple
+
+from ..utils.jsoncodec import dumps, loads
+
+#: The memory (in bytes) allocated at the peak of a measured function,
+#: and still allocated when it returned.
+MemoryUsage = namedtuple('MemoryUsage', ['peak', 'retained'])
+
+
+def measure(func, *args, **kwargs):
+    """
+    Call func with args and kwargs, tracing its memory allocations.
+
+    :return: The function's result, and a :class:`MemoryUsage`.
+    """
+    import tracemalloc
+
+    was_tracing = tracemalloc.is_tracing()
+    if was_tracing:
+        tracemalloc.stop()
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = func(*args, **kwargs)
+        gc.collect()
+        retained, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+        if was_tracing:
+            tracemalloc.start()
+    return result, MemoryUsage(peak=peak, retained=retained)
+
+
+def list_response(data, resource):
+    """
+    Return a list response body (as UTF-8 encoded JSON) containing all of
+    a resource's records.
+
+    :param data: A :class:`mtclient.testing.data.SyntheticData` store.
+    """
+    with data.lock:
+        objects = list(data.records[resource].values())
+    return dumps(dict(
+        meta=dict(limit=0, offset=0, total_count=len(objects), next=None,
+                  previous=None),
+        objects=objects)).encode('utf-8')
+
+
+def resultset_models(model, body, url="/api/v1/"):
+    """
+    Decode a list response body into a :class:`ResultSet`, and return a
+    list of model objects for its records.
+    """
+    from ..models.resultset import ResultSet
+
+    return list(ResultSet(model, url, loads(body)))
+
+
+def queryset_models(model, filters=None, stream=False):
+    """
+    Return a list of model objects for every record (on every page)
+    matching filters.
+    """
+    from ..models.queryset import QuerySet
+
+    return list(QuerySet(model, filters=filters, stream=stream))
+
+
+def queryset_count(model, filters=None, stream=False):
+    """
+    Iterate over every record matching filters, without retaining the
+    model objects, and return the number of records.
+    """
+    from ..models.queryset import QuerySet
+
+    return sum(1 for _ in QuerySet(model, filters=filters, stream=stream))
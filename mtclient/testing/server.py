@@ -0,0 +1,754 @@
+"""
+An in-process fake MyTardis server, for tests and benchmarks which need
+real HTTP behaviour (keep-alive, pagination, streamed downloads and
+concurrent requests) without a network or a MyTardis deployment.
+
+:class:`FakeMyTardis` serves the records of a
+:class:`mtclient.testing.data.SyntheticData` store through a
+Tastypie-compatible subset of the MyTardis API:
+
+- ``GET /api/v1/`` and ``GET /api/v1/<resource>/schema/``
+- ``GET /api/v1/<resource>/`` with filters (e.g. ``dataset__id=1``,
+  ``filename=file1.txt``, ``name__icontains=test``), ``limit``,
+  ``offset``, ``order_by`` and pagination meta
+- ``GET /api/v1/<resource>/<id>/`` and ``GET /api/v1/<resource>/set/1;2/``
+- ``POST /api/v1/<resource>/`` (JSON or multipart uploads with
+  ``json_data`` and ``attached_file`` fields)
+- ``PATCH /api/v1/<resource>/<id>/``
+- ``GET /api/v1/dataset_file/<id>/download/`` (with Range support)
+- ``GET /api/v1/dataset_file/<id>/verify/``
+
+e.g.
+
+    from mtclient.testing import FakeMyTardis, SyntheticData
+
+    data = SyntheticData().generate(datafiles_per_dataset=100)
+    with FakeMyTardis(data) as server:
+        config.url = server.url
+        ...
+
+Latency and faults (e.g. errors, bandwidth caps and connection resets) can
+be injected with a :class:`mtclient.testing.faults.FaultInjector`, e.g.
+
+    server.faults = FaultInjector.from_profile('wan')
+"""
+import logging
+import re
+import socket
+import struct
+import sys
+import threading
+import time
+
+import six
+from six.moves import BaseHTTPServer  # pylint: disable=import-error
+from six.moves import socketserver  # pylint: disable=import-error
+from six.moves.urllib.parse import parse_qsl  # pylint: disable=import-error
+from six.moves.urllib.parse import urlparse  # pylint: disable=import-error
+
+from ..utils.jsoncodec import dumps, loads
+from ..utils.throttle import BandwidthLimiter
+from .data import RESOURCES, SyntheticData, id_from_uri, index_key
+
+logger = logging.getLogger(__name__)  # pylint: disable=invalid-name
+
+#: The default page size of list responses, as in MyTardis.
+DEFAULT_LIMIT = 20
+
+#: The number of bytes written to the socket at a time by downloads.
+DOWNLOAD_CHUNK_SIZE = 65536
+
+#: Query parameters which aren't filters.
+NON_FILTER_PARAMS = ('format', 'limit', 'offset', 'order_by')
+
+#: Field lookups supported by filters, e.g. "name__icontains=test".
+LOOKUPS = ('exact', 'iexact', 'contains', 'icontains', 'startswith', 'in')
+
+API_PATH = "/api/v1/"
+ROUTE_REGEX = re.compile(
+    r"^/api/v1/(?P<resource>\w+)/"
+    r"(?:(?P<schema>schema)/"
+    r"|set/(?P<ids>[\d;]+)/"
+    r"|(?P<id>\d+)/(?:(?P<action>download|verify)/)?)?$")
+RANGE_REGEX = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+class HttpError(Exception):
+    """
+    Raised by request handlers to send an error response.
+    """
+    def __init__(self, status, message):
+        super(HttpError, self).__init__(message)
+        self.status = status
+        self.message = message
+
+
+def lookup_matches(lookup, value, expected):
+    """
+    Return True if a (non-list, non-dict) field value matches a filter.
+    """
+    value = index_key(value)
+    if lookup == 'iexact':
+        return value.lower() == expected.lower()
+    if lookup == 'contains':
+        return expected in value
+    if lookup == 'icontains':
+        return expected.lower() in value.lower()
+    if lookup == 'startswith':
+        return value.startswith(expected)
+    if lookup == 'in':
+        return value in expected.split(",")
+    return value == expected
+
+
+def sort_key(value):
+    """
+    Return a key for ordering records by a field's value, with null values
+    last.
+    """
+    return (value is None, value if value is not None else 0)
+
+
+class FakeMyTardisServer(socketserver.ThreadingMixIn,
+                         BaseHTTPServer.HTTPServer):
+    """
+    Threaded HTTP server holding the data served by
+    :class:`FakeMyTardisHandler`.
+    """
+    daemon_threads = True
+    allow_reuse_address = True
+
+    # pylint: disable=too-many-arguments
+    def __init__(self, address, data, username=None, api_key=None,
+                 faults=None):
+        BaseHTTPServer.HTTPServer.__init__(self, address, FakeMyTardisHandler)
+        self.data = data
+        self.username = username
+        self.api_key = api_key
+        #: An optional :class:`mtclient.testing.faults.FaultInjector`.
+        self.faults = faults
+        #: The number of requests and (TCP) connections handled.
+        self.request_count = 0
+        self.connection_count = 0
+        self.counter_lock = threading.Lock()
+
+    def handle_error(self, request, client_address):
+        """
+        Log connection errors (e.g. a client closing its connection during
+        a response), rather than printing their tracebacks.
+        """
+        if isinstance(sys.exc_info()[1], socket.error):
+            logger.debug("Connection error from %s", client_address,
+                         exc_info=True)
+            return
+        BaseHTTPServer.HTTPServer.handle_error(self, request, client_address)
+
+    def count(self, requests=0, connections=0):
+        """
+        Increment the request and connection counters.
+        """
+        with self.counter_lock:
+            self.request_count += requests
+            self.connection_count += connections
+
+
+class FakeMyTardisHandler(BaseHTTPServer.BaseHTTPRequestHandler):
+    """
+    Handles requests to the fake MyTardis API, using HTTP/1.1 so that
+    connections are kept alive between requests.
+    """
+    protocol_version = "HTTP/1.1"
+    server_version = "FakeMyTardis/1.0"
+    # Send each response's headers and body without waiting for the
+    # client's delayed ACK of the headers:
+    disable_nagle_algorithm = True
+
+    def setup(self):
+        BaseHTTPServer.BaseHTTPRequestHandler.setup(self)
+        self.server.count(connections=1)
+        #: The :class:`mtclient.testing.faults.Faults` injected into the
+        #: current request, if any.
+        self.faults = None
+        self.limiter = None
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        logger.debug("%s - %s", self.address_string(), format % args)
+
+    @property
+    def data(self):
+        """
+        The :class:`mtclient.testing.data.SyntheticData` being served.
+        """
+        return self.server.data
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        """
+        Handle a GET request.
+        """
+        self.handle_request(self.get)
+
+    def do_POST(self):  # pylint: disable=invalid-name
+        """
+        Handle a POST request.
+        """
+        self.handle_request(self.post)
+
+    def do_PATCH(self):  # pylint: disable=invalid-name
+        """
+        Handle a PATCH request.
+        """
+        self.handle_request(self.patch)
+
+    def handle_request(self, method_handler):
+        """
+        Authenticate the request, route it and send the response, or an
+        error response if the handler raises :class:`HttpError`.
+        """
+        self.server.count(requests=1)
+        parsed_url = urlparse(self.path)
+        query = dict(parse_qsl(parsed_url.query, keep_blank_values=True))
+        self.faults = self.server.faults.choose(
+            self.command, parsed_url.path) if self.server.faults else None
+        self.limiter = BandwidthLimiter(self.faults.bandwidth) \
+            if self.faults and self.faults.bandwidth else None
+        body = self.read_body()
+        if self.faults and self.faults.latency:
+            time.sleep(self.faults.latency)
+        if self.faults and self.faults.status:
+            self.send_json(self.faults.status,
+                           dict(error_message="Injected fault."),
+                           headers=self.faults.headers)
+            return
+        try:
+            self.authenticate()
+            if parsed_url.path == API_PATH:
+                if self.command != 'GET':
+                    raise HttpError(405, "Method not allowed.")
+                self.send_json(200, self.api_root())
+                return
+            match = ROUTE_REGEX.match(parsed_url.path)
+            if not match or match.group('resource') not in RESOURCES:
+                raise HttpError(404, "Not found: %s" % parsed_url.path)
+            method_handler(match.groupdict(), query, body)
+        except HttpError as err:
+            self.send_json(err.status, dict(error_message=err.message))
+
+    def authenticate(self):
+        """
+        Check the ApiKey Authorization header, if the server requires one.
+        """
+        if not self.server.api_key:
+            return
+        expected = "ApiKey %s:%s" % (self.server.username,
+                                     self.server.api_key)
+        if self.headers.get('Authorization') != expected:
+            raise HttpError(401, "Unauthorized.")
+
+    def read_body(self):
+        """
+        Read the request body (which may use chunked transfer encoding),
+        within any injected bandwidth cap.
+        """
+        if self.headers.get('Transfer-Encoding', '').lower() == 'chunked':
+            chunks = []
+            while True:
+                size = int(self.rfile.readline().split(b";")[0], 16)
+                if size == 0:
+                    self.rfile.readline()
+                    break
+                chunks.append(self.rfile.read(size))
+                self.rfile.readline()
+            return b"".join(chunks)
+        length = int(self.headers.get('Content-Length') or 0)
+        if self.limiter is None:
+            return self.rfile.read(length) if length else b""
+        chunks = []
+        for offset in range(0, length, DOWNLOAD_CHUNK_SIZE):
+            chunk_size = min(DOWNLOAD_CHUNK_SIZE, length - offset)
+            self.limiter.consume(chunk_size)
+            chunks.append(self.rfile.read(chunk_size))
+        return b"".join(chunks)
+
+    def send_json(self, status, obj, headers=None):
+        """
+        Send a JSON response.
+        """
+        body = dumps(obj).encode('utf-8')
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.write_body(body)
+
+    def write_body(self, body):
+        """
+        Write (part of) a response body, after any injected first byte
+        delay, and within any injected bandwidth cap.
+        """
+        if self.faults and self.faults.first_byte_delay:
+            time.sleep(self.faults.first_byte_delay)
+            self.faults.first_byte_delay = 0
+            # Don't let the bandwidth cap make up for the delay:
+            self.limiter = BandwidthLimiter(self.faults.bandwidth) \
+                if self.faults.bandwidth else None
+        if self.limiter is None:
+            self.wfile.write(body)
+            return
+        for offset in range(0, len(body), DOWNLOAD_CHUNK_SIZE):
+            chunk = body[offset:offset + DOWNLOAD_CHUNK_SIZE]
+            self.limiter.consume(len(chunk))
+            self.wfile.write(chunk)
+
+    def reset_connection(self):
+        """
+        Reset the connection (sending a TCP RST rather than closing it
+        cleanly), e.g. part of the way through a download.
+        """
+        self.connection.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER,
+                                   struct.pack('ii', 1, 0))
+        self.close_connection = True
+        self.connection.close()
+
+    def api_root(self):
+        """
+        Return the list of API endpoints.
+        """
+        return dict(
+            (resource, dict(list_endpoint="%s%s/" % (API_PATH, resource),
+                            schema="%s%s/schema/" % (API_PATH, resource)))
+            for resource in RESOURCES)
+
+    def get(self, route, query, _):
+        """
+        Handle a GET request for a schema, list, set, detail, download or
+        verify endpoint.
+        """
+        resource = route['resource']
+        if route['schema']:
+            self.send_json(200, self.api_schema(resource))
+        elif route['ids']:
+            self.send_json(200, self.get_set(resource, route['ids']))
+        elif route['action'] == 'download':
+            self.download(self.get_record(resource, route['id']))
+        elif route['action'] == 'verify':
+            self.verify(self.get_record(resource, route['id']))
+        elif route['id']:
+            self.send_json(200, self.get_record(resource, route['id']))
+        else:
+            self.send_json(200, self.get_list(resource, query))
+
+    def get_record(self, resource, record_id):
+        """
+        Return a record, or raise a 404 error.
+        """
+        record = self.data.get(resource, record_id)
+        if record is None:
+            raise HttpError(404, "No %s with ID %s." % (resource, record_id))
+        return record
+
+    def api_schema(self, resource):
+        """
+        Return the Tastypie schema of a resource, with its fields based on
+        its first record.
+        """
+        with self.data.lock:
+            records = list(self.data.records[resource].values())
+        fields = dict(
+            (field, dict(type="string", nullable=True, readonly=False,
+                         help_text="", blank=False, default="",
+                         unique=field == 'id'))
+            for field in (records[0] if records else {}))
+        return dict(
+            fields=fields,
+            filtering=dict((field, 2) for field in fields),
+            ordering=sorted(fields),
+            allowed_list_http_methods=['get', 'post'],
+            allowed_detail_http_methods=['get', 'patch'],
+            default_format="application/json",
+            default_limit=DEFAULT_LIMIT)
+
+    def get_set(self, resource, ids):
+        """
+        Return the records requested from a set endpoint.
+        """
+        objects = []
+        not_found = []
+        for record_id in ids.split(";"):
+            record = self.data.get(resource, record_id)
+            if record is None:
+                not_found.append(record_id)
+            else:
+                objects.append(record)
+        response = dict(objects=objects)
+        if not_found:
+            response['not_found'] = not_found
+        return response
+
+    def matches(self, value, path, lookup, expected):
+        """
+        Return True if the value at path (a list of field names, following
+        nested records, resource URIs and lists) within value matches a
+        filter.
+        """
+        if isinstance(value, list):
+            return any(self.matches(item, path, lookup, expected)
+                       for item in value)
+        if not path:
+            if isinstance(value, dict):
+                value = value.get('id')
+            return lookup_matches(lookup, value, expected)
+        if isinstance(value, dict):
+            return path[0] in value and \
+                self.matches(value[path[0]], path[1:], lookup, expected)
+        if isinstance(value, six.string_types) and \
+                value.startswith(API_PATH):
+            if path == ['id']:
+                return lookup_matches(lookup, id_from_uri(value), expected)
+            resource = value[len(API_PATH):].split("/")[0]
+            record = self.data.get(resource, id_from_uri(value)) \
+                if resource in RESOURCES else None
+            return record is not None and \
+                self.matches(record, path, lookup, expected)
+        return False
+
+    def get_list(self, resource, query):
+        """
+        Return a page of records with its pagination meta.
+        """
+        filters = []
+        for param, expected in query.items():
+            if param in NON_FILTER_PARAMS:
+                continue
+            path = param.split("__")
+            lookup = path.pop() if len(path) > 1 and path[-1] in LOOKUPS \
+                else 'exact'
+            filters.append((path, lookup, expected))
+        # Use an index for the first exact match of a (non-relation) field:
+        indexed = [(path, lookup, expected)
+                   for path, lookup, expected in filters
+                   if len(path) == 1 and lookup == 'exact']
+        if indexed:
+            filters.remove(indexed[0])
+            records = self.data.find(resource, indexed[0][0][0],
+                                     indexed[0][2])
+        else:
+            with self.data.lock:
+                records = list(self.data.records[resource].values())
+        for path, lookup, expected in filters:
+            records = [record for record in records
+                       if self.matches(record, path, lookup, expected)]
+        order_by = query.get('order_by')
+        if order_by:
+            field = order_by.lstrip("-")
+            records.sort(key=lambda record: sort_key(record.get(field)),
+                         reverse=order_by.startswith("-"))
+        try:
+            limit = int(query.get('limit', DEFAULT_LIMIT))
+            offset = int(query.get('offset', 0))
+        except ValueError:
+            raise HttpError(400, "Invalid limit or offset.")
+        total_count = len(records)
+        page = records[offset:offset + limit] if limit else records[offset:]
+
+        def page_uri(page_offset):
+            """
+            Return the URI of the page at page_offset.
+            """
+            params = [(key, value) for key, value in sorted(query.items())
+                      if key not in ('limit', 'offset')]
+            params += [('limit', limit), ('offset', page_offset)]
+            return "%s%s/?%s" % (API_PATH, resource, "&".join(
+                "%s=%s" % param for param in params))
+
+        next_uri = page_uri(offset + limit) \
+            if limit and offset + limit < total_count else None
+        previous_uri = page_uri(max(offset - limit, 0)) \
+            if limit and offset > 0 else None
+        return dict(
+            meta=dict(limit=limit, offset=offset, total_count=total_count,
+                      next=next_uri, previous=previous_uri),
+            objects=page)
+
+    def post(self, route, _, body):
+        """
+        Create a record from a JSON or multipart/form-data request.
+        """
+        if route['id'] or route['ids'] or route['schema']:
+            raise HttpError(405, "Method not allowed.")
+        resource = route['resource']
+        content = None
+        content_type = self.headers.get('Content-Type', '')
+        try:
+            if content_type.startswith('multipart/form-data'):
+                fields, content = parse_multipart(body, content_type)
+                fields = loads(fields['json_data'])
+            else:
+                fields = loads(body)
+        except (KeyError, ValueError):
+            raise HttpError(400, "Invalid request body.")
+        if resource == 'dataset_file':
+            record = self.create_datafile(fields, content)
+        elif resource == 'dataset':
+            record = self.create_dataset(fields)
+        else:
+            fields.setdefault('parameter_sets', [])
+            record = self.data.add(resource, fields)
+        location = "http://%s:%s%s" % (self.server.server_address[0],
+                                       self.server.server_address[1],
+                                       record['resource_uri'])
+        self.send_json(201, record, headers=dict(Location=location))
+
+    def create_dataset(self, fields):
+        """
+        Create a dataset record, expanding its instrument URI.
+        """
+        instrument = fields.get('instrument')
+        if instrument and not isinstance(instrument, dict):
+            instrument = self.get_record('instrument',
+                                         id_from_uri(instrument))
+        experiments = fields.get('experiments', [])
+        return self.data.add_dataset(
+            [dict(resource_uri=uri) for uri in experiments],
+            description=fields.get('description', ""),
+            instrument=instrument)
+
+    def create_datafile(self, fields, content):
+        """
+        Create a datafile record (with its replicas), storing the uploaded
+        content, if any.
+        """
+        dataset = self.get_record('dataset', id_from_uri(fields['dataset']))
+        if content is not None and not fields.get('size'):
+            fields['size'] = len(content)
+        with self.data.lock:
+            datafile = self.data.add_datafile(
+                dataset, fields['filename'], int(fields.get('size') or 0),
+                directory=fields.get('directory') or "",
+                md5sum=fields.get('md5sum') or
+                (None if content is not None else ""),
+                content=content)
+            datafile['mimetype'] = fields.get('mimetype')
+            if fields.get('created_time'):
+                datafile['created_time'] = fields['created_time']
+            for replica in fields.get('replicas', []):
+                self.data.add_replica(
+                    datafile, replica.get('location'),
+                    uri=replica.get('url') or replica.get('uri'),
+                    verified=replica.get('verified', False))
+        return datafile
+
+    def patch(self, route, _, body):
+        """
+        Update a record's fields.
+        """
+        if not route['id'] or route['action']:
+            raise HttpError(405, "Method not allowed.")
+        record = self.get_record(route['resource'], route['id'])
+        try:
+            fields = loads(body)
+        except ValueError:
+            raise HttpError(400, "Invalid request body.")
+        self.data.update(route['resource'], record, fields)
+        self.send_json(202, record)
+
+    def download(self, datafile):
+        """
+        Send a datafile's contents, or the byte range requested by a Range
+        header.
+        """
+        content = self.data.content(datafile['id'])
+        size = len(content)
+        start, end = 0, size - 1
+        status = 200
+        range_header = self.headers.get('Range')
+        if range_header:
+            match = RANGE_REGEX.match(range_header.strip())
+            if not match or not (match.group(1) or match.group(2)):
+                raise HttpError(416, "Invalid range: %s" % range_header)
+            if match.group(1):
+                start = int(match.group(1))
+                if match.group(2):
+                    end = min(int(match.group(2)), size - 1)
+            else:
+                start = max(size - int(match.group(2)), 0)
+            if start >= size or start > end:
+                self.send_response(416)
+                self.send_header("Content-Range", "bytes */%s" % size)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            status = 206
+        self.send_response(status)
+        self.send_header("Content-Type",
+                         datafile.get('mimetype') or
+                         "application/octet-stream")
+        self.send_header("Content-Disposition",
+                         'attachment; filename="%s"' % datafile['filename'])
+        self.send_header("Content-Length", str(end - start + 1))
+        self.send_header("Accept-Ranges", "bytes")
+        if status == 206:
+            self.send_header("Content-Range",
+                             "bytes %s-%s/%s" % (start, end, size))
+        self.end_headers()
+        self.write_content(content, start, end + 1)
+
+    def write_content(self, content, start, end):
+        """
+        Write content[start:end] to the socket, one chunk at a time, or
+        reset the connection part of the way through, if that fault is
+        being injected.
+        """
+        reset_at = None
+        if self.faults and self.faults.reset_after is not None:
+            reset_at = start + int((end - start) * self.faults.reset_after)
+        for offset in range(start, end, DOWNLOAD_CHUNK_SIZE):
+            chunk_end = min(offset + DOWNLOAD_CHUNK_SIZE, end)
+            if reset_at is not None and chunk_end > reset_at:
+                self.write_body(content[offset:reset_at])
+                self.reset_connection()
+                return
+            self.write_body(content[offset:chunk_end])
+
+    def verify(self, datafile):
+        """
+        Mark a datafile's replicas as verified.
+        """
+        with self.data.lock:
+            for replica in datafile['replicas']:
+                replica['verified'] = True
+                replica['last_verified_time'] = SyntheticData.timestamp()
+        self.send_json(200, dict(success=True))
+
+
+def parse_multipart(body, content_type):
+    """
+    Parse a multipart/form-data request body.
+
+    :return: A dictionary of the (non-file) fields' values, and the
+        contents of the attached file (or None).
+    """
+    boundary = re.search(r'boundary="?([^";]+)"?', content_type).group(1)
+    fields = {}
+    content = None
+    for part in body.split(b"--" + boundary.encode('ascii')):
+        if b"\r\n\r\n" not in part:
+            continue
+        part_headers, part_body = part.split(b"\r\n\r\n", 1)
+        if part_body.endswith(b"\r\n"):
+            part_body = part_body[:-2]
+        part_headers = part_headers.decode('utf-8')
+        name = re.search(r'name="([^"]*)"', part_headers).group(1)
+        if 'filename=' in part_headers:
+            content = part_body
+        else:
+            fields[name] = part_body.decode('utf-8')
+    return fields, content
+
+
+class FakeMyTardis(object):
+    """
+    Runs a :class:`FakeMyTardisServer` on a free local port in a
+    background thread.
+
+    :param data: The :class:`mtclient.testing.data.SyntheticData` to serve
+        (default: an empty store).
+    :param username: The username expected in the Authorization header.
+    :param api_key: If supplied, requests without an Authorization header
+        matching username and api_key are rejected with HTTP 401.
+    :param host: The address to listen on.
+    :param port: The port to listen on (default: any free port).
+    :param faults: An optional
+        :class:`mtclient.testing.faults.FaultInjector`, which can also be
+        set (or cleared) while the server is running.
+    """
+    # pylint: disable=too-many-arguments
+    def __init__(self, data=None, username=None, api_key=None,
+                 host="127.0.0.1", port=0, faults=None):
+        self.data = data if data is not None else SyntheticData()
+        self.httpd = FakeMyTardisServer(
+            (host, port), self.data, username=username, api_key=api_key,
+            faults=faults)
+        self._thread = None
+        self._process = None
+
+    @property
+    def faults(self):
+        """
+        The :class:`mtclient.testing.faults.FaultInjector` (or None).
+        """
+        return self.httpd.faults
+
+    @faults.setter
+    def faults(self, faults):
+        self.httpd.faults = faults
+
+    @property
+    def url(self):
+        """
+        The server's base URL, e.g. "http://127.0.0.1:54321", for use as
+        config.url.
+        """
+        host, port = self.httpd.server_address[:2]
+        return "http://%s:%s" % (host, port)
+
+    @property
+    def request_count(self):
+        """
+        The number of requests handled.
+        """
+        return self.httpd.request_count
+
+    @property
+    def connection_count(self):
+        """
+        The number of connections accepted.
+        """
+        return self.httpd.connection_count
+
+    def start(self, process=False):
+        """
+        Start serving requests in a background thread.
+
+        :param process: Serve requests from a forked child process
+            instead, e.g. so that the server's allocations aren't included
+            in memory measurements (see :mod:`mtclient.testing.memory`).
+            The child process has its own copy of the data, so records
+            created by requests aren't visible to the parent process, and
+            the request and connection counts aren't updated.  Requires a
+            platform which supports fork.
+        """
+        if process:
+            import multiprocessing
+            self._process = multiprocessing.get_context('fork').Process(
+                target=self.httpd.serve_forever,
+                kwargs=dict(poll_interval=0.05))
+            self._process.daemon = True
+            self._process.start()
+            return self
+        self._thread = threading.Thread(target=self.httpd.serve_forever,
+                                        kwargs=dict(poll_interval=0.05))
+        self._thread.daemon = True
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """
+        Stop serving requests and close the listening socket.
+        """
+        if self._thread is not None:
+            self.httpd.shutdown()
+            self._thread.join()
+            self._thread = None
+        if self._process is not None:
+            self._process.terminate()
+            self._process.join()
+            self._process = None
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
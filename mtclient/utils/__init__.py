@@ -16,6 +16,19 @@ def human_readable_size_string(num):
     return "%3.0f %s" % (num, 'TB')
 
 
+def parse_size_string(size_string):
+    """
+    Returns the number of bytes represented by a size string
+    like '512K', '10M' or '1G' (powers of 1024).  A size string
+    without a suffix is interpreted as a number of bytes.
+    """
+    multipliers = dict(K=1024, M=1024 ** 2, G=1024 ** 3, T=1024 ** 4)
+    size_string = size_string.strip().upper()
+    if size_string and size_string[-1] in multipliers:
+        return int(float(size_string[:-1]) * multipliers[size_string[-1]])
+    return int(size_string)
+
+
 def extend_url(url, limit=None, offset=None, order_by=None):
     """
     Add the limit, offset and order_by to the API request URL
@@ -43,9 +56,12 @@ def add_filters(url, filters):
 
 def get_render_format(args):
     """
-    Determine how to render the output (ASCII table or JSON)
-    depending on whether --json was supplied as a command-line arg
+    Determine how to render the output (ASCII table, JSON, or for list
+    commands, NDJSON or CSV) depending on whether --json or --format was
+    supplied as a command-line arg
     """
+    if getattr(args, 'format', None):
+        return args.format
     if hasattr(args, 'json') and args.json:
         return 'json'
     return 'table'
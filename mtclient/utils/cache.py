@@ -0,0 +1,61 @@
+"""
+In-memory cache of JSON responses for metadata which rarely changes.
+
+Schemas and parameter names are looked up repeatedly, e.g. once for each
+parameter of each parameter set when displaying a dataset's metadata.
+A long-running process (e.g. ``mytardis batch``) can enable the cache
+so that each schema and parameter name is only retrieved once.  The
+cache is disabled by default, so that a single CLI invocation always
+sees the current metadata.
+
+Responses are cached as their JSON bodies, and decoded (with the fastest
+available codec, see :mod:`mtclient.utils.jsoncodec`) each time they are
+retrieved, which is faster than deep-copying the decoded dictionaries.
+"""
+import threading
+
+from .jsoncodec import loads
+from .session import get_session
+
+
+class MetadataCache(object):
+    """
+    Thread-safe cache of JSON responses, keyed by URL.
+    """
+    def __init__(self):
+        #: Whether responses are cached.
+        self.enabled = False
+        self._responses = {}
+        self._lock = threading.Lock()
+
+    def get_json(self, url, headers):
+        """
+        Retrieve a JSON response, from the cache if possible.
+
+        A copy of the cached response is returned, so callers are free
+        to modify it.
+
+        :raises requests.exceptions.HTTPError:
+        """
+        if self.enabled:
+            with self._lock:
+                content = self._responses.get(url)
+            if content is not None:
+                return loads(content)
+        response = get_session().get(url=url, headers=headers)
+        response.raise_for_status()
+        response_json = loads(response.content)
+        if self.enabled:
+            with self._lock:
+                self._responses[url] = response.content
+        return response_json
+
+    def clear(self):
+        """
+        Discard all cached responses.
+        """
+        with self._lock:
+            self._responses.clear()
+
+
+metadata_cache = MetadataCache()  # pylint: disable=invalid-name
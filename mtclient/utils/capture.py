@@ -0,0 +1,118 @@
+"""
+Capturing the output of commands run within a long-running process.
+
+Controllers print their results to sys.stdout.  When commands are run
+one after another (or concurrently, on different threads) within a single
+process, :func:`captured_output` collects each command's output
+separately, by temporarily replacing sys.stdout and sys.stderr with
+proxies which write to a per-thread buffer while a capture is active on
+that thread, and to the original stream otherwise.
+"""
+import sys
+import threading
+from contextlib import contextmanager
+
+from six import StringIO
+
+
+class ThreadLocalStream(object):
+    """
+    File-like proxy which writes to a per-thread stream if one has been
+    set for the current thread, or to the default stream otherwise.
+    """
+    def __init__(self, default):
+        self.default = default
+        self._local = threading.local()
+
+    @property
+    def target(self):
+        """
+        The stream to write to from the current thread.
+        """
+        return getattr(self._local, 'stream', None) or self.default
+
+    def set_target(self, stream):
+        """
+        Set (or with None, reset) the current thread's stream.
+        """
+        self._local.stream = stream
+
+    def write(self, data):
+        """
+        Write to the current thread's stream.
+        """
+        return self.target.write(data)
+
+    def flush(self):
+        """
+        Flush the current thread's stream.
+        """
+        return self.target.flush()
+
+    def __getattr__(self, name):
+        return getattr(self.target, name)
+
+
+_lock = threading.Lock()  # pylint: disable=invalid-name
+_num_captures = [0]  # pylint: disable=invalid-name
+
+
+def _install_proxies():
+    """
+    Replace sys.stdout and sys.stderr with thread-local proxies
+    if the first capture is starting.
+    """
+    with _lock:
+        if not _num_captures[0]:
+            sys.stdout = ThreadLocalStream(sys.stdout)
+            sys.stderr = ThreadLocalStream(sys.stderr)
+        _num_captures[0] += 1
+        return sys.stdout, sys.stderr
+
+
+def _remove_proxies():
+    """
+    Restore the original sys.stdout and sys.stderr
+    if the last capture has finished.
+    """
+    with _lock:
+        _num_captures[0] -= 1
+        if not _num_captures[0]:
+            if isinstance(sys.stdout, ThreadLocalStream):
+                sys.stdout = sys.stdout.default
+            if isinstance(sys.stderr, ThreadLocalStream):
+                sys.stderr = sys.stderr.default
+
+
+@contextmanager
+def captured_output():
+    """
+    Capture anything written to sys.stdout and sys.stderr by the current
+    thread within the with block, without affecting other threads.
+
+    Usage::
+
+        with captured_output() as (stdout, stderr):
+            print("Hello")
+        assert stdout.getvalue() == "Hello\\n"
+    """
+    stdout_proxy, stderr_proxy = _install_proxies()
+    stdout, stderr = StringIO(), StringIO()
+    stdout_proxy.set_target(stdout)
+    stderr_proxy.set_target(stderr)
+    try:
+        yield stdout, stderr
+    finally:
+        stdout_proxy.set_target(None)
+        stderr_proxy.set_target(None)
+        _remove_proxies()
+
+
+def original_stdout():
+    """
+    Return the stream which sys.stdout refers to outside of any capture.
+    """
+    stream = sys.stdout
+    while isinstance(stream, ThreadLocalStream):
+        stream = stream.default
+    return stream
@@ -4,9 +4,31 @@ Ask a yes/no question via six.moves.input() and return the answer.
 https://github.com/ActiveState/code/blob/master/recipes/Python/577058_query_yesno/recipe-577058.py
 """
 import sys
+import threading
+from contextlib import contextmanager
 
 from six.moves import input
 
+from .exceptions import ConfirmationRequired
+
+_local = threading.local()  # pylint: disable=invalid-name
+
+
+@contextmanager
+def non_interactive():
+    """
+    Answer any questions asked by the current thread within the with
+    block without reading from stdin, e.g. when stdin is a batch of
+    commands.  Questions with a default answer get the default answer,
+    and other questions raise ConfirmationRequired.
+    """
+    saved_non_interactive = getattr(_local, 'non_interactive', False)
+    _local.non_interactive = True
+    try:
+        yield
+    finally:
+        _local.non_interactive = saved_non_interactive
+
 
 def query_yes_no(question, default=None):
     """Ask a yes/no question via input() and return their answer.
@@ -29,6 +51,12 @@ def query_yes_no(question, default=None):
     else:
         raise ValueError("invalid default answer: '%s'" % default)
 
+    if getattr(_local, 'non_interactive', False):
+        if default is None:
+            raise ConfirmationRequired(
+                "Can't answer %r when running non-interactively." % question)
+        return valid[default]
+
     while True:
         sys.stdout.write(question + prompt)
         choice = input().lower()
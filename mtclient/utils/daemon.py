@@ -0,0 +1,134 @@
+"""
+Forwarding commands to a 'mytardis serve' daemon over a Unix socket.
+
+The daemon keeps a pooled HTTP session and cached metadata (schemas and
+parameter names) warm between commands.  The protocol is one JSON request
+line from the client, containing the command's argument list and the
+identity of its config (see :func:`config_identity`), followed by one JSON
+result line from the daemon (see :func:`mtclient.controllers.batch.execute`).
+The daemon refuses to run commands for a client whose config differs from
+its own, and the client then runs the command locally.
+
+This module is imported by :mod:`mtclient.client` before the argument
+parser, so it must not import anything expensive.
+"""
+import hashlib
+import os
+import socket
+
+from .jsoncodec import dumps, loads
+
+#: The subcommands which are forwarded to a daemon if one is running.
+FORWARDED_COMMANDS = ('list', 'get')
+
+#: Options whose output is streamed as it is retrieved, which would be
+#: buffered until the command finished if it was run by the daemon.
+STREAMING_OPTIONS = ('--all', '--format')
+
+#: How long to wait (in seconds) to connect to the daemon before falling
+#: back to running the command locally.
+CONNECT_TIMEOUT = 1.0
+
+#: How long to wait (in seconds) for the daemon's result before falling
+#: back to running the command locally, e.g. if the daemon has hung.
+RESULT_TIMEOUT = 30.0
+
+#: The status of a result from a daemon which refused to run a command,
+#: which should be run locally instead.
+REFUSED = 'refused'
+
+
+def should_forward(argv, socket_path):
+    """
+    Determine whether a command line (excluding the program name) should
+    be forwarded to a daemon listening on socket_path.
+    """
+    return (hasattr(socket, 'AF_UNIX') and len(argv) >= 2 and
+            argv[0] not in ('batch', 'config', 'serve', 'version') and
+            argv[1] in FORWARDED_COMMANDS and
+            not any(is_streaming_option(arg) for arg in argv[2:]) and
+            os.path.exists(socket_path))
+
+
+def is_streaming_option(arg):
+    """
+    Determine whether a command-line argument is one of the
+    STREAMING_OPTIONS (or an abbreviation of one, which argparse accepts).
+    """
+    option = arg.split('=', 1)[0]
+    return len(option) > 2 and option.startswith('--') and \
+        any(streaming_option.startswith(option)
+            for streaming_option in STREAMING_OPTIONS)
+
+
+def config_identity(config):
+    """
+    Return a dictionary identifying the MyTardis server and credentials
+    a config (including any environment variable overrides) uses, so that
+    a daemon only runs commands for clients with the same config.  The API
+    key is hashed, so that it isn't sent over the socket.
+
+    :param config: A :class:`mtclient.models.config.Config`.
+    """
+    return dict(
+        path=config.path, url=config.url, username=config.username,
+        apikey=hashlib.sha256(config.apikey.encode('utf-8')).hexdigest(),
+        keep_response_dicts=config.keep_response_dicts)
+
+
+def send_request(sock, request):
+    """
+    Send a JSON request (or result) line.
+    """
+    sock.sendall((dumps(request) + "\n").encode('utf-8'))
+
+
+def receive_request(sock_file):
+    """
+    Receive a JSON request (or result) line, or None if the connection
+    was closed.
+    """
+    line = sock_file.readline()
+    if not line:
+        return None
+    return loads(line)
+
+
+def forward_command(argv, socket_path, identity,
+                    result_timeout=RESULT_TIMEOUT):
+    """
+    Run a command in the daemon listening on socket_path.
+
+    :param argv: The command's arguments, e.g. ['dataset', 'get', '35'].
+    :param socket_path: The daemon's socket.
+    :param identity: The client's :func:`config_identity`.
+    :param result_timeout: How long to wait (in seconds) for the result.
+
+    :return: The command's result dictionary, or None if the daemon
+        couldn't be reached (e.g. because it has stopped, leaving a stale
+        socket behind), didn't respond in time, or refused to run the
+        command because its config differs, in which case the command
+        should be run locally.
+    """
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.settimeout(CONNECT_TIMEOUT)
+        try:
+            sock.connect(socket_path)
+        except (IOError, OSError):
+            return None
+        sock.settimeout(result_timeout)
+        sock_file = sock.makefile('rb')
+        try:
+            send_request(sock, dict(argv=argv, config=identity))
+            result = receive_request(sock_file)
+        except (IOError, OSError):
+            # Including socket.timeout
+            return None
+        finally:
+            sock_file.close()
+    finally:
+        sock.close()
+    if result is None or result.get('status') == REFUSED:
+        return None
+    return result
@@ -28,3 +28,10 @@ class MissingConfig(Exception):
     """
     Missing config.
     """
+
+
+class ConfirmationRequired(Exception):
+    """
+    A question needs to be confirmed, but the command is being run
+    non-interactively.
+    """
@@ -0,0 +1,244 @@
+"""
+Checksum calculation for large files.
+
+By default, blocks are read into reusable buffers by a reader thread while
+the previous block is being hashed, so disk reads and hashing overlap.
+(hashlib releases the GIL while hashing large blocks.)  Hashing then runs
+at the speed of the disk or the CPU, whichever is slower, rather than at
+the sum of both.  Files spanning only a few blocks are read sequentially
+into a single buffer no larger than the file, because starting a reader
+thread and allocating its buffers would take longer than reading them.
+"""
+import hashlib
+import mmap
+import os
+import threading
+
+from six.moves import queue
+
+from .pagecache import PageCacheDropper
+
+DEFAULT_BLOCKSIZE = 1048576
+DEFAULT_NUM_BUFFERS = 3
+
+#: Files no larger than this many blocks are read sequentially, even when
+#: pipelined reading is requested.
+MIN_PIPELINED_BLOCKS = 4
+
+
+def read_blocks(file_path, blocksize=DEFAULT_BLOCKSIZE, pipelined=True,
+                use_mmap=False, drop_cache=False):
+    """
+    Yield the contents of a file as a sequence of memoryview blocks.
+
+    Each block is only valid until the next block is requested, because
+    the underlying buffers are reused.
+
+    :param file_path: The path of the file to read.
+    :param blocksize: The number of bytes to read at a time.
+    :param pipelined: Read the next block on a reader thread while the
+        current block is being processed (for files larger than
+        MIN_PIPELINED_BLOCKS blocks).
+    :param use_mmap: Memory-map the file instead of reading it into
+        buffers.
+    :param drop_cache: Drop the file's pages from the page cache as it
+        is read (see :mod:`mtclient.utils.pagecache`).  This is ignored
+        when use_mmap is True.
+    """
+    with open(file_path, 'rb', buffering=0) as fileobj:
+        if use_mmap:
+            blocks = _mmap_blocks(fileobj, blocksize)
+        else:
+            dropper = \
+                PageCacheDropper(fileobj.fileno()) if drop_cache else None
+            file_size = os.fstat(fileobj.fileno()).st_size
+            if file_size < blocksize:
+                # Don't allocate a buffer larger than the file:
+                blocksize = max(file_size, 1)
+            if pipelined and file_size > MIN_PIPELINED_BLOCKS * blocksize:
+                blocks = _pipelined_blocks(fileobj, blocksize, dropper)
+            else:
+                blocks = _sequential_blocks(fileobj, blocksize, dropper)
+        try:
+            for block in blocks:
+                yield block
+        finally:
+            # Release the buffers (or mapping) before the file is closed,
+            # even if the caller stops reading early:
+            blocks.close()
+
+
+def _sequential_blocks(fileobj, blocksize, dropper=None):
+    """
+    Read blocks into a single reusable buffer.
+    """
+    buf = bytearray(blocksize)
+    view = memoryview(buf)
+    offset = 0
+    num_bytes = fileobj.readinto(buf)
+    while num_bytes:
+        offset += num_bytes
+        if dropper:
+            dropper.advance(offset)
+        yield view[:num_bytes]
+        num_bytes = fileobj.readinto(buf)
+    if dropper:
+        dropper.finish(offset)
+
+
+def _pipelined_blocks(fileobj, blocksize, dropper=None,
+                      num_buffers=DEFAULT_NUM_BUFFERS):
+    """
+    Read blocks on a reader thread, into a small pool of reusable buffers.
+    """
+    free_buffers = queue.Queue()
+    full_buffers = queue.Queue()
+    for _ in range(num_buffers):
+        free_buffers.put(bytearray(blocksize))
+
+    def reader():
+        """
+        Fill free buffers until the end of the file is reached,
+        or until there are no more free buffers (None).
+        """
+        offset = 0
+        try:
+            while True:
+                buf = free_buffers.get()
+                if buf is None:
+                    return
+                num_bytes = fileobj.readinto(buf)
+                offset += num_bytes
+                if dropper:
+                    # The block has been copied into buf, so its pages
+                    # can be dropped before it is hashed:
+                    if num_bytes:
+                        dropper.advance(offset)
+                    else:
+                        dropper.finish(offset)
+                full_buffers.put((buf, num_bytes))
+                if not num_bytes:
+                    return
+        except Exception as err:  # pylint: disable=broad-except
+            full_buffers.put((err, None))
+
+    reader_thread = threading.Thread(target=reader)
+    reader_thread.daemon = True
+    reader_thread.start()
+    try:
+        while True:
+            buf, num_bytes = full_buffers.get()
+            if isinstance(buf, Exception):
+                raise buf
+            if not num_bytes:
+                return
+            yield memoryview(buf)[:num_bytes]
+            free_buffers.put(buf)
+    finally:
+        # Stop the reader, in case we finished early:
+        free_buffers.put(None)
+        reader_thread.join()
+
+
+def _mmap_blocks(fileobj, blocksize):
+    """
+    Yield blocks from a memory-mapped file, without copying them.
+    """
+    try:
+        mapped = mmap.mmap(fileobj.fileno(), 0, access=mmap.ACCESS_READ)
+    except ValueError:
+        # Empty files can't be memory-mapped
+        return
+    try:
+        if hasattr(mapped, 'madvise'):
+            mapped.madvise(mmap.MADV_SEQUENTIAL)
+        view = memoryview(mapped)
+        try:
+            for offset in range(0, len(mapped), blocksize):
+                block = view[offset:offset + blocksize]
+                try:
+                    yield block
+                finally:
+                    block.release()
+        finally:
+            view.release()
+    finally:
+        mapped.close()
+
+
+def new_hasher(algorithm):
+    """
+    Return a new hash object for algorithm, which can be any algorithm
+    supported by hashlib (e.g. 'md5', 'sha1', 'sha512' or 'blake2b'), or
+    an xxHash algorithm (e.g. 'xxh64' or 'xxh3_128') if the optional
+    xxhash package is installed.  Variable-length digests (e.g.
+    'shake_128') aren't supported, because hexdigest() requires a length.
+    """
+    if algorithm in hashlib.algorithms_available:
+        hasher = hashlib.new(algorithm)
+        if not hasher.digest_size:
+            raise ValueError("Variable-length hash algorithms are not "
+                             "supported: %s" % algorithm)
+        return hasher
+    if algorithm.startswith('xxh'):
+        try:
+            import xxhash  # pylint: disable=import-error
+        except ImportError:
+            raise ValueError("The xxhash package is required for the %s "
+                             "algorithm." % algorithm)
+        if hasattr(xxhash, algorithm):
+            return getattr(xxhash, algorithm)()
+    raise ValueError("Unsupported hash algorithm: %s" % algorithm)
+
+
+def digest_file(file_path, algorithms=('md5',), blocksize=DEFAULT_BLOCKSIZE,
+                pipelined=True, use_mmap=False, drop_cache=False):
+    """
+    Calculate one or more checksums of a file in a single read pass,
+    without reading the whole file into memory.
+
+    :param file_path: The path of the file to hash.
+    :param algorithms: The names of the algorithms to use
+        (see :func:`new_hasher`).
+    :param blocksize: The number of bytes to read at a time.
+    :param pipelined: Overlap reading and hashing on separate threads.
+    :param use_mmap: Memory-map the file instead of reading it into
+        buffers.
+    :param drop_cache: Drop the file's pages from the page cache as it
+        is read.
+
+    :return: A dictionary mapping each algorithm to the file's checksum
+        as a hexadecimal string.
+    """
+    # pylint: disable=too-many-arguments
+    hashers = dict((algorithm, new_hasher(algorithm))
+                   for algorithm in algorithms)
+    for block in read_blocks(file_path, blocksize, pipelined=pipelined,
+                             use_mmap=use_mmap, drop_cache=drop_cache):
+        for hasher in hashers.values():
+            hasher.update(block)
+    return dict((algorithm, hasher.hexdigest())
+                for algorithm, hasher in hashers.items())
+
+
+def hash_file(file_path, algorithm='md5', blocksize=DEFAULT_BLOCKSIZE,
+              pipelined=True, use_mmap=False, drop_cache=False):
+    """
+    Calculate a file's checksum without reading the whole file into memory.
+
+    :param file_path: The path of the file to hash.
+    :param algorithm: The name of the algorithm to use, e.g. 'md5'
+        (see :func:`new_hasher`).
+    :param blocksize: The number of bytes to read at a time.
+    :param pipelined: Overlap reading and hashing on separate threads.
+    :param use_mmap: Memory-map the file instead of reading it into
+        buffers.
+    :param drop_cache: Drop the file's pages from the page cache as it
+        is read.
+
+    :return: The checksum as a hexadecimal string.
+    """
+    # pylint: disable=too-many-arguments
+    return digest_file(file_path, [algorithm], blocksize,
+                       pipelined=pipelined, use_mmap=use_mmap,
+                       drop_cache=drop_cache)[algorithm]
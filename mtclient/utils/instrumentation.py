@@ -0,0 +1,217 @@
+"""
+Instrumentation of the HTTP requests made to the MyTardis API.
+
+Every request is sent through the shared :class:`InstrumentedSession`
+(see :mod:`mtclient.utils.session`), which records each request's method,
+endpoint, status code, latency, request and response sizes and retries in
+the :data:`request_stats` collector while it is enabled, e.g.
+
+    from mtclient.utils.instrumentation import request_stats
+
+    request_stats.enabled = True
+    dataset = Dataset.objects.get(id=35)
+    for endpoint in request_stats.summary():
+        print(endpoint['endpoint'], endpoint['count'], endpoint['p95'])
+
+Endpoints are identified by their URL path with IDs replaced by "{id}",
+so an N+1 pattern (e.g. one ParameterName request per parameter) shows
+up as a high count for one endpoint.  'mytardis --stats ...' displays the
+summary after running a command.
+"""
+import math
+import re
+import threading
+import time
+from collections import namedtuple
+
+import six
+from six.moves.urllib.parse import urlparse  # pylint: disable=import-error
+
+import requests
+
+from .tracing import span, tracing_enabled
+
+ID_REGEX = re.compile(r"/\d+(?=/|$)")
+
+#: The details of a single request.
+RequestRecord = namedtuple(
+    'RequestRecord', ['method', 'endpoint', 'status', 'latency',
+                      'request_bytes', 'response_bytes', 'retries'])
+
+
+def endpoint_template(url):
+    """
+    Return the path of url with any numeric IDs replaced by "{id}", e.g.
+    "/api/v1/dataset_file/{id}/" for
+    "https://mytardis.example.com/api/v1/dataset_file/123/?format=json"
+    """
+    return ID_REGEX.sub("/{id}", urlparse(url).path)
+
+
+def percentile(values, percent):
+    """
+    Return the nearest-rank percentile of a sorted list of values.
+    """
+    if not values:
+        return None
+    rank = int(math.ceil(percent / 100.0 * len(values))) - 1
+    return values[min(max(rank, 0), len(values) - 1)]
+
+
+def body_size(body, headers):
+    """
+    Return the size in bytes of a request or response body, using its
+    Content-Length header if the body is a stream (or hasn't been read).
+    """
+    if isinstance(body, (bytes, bytearray)):
+        return len(body)
+    if isinstance(body, six.text_type):
+        return len(body.encode('utf-8'))
+    return int(headers.get('Content-Length', 0))
+
+
+class RequestStats(object):
+    """
+    Thread-safe collector of request records.
+    """
+    def __init__(self):
+        #: Whether requests are recorded.
+        self.enabled = False
+        self._records = []
+        self._lock = threading.Lock()
+
+    def record(self, record):
+        """
+        Add a :class:`RequestRecord`, if recording is enabled.
+        """
+        if self.enabled:
+            with self._lock:
+                self._records.append(record)
+
+    @property
+    def records(self):
+        """
+        A list of the :class:`RequestRecord` objects recorded so far.
+        """
+        with self._lock:
+            return list(self._records)
+
+    def clear(self):
+        """
+        Discard all records.
+        """
+        with self._lock:
+            del self._records[:]
+
+    def summary(self):
+        """
+        Summarize the records for each method and endpoint.
+
+        :return: A list of dictionaries (sorted by the total time spent on
+            each endpoint, descending) with method, endpoint, count,
+            errors (status >= 400 or no response), retries, total_time,
+            p50, p95 and p99 (latencies in seconds), request_bytes and
+            response_bytes.
+        """
+        groups = {}
+        for record in self.records:
+            groups.setdefault((record.method, record.endpoint),
+                              []).append(record)
+        summary = []
+        for (method, endpoint), records in groups.items():
+            latencies = sorted(record.latency for record in records)
+            summary.append(dict(
+                method=method, endpoint=endpoint, count=len(records),
+                errors=sum(1 for record in records
+                           if record.status is None or record.status >= 400),
+                retries=sum(record.retries for record in records),
+                total_time=sum(latencies),
+                p50=percentile(latencies, 50),
+                p95=percentile(latencies, 95),
+                p99=percentile(latencies, 99),
+                request_bytes=sum(record.request_bytes
+                                  for record in records),
+                response_bytes=sum(record.response_bytes
+                                   for record in records)))
+        summary.sort(key=lambda endpoint: endpoint['total_time'],
+                     reverse=True)
+        return summary
+
+    def render(self):
+        """
+        Return an ASCII table of the summary, with a line of totals.
+        """
+        from texttable import Texttable
+
+        summary = self.summary()
+        table = Texttable(max_width=0)
+        table.set_cols_align(['l', 'l', 'r', 'r', 'r', 'r', 'r', 'r', 'r',
+                              'r', 'r'])
+        table.set_cols_dtype(['t', 't', 'i', 'i', 'i', 't', 't', 't', 't',
+                              'i', 'i'])
+        table.header(["Method", "Endpoint", "Count", "Errors", "Retries",
+                      "Total (s)", "p50 (ms)", "p95 (ms)", "p99 (ms)",
+                      "Sent (bytes)", "Received (bytes)"])
+        for endpoint in summary:
+            table.add_row([
+                endpoint['method'], endpoint['endpoint'], endpoint['count'],
+                endpoint['errors'], endpoint['retries'],
+                "%.3f" % endpoint['total_time'],
+                "%.1f" % (endpoint['p50'] * 1000),
+                "%.1f" % (endpoint['p95'] * 1000),
+                "%.1f" % (endpoint['p99'] * 1000),
+                endpoint['request_bytes'], endpoint['response_bytes']])
+        return "%s\n%s requests, %.3f s\n" % (
+            table.draw() if summary else "No requests.",
+            sum(endpoint['count'] for endpoint in summary),
+            sum(endpoint['total_time'] for endpoint in summary))
+
+
+request_stats = RequestStats()  # pylint: disable=invalid-name
+
+
+class InstrumentedSession(requests.Session):
+    """
+    A :class:`requests.Session` which records each request it sends in
+    :data:`request_stats`.
+    """
+    def send(self, request, **kwargs):
+        """
+        Send a prepared request, recording its latency (including reading
+        the response body, unless the response is streamed), status and
+        sizes, and running it as a tracing span.
+        """
+        if not request_stats.enabled and not tracing_enabled():
+            return super(InstrumentedSession, self).send(request, **kwargs)
+        endpoint = endpoint_template(request.url)
+        start = time.time()
+        response = None
+        try:
+            with span("%s %s" % (request.method, endpoint),
+                      **{'http.method': request.method,
+                         'http.route': endpoint}) as request_span:
+                response = super(InstrumentedSession, self).send(
+                    request, **kwargs)
+                if request_span is not None:
+                    request_span.set_attribute('http.status_code',
+                                               response.status_code)
+                return response
+        finally:
+            status = response_bytes = retries = None
+            if response is not None:
+                status = response.status_code
+                # pylint: disable=protected-access
+                content = response._content \
+                    if response._content_consumed else None
+                response_bytes = body_size(content, response.headers)
+                retry = getattr(response.raw, 'retries', None)
+                retries = len(retry.history) \
+                    if getattr(retry, 'history', None) else 0
+            request_stats.record(RequestRecord(
+                method=request.method,
+                endpoint=endpoint,
+                status=status,
+                latency=time.time() - start,
+                request_bytes=body_size(request.body, request.headers),
+                response_bytes=response_bytes or 0,
+                retries=retries or 0))
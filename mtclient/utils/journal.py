@@ -0,0 +1,138 @@
+"""
+Ingestion journal for creating DataFile records for a directory of files.
+
+The journal is an SQLite database recording the state of each file
+(scanned, hashed or created), so that an interrupted ingestion can be
+resumed without re-calculating checksums or re-querying MyTardis for
+files whose records have already been created.  It also records any
+checksums calculated in addition to the MD5 sum, e.g. SHA-512 digests
+for long-term fixity checking.
+"""
+import json
+import os
+import sqlite3
+import threading
+from collections import namedtuple
+
+SCANNED = 'scanned'
+HASHED = 'hashed'
+CREATED = 'created'
+
+#: A file's entry in the journal.  digests is a dictionary mapping
+#: algorithm names to checksums (or None).
+JournalEntry = namedtuple(
+    'JournalEntry',
+    ['relpath', 'size', 'mtime', 'state', 'md5sum', 'datafile_id',
+     'digests'])
+
+
+class IngestionJournal(object):
+    """
+    Records the ingestion state of each file within a directory.
+
+    :param path: The location of the SQLite journal file.
+    :param reset: If True, discard any existing journal entries.
+    """
+    def __init__(self, path, reset=False):
+        self.path = path
+        if not os.path.exists(os.path.dirname(os.path.abspath(path))):
+            os.makedirs(os.path.dirname(os.path.abspath(path)))
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        # Write-ahead logging avoids an fsync of the whole database for
+        # each file's state change, while still surviving a crash:
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        with self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS files ("
+                "relpath TEXT PRIMARY KEY, size INTEGER, mtime REAL, "
+                "state TEXT, md5sum TEXT, datafile_id INTEGER, "
+                "digests TEXT)")
+            if reset:
+                self._connection.execute("DELETE FROM files")
+
+    def close(self):
+        """
+        Close the journal's database connection.
+        """
+        self._connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def get(self, relpath):
+        """
+        Return the :class:`JournalEntry` for relpath, or None if the file
+        hasn't been journaled yet.
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT relpath, size, mtime, state, md5sum, datafile_id, "
+                "digests FROM files WHERE relpath = ?",
+                (relpath,)).fetchone()
+        if not row:
+            return None
+        return JournalEntry(*row[:-1],
+                            digests=json.loads(row[-1]) if row[-1] else None)
+
+    def counts(self):
+        """
+        Return a dictionary of the number of files in each state.
+        """
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT state, COUNT(*) FROM files GROUP BY state").fetchall()
+        return dict(rows)
+
+    def record_scanned(self, relpath, size, mtime):
+        """
+        Record that a file has been found, discarding any previous state
+        for it (e.g. because it has been modified since it was journaled).
+        """
+        self._execute(
+            "INSERT OR REPLACE INTO files "
+            "(relpath, size, mtime, state, md5sum, datafile_id, digests) "
+            "VALUES (?, ?, ?, ?, NULL, NULL, NULL)",
+            (relpath, size, mtime, SCANNED))
+
+    def record_hashed(self, relpath, md5sum, digests=None):
+        """
+        Record a file's MD5 sum, and optionally a dictionary of other
+        checksums, mapping algorithm names to hexadecimal digests.
+        """
+        self._execute(
+            "UPDATE files SET state = ?, md5sum = ?, digests = ? "
+            "WHERE relpath = ?",
+            (HASHED, md5sum, json.dumps(digests) if digests else None,
+             relpath))
+
+    def record_digests(self, relpath, digests):
+        """
+        Record a dictionary of checksums (other than the MD5 sum) for a
+        file, without changing its state, e.g. when resuming with
+        additional algorithms.
+        """
+        self._execute(
+            "UPDATE files SET digests = ? WHERE relpath = ?",
+            (json.dumps(digests) if digests else None, relpath))
+
+    def record_created(self, relpath, datafile_id):
+        """
+        Record that a DataFile record exists for a file.  The datafile_id
+        is None if the record was found to exist already.
+        """
+        self._execute(
+            "UPDATE files SET state = ?, datafile_id = ? WHERE relpath = ?",
+            (CREATED, datafile_id, relpath))
+
+    def _execute(self, sql, parameters):
+        """
+        Execute and commit an SQL statement.
+        """
+        with self._lock:
+            with self._connection:
+                self._connection.execute(sql, parameters)
@@ -0,0 +1,126 @@
+"""
+Pluggable JSON codec.
+
+Decoding large API responses (e.g. a page of 1000 datafile records, or an
+unpaginated ``limit=0`` listing) with the standard library's json module
+can dominate the time taken by a listing.  If orjson or ujson is installed,
+it is used instead for decoding responses, for the compact encoding used
+by NDJSON output, and for serialising cached responses.  The codec can be
+chosen with the MYTARDISCLIENT_JSON_CODEC environment variable (e.g. to
+compare them), or with :func:`set_codec`.
+
+Pretty-printed JSON views are still rendered with the json module, so
+their output doesn't depend on which codec is installed.
+"""
+import json
+import os
+
+#: The supported codecs, in order of preference.
+CODECS = ('orjson', 'ujson', 'json')
+
+_codec = None  # pylint: disable=invalid-name
+
+
+class JsonCodec(object):
+    """
+    A JSON codec's loads and (compact) dumps functions.
+    """
+    # pylint: disable=too-few-public-methods
+    def __init__(self, name, loads, dumps):
+        self.name = name
+        self.loads = loads
+        self.dumps = dumps
+
+
+def load_codec(name):
+    """
+    Return the JsonCodec for name.
+
+    :raises ImportError: If the codec's package isn't installed.
+    :raises ValueError: If the codec isn't supported.
+    """
+    if name == 'orjson':
+        import orjson  # pylint: disable=import-error
+
+        def orjson_dumps(obj, sort_keys=False):
+            """
+            Encode obj as compact JSON text.
+            """
+            option = orjson.OPT_SORT_KEYS if sort_keys else 0
+            return orjson.dumps(obj, option=option).decode('utf-8')
+        return JsonCodec(name, orjson.loads, orjson_dumps)
+    if name == 'ujson':
+        import ujson  # pylint: disable=import-error
+
+        def ujson_dumps(obj, sort_keys=False):
+            """
+            Encode obj as compact JSON text.
+            """
+            return ujson.dumps(obj, sort_keys=sort_keys, ensure_ascii=False,
+                               escape_forward_slashes=False)
+        return JsonCodec(name, ujson.loads, ujson_dumps)
+    if name == 'json':
+        def json_dumps(obj, sort_keys=False):
+            """
+            Encode obj as compact JSON text.
+            """
+            return json.dumps(obj, sort_keys=sort_keys, ensure_ascii=False,
+                              separators=(',', ':'))
+        return JsonCodec(name, json.loads, json_dumps)
+    raise ValueError("Unsupported JSON codec: %s" % name)
+
+
+def set_codec(name=None):
+    """
+    Select the codec to use, or (if name is None) the codec specified by
+    the MYTARDISCLIENT_JSON_CODEC environment variable or the fastest
+    installed codec.
+
+    :return: The selected JsonCodec.
+    """
+    global _codec  # pylint: disable=global-statement,invalid-name
+    name = name or os.environ.get('MYTARDISCLIENT_JSON_CODEC')
+    if name:
+        _codec = load_codec(name)
+        return _codec
+    for codec_name in CODECS:
+        try:
+            _codec = load_codec(codec_name)
+            return _codec
+        except ImportError:
+            pass
+    return _codec
+
+
+def get_codec():
+    """
+    Return the selected JsonCodec, selecting one if necessary.
+    """
+    return _codec or set_codec()
+
+
+def loads(data):
+    """
+    Decode JSON from text or UTF-8 encoded bytes.
+
+    :raises ValueError: If data isn't valid JSON.
+    """
+    return get_codec().loads(data)
+
+
+def dumps(obj, sort_keys=False):
+    """
+    Encode obj as compact JSON text (without spaces after separators, and
+    without escaping non-ASCII characters).
+    """
+    return get_codec().dumps(obj, sort_keys=sort_keys)
+
+
+def decode_response(response):
+    """
+    Decode a JSON response body; a faster equivalent of response.json().
+
+    :param response: A :class:`requests.Response`.
+    :raises ValueError: If the response body isn't valid JSON.
+    """
+    return loads(response.content)
@@ -0,0 +1,166 @@
+"""
+Incremental parsing of large list responses.
+
+A list response from the MyTardis API is a JSON object containing a
+``meta`` object and an ``objects`` array, e.g.
+
+    {"meta": {"limit": 0, "next": null, ...}, "objects": [{...}, {...}]}
+
+With ``limit=0`` (or a large limit), the response for a large dataset can
+be hundreds of megabytes.  Rather than decoding the whole response before
+the first record can be used, :func:`iter_list_response` decodes each
+element of the ``objects`` array as soon as it has been received, so only
+one record (and one chunk of the response body) needs to be held in
+memory at a time.
+"""
+import codecs
+import json
+
+#: The number of bytes to read from the response at a time.
+CHUNK_SIZE = 64 * 1024
+
+WHITESPACE = ' \t\n\r'
+
+_decoder = json.JSONDecoder()  # pylint: disable=invalid-name
+
+
+class IncompleteJson(ValueError):
+    """
+    Raised when a list response ends before its JSON object is complete.
+    """
+
+
+def _skip_whitespace(buffer, pos):
+    """
+    Return the position of the first non-whitespace character in buffer at
+    or after pos.
+    """
+    while pos < len(buffer) and buffer[pos] in WHITESPACE:
+        pos += 1
+    return pos
+
+
+class _ChunkReader(object):
+    """
+    Decodes chunks of UTF-8 encoded bytes into a text buffer, discarding
+    the text which has already been parsed.
+    """
+    def __init__(self, chunks):
+        self.chunks = iter(chunks)
+        self.utf8_decoder = codecs.getincrementaldecoder('utf-8')()
+        self.buffer = u""
+        #: The position in the buffer of the next character to parse.
+        self.pos = 0
+        #: Whether all of the chunks have been read.
+        self.final = False
+
+    def read_more(self):
+        """
+        Read the next chunk, or raise IncompleteJson if there are none.
+        """
+        if self.final:
+            raise IncompleteJson("Incomplete JSON response")
+        self.buffer = self.buffer[self.pos:]
+        self.pos = 0
+        try:
+            self.buffer += self.utf8_decoder.decode(next(self.chunks))
+        except StopIteration:
+            self.buffer += self.utf8_decoder.decode(b"", final=True)
+            self.final = True
+
+    def next_char(self):
+        """
+        Return the next non-whitespace character (moving pos to it), or
+        None if the input has ended.
+        """
+        self.pos = _skip_whitespace(self.buffer, self.pos)
+        while self.pos == len(self.buffer):
+            if self.final:
+                return None
+            self.read_more()
+            self.pos = _skip_whitespace(self.buffer, self.pos)
+        return self.buffer[self.pos]
+
+    def decode_value(self):
+        """
+        Decode the JSON value starting at pos, reading more chunks if
+        necessary, and move pos to the end of the value.
+
+        A value is only accepted once it is followed by another
+        (non-whitespace) character, or the input has ended, because a
+        number at the end of the buffer (e.g. "12") could be the start of
+        a longer number.
+        """
+        if self.next_char() is None:
+            raise IncompleteJson("Incomplete JSON response")
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.buffer, self.pos)
+            except ValueError:
+                if self.final:
+                    raise
+                self.read_more()
+                continue
+            if not self.final and \
+                    _skip_whitespace(self.buffer, end) == len(self.buffer):
+                self.read_more()
+                continue
+            self.pos = end
+            return value
+
+
+def iter_list_response(chunks):
+    """
+    Parse a list response incrementally.
+
+    :param chunks: An iterable of bytes (e.g. ``response.iter_content()``).
+
+    :return: A generator which yields ('object', record) for each element of
+        the top-level ``objects`` array, as soon as it has been decoded, and
+        (key, value) for each other top-level key (e.g. ('meta', {...})).
+
+    :raises ValueError: If the response isn't a valid JSON object.
+    """
+    reader = _ChunkReader(chunks)
+    if reader.next_char() != '{':
+        raise ValueError("Expected a JSON object")
+    reader.pos += 1
+    while True:
+        char = reader.next_char()
+        if char is None:
+            raise IncompleteJson("Incomplete JSON response")
+        if char == '}':
+            reader.pos += 1
+            break
+        if char == ',':
+            reader.pos += 1
+            continue
+        key = reader.decode_value()
+        if reader.next_char() != ':':
+            raise ValueError("Expected ':' after %r" % key)
+        reader.pos += 1
+        if key == 'objects' and reader.next_char() == '[':
+            reader.pos += 1
+            for record in _iter_array(reader):
+                yield 'object', record
+        else:
+            yield key, reader.decode_value()
+    if reader.next_char() is not None:
+        raise ValueError("Unexpected data after the JSON object")
+
+
+def _iter_array(reader):
+    """
+    Yield each element of the array being read, up to its closing bracket.
+    """
+    while True:
+        char = reader.next_char()
+        if char is None:
+            raise IncompleteJson("Incomplete JSON response")
+        if char == ']':
+            reader.pos += 1
+            return
+        if char == ',':
+            reader.pos += 1
+            continue
+        yield reader.decode_value()
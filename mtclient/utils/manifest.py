@@ -0,0 +1,119 @@
+"""
+Checksum manifests for registering datafiles without hashing them locally.
+
+Supported formats:
+
+* ``md5sum``: The output of the md5sum command, which is also the format
+  of a BagIt manifest-md5.txt file, i.e. "<md5sum>  <path>" on each line,
+  optionally with a '*' before the path (binary mode).
+* ``csv``: A CSV file with a header row, including "path" and "md5sum"
+  columns, and optionally "size" and "mimetype" columns.
+* ``json``: JSON Lines (one JSON object per line) or a JSON array of
+  objects, with "path" and "md5sum" keys and optionally "size" and
+  "mimetype" keys.
+
+Relative paths are relative to the directory containing the manifest
+(as in a BagIt bag).  The md5sum and CSV formats and JSON Lines are read
+one line at a time, so large manifests don't need to fit in memory.
+"""
+import csv
+import io
+import itertools
+import json
+import os
+import re
+from collections import namedtuple
+
+#: A file listed in a manifest.  size and mimetype are None if the
+#: manifest doesn't specify them.
+ManifestEntry = namedtuple('ManifestEntry',
+                           ['path', 'md5sum', 'size', 'mimetype'])
+
+MANIFEST_FORMATS = ('md5sum', 'csv', 'json')
+
+MD5SUM_LINE_REGEX = re.compile(r"^\\?([0-9a-fA-F]{32})\s[ *]?(.+)$")
+
+
+def guess_manifest_format(manifest_path):
+    """
+    Guess a manifest's format from its file extension.
+    """
+    extension = os.path.splitext(manifest_path)[1].lower()
+    if extension == '.csv':
+        return 'csv'
+    if extension in ('.json', '.jsonl', '.ndjson'):
+        return 'json'
+    return 'md5sum'
+
+
+def read_manifest(manifest_path, manifest_format=None):
+    """
+    Yield a :class:`ManifestEntry` for each file listed in a manifest.
+
+    :param manifest_path: The path to the manifest.
+    :param manifest_format: 'md5sum', 'csv' or 'json'.  If not specified,
+        the format is guessed from the manifest's file extension.
+    """
+    if not manifest_format:
+        manifest_format = guess_manifest_format(manifest_path)
+    if manifest_format not in MANIFEST_FORMATS:
+        raise ValueError("Unsupported manifest format: %s" % manifest_format)
+    base_dir = os.path.dirname(os.path.abspath(manifest_path))
+    readers = dict(md5sum=_read_md5sum_manifest, csv=_read_csv_manifest,
+                   json=_read_json_manifest)
+    with io.open(manifest_path, 'r', encoding='utf-8', newline='') \
+            as manifest:
+        for path, md5sum, size, mimetype in readers[manifest_format](manifest):
+            if not path or not md5sum:
+                raise ValueError(
+                    "Manifest entries require a path and an MD5 sum: %s"
+                    % manifest_path)
+            yield ManifestEntry(
+                os.path.join(base_dir, path), md5sum.lower(),
+                int(size) if size not in (None, "") else None,
+                mimetype or None)
+
+
+def _read_md5sum_manifest(manifest):
+    """
+    Read an md5sum / BagIt manifest.
+    """
+    for line in manifest:
+        line = line.rstrip('\r\n')
+        if not line.strip():
+            continue
+        match = MD5SUM_LINE_REGEX.match(line)
+        if not match:
+            raise ValueError("Invalid md5sum manifest line: %s" % line)
+        md5sum, path = match.groups()
+        if line.startswith('\\'):
+            # md5sum escapes backslashes and newlines in file names
+            path = path.replace('\\n', '\n').replace('\\\\', '\\')
+        yield path, md5sum, None, None
+
+
+def _read_csv_manifest(manifest):
+    """
+    Read a CSV manifest.
+    """
+    for row in csv.DictReader(manifest):
+        yield (row.get('path'), row.get('md5sum'), row.get('size'),
+               row.get('mimetype'))
+
+
+def _read_json_manifest(manifest):
+    """
+    Read a JSON Lines manifest, or a manifest containing a JSON array.
+    """
+    first_line = manifest.readline()
+    while first_line and not first_line.strip():
+        first_line = manifest.readline()
+    if first_line.lstrip().startswith('['):
+        records = json.loads(first_line + manifest.read())
+    else:
+        records = (json.loads(line)
+                   for line in itertools.chain([first_line], manifest)
+                   if line.strip())
+    for record in records:
+        yield (record.get('path'), record.get('md5sum'), record.get('size'),
+               record.get('mimetype'))
@@ -0,0 +1,90 @@
+"""
+Streaming multipart/form-data request bodies for datafile uploads.
+
+Passing ``files=...`` to :func:`requests.post` encodes the whole file into
+an in-memory request body before sending it.  The :class:`MultipartEncoder`
+below is an iterable body instead, which reads the attached file one block
+at a time while the request is being sent.
+"""
+import os
+import uuid
+
+from .pagecache import PageCacheDropper
+
+
+class MultipartEncoder(object):
+    """
+    Iterable multipart/form-data request body with a single attached file.
+
+    Because the encoder defines ``__len__``, requests sends it with a
+    Content-Length header rather than using chunked transfer encoding.
+
+    :param fields: Dictionary of (non-file) form fields.
+    :param file_field: The form field name for the attached file.
+    :param file_path: The local path of the file to attach.
+    :param callback: Optional function called with each block read from
+        the file, e.g. a hasher's ``update`` method, so that a checksum can
+        be calculated on the same read pass as the upload.
+    :param blocksize: The number of bytes to read from the file at a time.
+    :param drop_cache: Drop the file's pages from the page cache as it
+        is read (see :mod:`mtclient.utils.pagecache`).
+    """
+    # pylint: disable=too-many-arguments
+    def __init__(self, fields, file_field, file_path, callback=None,
+                 blocksize=1048576, drop_cache=False):
+        self.boundary = uuid.uuid4().hex
+        self.file_path = file_path
+        self.callback = callback
+        self.blocksize = blocksize
+        self.drop_cache = drop_cache
+        self.file_size = os.path.getsize(file_path)
+
+        parts = []
+        for name, value in fields.items():
+            parts.append(
+                '--%s\r\n'
+                'Content-Disposition: form-data; name="%s"\r\n\r\n'
+                '%s\r\n' % (self.boundary, name, value))
+        parts.append(
+            '--%s\r\n'
+            'Content-Disposition: form-data; name="%s"; filename="%s"\r\n'
+            'Content-Type: application/octet-stream\r\n\r\n'
+            % (self.boundary, file_field,
+               os.path.basename(file_path).replace('"', '\\"')))
+        self._preamble = "".join(parts).encode('utf-8')
+        self._epilogue = ('\r\n--%s--\r\n' % self.boundary).encode('utf-8')
+
+    @property
+    def content_type(self):
+        """
+        The Content-Type header value, including the boundary.
+        """
+        return "multipart/form-data; boundary=%s" % self.boundary
+
+    def __len__(self):
+        """
+        The total length of the encoded request body in bytes.
+        """
+        return len(self._preamble) + self.file_size + len(self._epilogue)
+
+    def __iter__(self):
+        """
+        Yield the encoded request body, reading the file one block at a time.
+        """
+        yield self._preamble
+        with open(self.file_path, 'rb', buffering=0) as fileobj:
+            dropper = \
+                PageCacheDropper(fileobj.fileno()) if self.drop_cache else None
+            offset = 0
+            buf = fileobj.read(self.blocksize)
+            while buf:
+                offset += len(buf)
+                if dropper:
+                    dropper.advance(offset)
+                if self.callback:
+                    self.callback(buf)
+                yield buf
+                buf = fileobj.read(self.blocksize)
+            if dropper:
+                dropper.finish(offset)
+        yield self._epilogue
@@ -0,0 +1,58 @@
+"""
+Page-cache-friendly sequential reads.
+
+Reading (e.g. hashing or uploading) a very large amount of data fills the
+operating system's page cache with pages which won't be read again,
+evicting other processes' working sets.  :class:`PageCacheDropper` advises
+the kernel that a file will be read sequentially, and that the pages
+behind the read cursor are no longer needed, so they can be dropped from
+the page cache straight away.  This only has an effect on platforms which
+support :func:`os.posix_fadvise` (e.g. Linux).
+"""
+import os
+
+#: How far (in bytes) the read cursor advances between
+#: POSIX_FADV_DONTNEED calls.
+DEFAULT_DROP_INTERVAL = 8388608
+
+
+class PageCacheDropper(object):
+    """
+    Drops pages from the page cache behind the read cursor of a file
+    which is being read sequentially.
+
+    :param fileno: The file descriptor of the file being read.
+    :param interval: How far (in bytes) the read cursor needs to advance
+        before the pages behind it are dropped.
+    """
+    def __init__(self, fileno, interval=DEFAULT_DROP_INTERVAL):
+        self.fileno = fileno
+        self.interval = interval
+        self.available = hasattr(os, 'posix_fadvise')
+        self._dropped_to = 0
+        if self.available:
+            os.posix_fadvise(fileno, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+
+    def advance(self, offset):
+        """
+        Tell the dropper that the data before offset has been read.
+        """
+        if offset - self._dropped_to >= self.interval:
+            self._drop(offset)
+
+    def finish(self, offset):
+        """
+        Drop any remaining pages once the data before offset has been read.
+        """
+        if offset > self._dropped_to:
+            self._drop(offset)
+
+    def _drop(self, offset):
+        """
+        Drop the pages between the previous drop and offset.
+        """
+        if self.available:
+            os.posix_fadvise(self.fileno, self._dropped_to,
+                             offset - self._dropped_to,
+                             os.POSIX_FADV_DONTNEED)
+        self._dropped_to = offset
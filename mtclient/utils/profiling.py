@@ -0,0 +1,224 @@
+"""
+Profiling CLI commands ('mytardis --profile[=FILE] ...').
+
+By default, the command is run under cProfile, and the profile is written
+to FILE in pstats format (e.g. for 'python -m pstats FILE' or snakeviz).
+If FILE ends with '.collapsed' or '.folded', a sampling profiler is used
+instead, which samples the stacks of all threads (including upload and
+hashing worker threads, which cProfile doesn't see), and writes them in
+the collapsed stack format used by flamegraph.pl and speedscope.
+
+Either way, a report is written to stderr, with the top functions by
+cumulative time and the wall time split between network, hashing, disk
+I/O, rendering and other code.
+
+This module is imported by the argument parser, so it only imports the
+profilers when they are used.
+"""
+from __future__ import print_function
+
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+#: The file the profile is written to by '--profile' (without a FILE).
+DEFAULT_PROFILE_PATH = "mytardis.prof"
+
+#: File name extensions for which the sampling profiler is used.
+COLLAPSED_EXTENSIONS = ('.collapsed', '.folded')
+
+#: How often (in seconds) the sampling profiler samples each thread.
+SAMPLING_INTERVAL = 0.005
+
+#: Substrings of "filename:function" identifying each category of code,
+#: checked in order.  Built-in functions have the filename "~", e.g.
+#: "~:<method 'recv_into' of '_socket.socket' objects>".  Module file
+#: names start with "/", so that e.g. "/os.py" doesn't match "photos.py".
+CATEGORIES = (
+    ('hashing', ('hashlib', 'xxhash', 'mtclient/utils/hashing.py')),
+    ('network', ('requests/', 'urllib3/', 'requests_mock/', 'http/client',
+                 'httplib', '/ssl.py', '/socket.py', '_socket', '_ssl',
+                 'mtclient/utils/session.py')),
+    ('rendering', ('texttable', 'mtclient/views/', 'json/encoder',
+                   'orjson', 'ujson', '/csv.py')),
+    ('disk I/O', ("of '_io.", '<built-in method io.open', '/io.py',
+                  '<built-in method posix.', '<built-in method nt.',
+                  '/os.py', '/shutil.py', 'mmap', 'mtclient/utils/scan.py',
+                  'mtclient/utils/pagecache.py')),
+)
+
+#: The order in which the categories are reported.
+CATEGORY_NAMES = tuple(name for name, _ in CATEGORIES) + ('other',)
+
+
+def categorize(location):
+    """
+    Return the category of a "filename:function" location.
+    """
+    location = location.replace('\\', '/')
+    for name, patterns in CATEGORIES:
+        for pattern in patterns:
+            if pattern in location:
+                return name
+    return 'other'
+
+
+def frame_location(frame):
+    """
+    Return the "filename:function" location of a stack frame.
+    """
+    return "%s:%s" % (frame.f_code.co_filename, frame.f_code.co_name)
+
+
+class SamplingProfiler(object):
+    """
+    Samples the stacks of every other thread at regular intervals.
+    """
+    def __init__(self, interval=SAMPLING_INTERVAL):
+        self.interval = interval
+        #: The number of samples of each collapsed stack.
+        self.stacks = Counter()
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """
+        Start sampling in a background thread.
+        """
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._sample)
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self):
+        """
+        Stop sampling.
+        """
+        self._stopped.set()
+        self._thread.join()
+
+    def _sample(self):
+        """
+        Record a sample of each thread's stack, until stopped.
+        """
+        # pylint: disable=protected-access
+        own_thread_id = threading.current_thread().ident
+        while not self._stopped.wait(self.interval):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_thread_id:
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(frame_location(frame))
+                    frame = frame.f_back
+                self.stacks[";".join(reversed(stack))] += 1
+
+    def write(self, path):
+        """
+        Write the samples in collapsed stack format.
+        """
+        with open(path, 'w') as collapsed_file:
+            for stack, count in sorted(self.stacks.items()):
+                collapsed_file.write("%s %s\n" % (stack, count))
+
+    def category_times(self, wall_time):
+        """
+        Split wall_time between categories, in proportion to the number of
+        samples whose innermost categorized frame is in each category.
+        """
+        counts = Counter()
+        for stack, count in self.stacks.items():
+            category = 'other'
+            for location in reversed(stack.split(";")):
+                category = categorize(location)
+                if category != 'other':
+                    break
+            counts[category] += count
+        total = sum(counts.values()) or 1
+        return dict((name, wall_time * counts[name] / total)
+                    for name in CATEGORY_NAMES)
+
+    def print_top(self, stream, limit=20):
+        """
+        Print the functions present in the most samples.
+        """
+        inclusive = Counter()
+        for stack, count in self.stacks.items():
+            for location in set(stack.split(";")):
+                inclusive[location] += count
+        total = sum(self.stacks.values()) or 1
+        print("Top functions by samples (of %s):" % total, file=stream)
+        for location, count in inclusive.most_common(limit):
+            print("%6.1f%%  %s" % (100.0 * count / total, location),
+                  file=stream)
+
+
+def cprofile_category_times(stats, wall_time):
+    """
+    Split wall_time between categories, in proportion to the time spent in
+    each category's functions (excluding their callees).
+
+    :param stats: A :class:`pstats.Stats` object.
+    """
+    times = Counter()
+    # pylint: disable=no-member
+    for (filename, _, function), stat in stats.stats.items():
+        times[categorize("%s:%s" % (filename, function))] += stat[2]
+    total = sum(times.values()) or 1
+    return dict((name, wall_time * times[name] / total)
+                for name in CATEGORY_NAMES)
+
+
+def print_category_times(category_times, wall_time, stream):
+    """
+    Print the wall time split between categories.
+    """
+    print("Wall time: %.3f s" % wall_time, file=stream)
+    for name in CATEGORY_NAMES:
+        seconds = category_times[name]
+        print("  %-10s %8.3f s %5.1f%%"
+              % (name, seconds, 100.0 * seconds / (wall_time or 1)),
+              file=stream)
+
+
+@contextmanager
+def profiled(path=DEFAULT_PROFILE_PATH, stream=None):
+    """
+    Profile the code run within the context, writing the profile to path
+    and a report to stream (default: sys.stderr).
+    """
+    stream = stream or sys.stderr
+    sampling = path.endswith(COLLAPSED_EXTENSIONS)
+    if sampling:
+        profiler = SamplingProfiler()
+    else:
+        import cProfile
+        profiler = cProfile.Profile()
+    start = time.time()
+    if sampling:
+        profiler.start()
+    else:
+        profiler.enable()
+    try:
+        yield profiler
+    finally:
+        if sampling:
+            profiler.stop()
+        else:
+            profiler.disable()
+        wall_time = time.time() - start
+        print("", file=stream)
+        if sampling:
+            profiler.write(path)
+            profiler.print_top(stream)
+            category_times = profiler.category_times(wall_time)
+        else:
+            import pstats
+            profiler.dump_stats(path)
+            stats = pstats.Stats(profiler, stream=stream)
+            stats.sort_stats('cumulative').print_stats(20)
+            category_times = cprofile_category_times(stats, wall_time)
+        print_category_times(category_times, wall_time, stream)
+        print("Profile written to %s" % path, file=stream)
@@ -0,0 +1,98 @@
+"""
+Fast directory scanning for creating and uploading datafiles.
+
+:func:`os.walk` followed by :func:`os.stat` / :func:`os.path.isdir` for each
+file results in several metadata system calls per file, which is slow on
+network filesystems (NFS, Lustre, SSHFS) where each one is a round trip.
+:func:`scan_directory` uses :func:`os.scandir`, whose
+:class:`os.DirEntry` objects know whether they are files or directories
+without any extra system calls, and cache the result of their single
+``stat`` call.
+"""
+import os
+from collections import deque, namedtuple
+
+#: A file found by :func:`scan_directory`.  relpath is relative to the
+#: directory being scanned, size is in bytes and mtime is the
+#: modification time in seconds since the epoch.  inode is the file's
+#: inode number (or None if it isn't known), which can be used to order
+#: reads by physical layout (see :mod:`mtclient.utils.layout`).
+ScanEntry = namedtuple('ScanEntry', ['relpath', 'size', 'mtime', 'inode'])
+ScanEntry.__new__.__defaults__ = (None,)
+
+
+def _scan_one_directory(dir_path, relpath, onerror=None):
+    """
+    Scan a single directory (without recursing into its subdirectories).
+
+    :return: A tuple containing a list of :class:`ScanEntry` tuples for the
+        files in the directory and a list of (path, relpath) tuples for its
+        subdirectories.
+    """
+    files = []
+    subdirs = []
+    try:
+        with os.scandir(dir_path) as entries:
+            for entry in entries:
+                entry_relpath = os.path.join(relpath, entry.name) \
+                    if relpath else entry.name
+                try:
+                    if entry.is_dir():
+                        # Like os.walk, don't follow symlinks to directories
+                        # and don't treat them as files either:
+                        if not entry.is_symlink():
+                            subdirs.append((entry.path, entry_relpath))
+                        continue
+                    stat = entry.stat()
+                except OSError as err:
+                    if onerror:
+                        onerror(err)
+                    continue
+                files.append(
+                    ScanEntry(entry_relpath, stat.st_size, stat.st_mtime,
+                              stat.st_ino))
+    except OSError as err:
+        if onerror:
+            onerror(err)
+    return files, subdirs
+
+
+def scan_directory(dir_path, threads=1, onerror=None):
+    """
+    Yield a :class:`ScanEntry` for each file within dir_path (recursively).
+
+    :param dir_path: The directory to scan.
+    :param threads: The number of threads to use for scanning subdirectories
+        concurrently.  On network filesystems, using multiple threads hides
+        the latency of each directory listing.  Files are yielded in
+        directory listing order when threads is 1, and in an unspecified
+        order otherwise.
+    :param onerror: An optional function to call with an OSError if a
+        directory can't be listed or a file can't be stat-ed, like the
+        onerror argument of :func:`os.walk`.
+    """
+    if threads <= 1:
+        pending = deque([(dir_path, "")])
+        while pending:
+            files, subdirs = _scan_one_directory(*pending.popleft(),
+                                                 onerror=onerror)
+            for scan_entry in files:
+                yield scan_entry
+            pending.extend(subdirs)
+        return
+
+    from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        futures = set([executor.submit(
+            _scan_one_directory, dir_path, "", onerror)])
+        while futures:
+            done, futures = wait(futures, return_when=FIRST_COMPLETED)
+            for future in done:
+                files, subdirs = future.result()
+                for subdir_path, subdir_relpath in subdirs:
+                    futures.add(executor.submit(
+                        _scan_one_directory, subdir_path, subdir_relpath,
+                        onerror))
+                for scan_entry in files:
+                    yield scan_entry
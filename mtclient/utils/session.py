@@ -0,0 +1,49 @@
+"""
+Shared HTTP session for MyTardis API requests.
+
+Sending requests through a single :class:`requests.Session` reuses
+connections (HTTP keep-alive) instead of opening a new connection for
+every request.  The session also records each request's statistics, when
+enabled (see :mod:`mtclient.utils.instrumentation`).
+"""
+import threading
+
+from six.moves import http_cookiejar
+
+from requests.adapters import HTTPAdapter
+
+from .instrumentation import InstrumentedSession
+
+_session = None  # pylint: disable=invalid-name
+_session_lock = threading.Lock()  # pylint: disable=invalid-name
+
+
+def get_session():
+    """
+    Return the shared :class:`requests.Session` (an
+    :class:`mtclient.utils.instrumentation.InstrumentedSession`), creating
+    it if necessary.
+    """
+    global _session  # pylint: disable=global-statement,invalid-name
+    with _session_lock:
+        if _session is None:
+            _session = InstrumentedSession()
+            # We authenticate each request with an API key, so we don't
+            # want session cookies from MyTardis to be sent back to it:
+            _session.cookies.set_policy(
+                http_cookiejar.DefaultCookiePolicy(allowed_domains=[]))
+        return _session
+
+
+def set_pool_maxsize(pool_maxsize):
+    """
+    Allow the shared session to keep up to pool_maxsize connections
+    open to the MyTardis server, e.g. for concurrent uploads.
+
+    :param pool_maxsize: The maximum number of connections to keep open
+        to a single host.
+    """
+    session = get_session()
+    adapter = HTTPAdapter(pool_maxsize=pool_maxsize)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
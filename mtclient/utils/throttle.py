@@ -0,0 +1,37 @@
+"""
+Bandwidth limiting for uploads.
+"""
+import threading
+import time
+
+
+class BandwidthLimiter(object):
+    """
+    Limits the combined throughput of one or more threads to a maximum
+    number of bytes per second.
+
+    Each thread calls :meth:`consume` after reading a block of data, and
+    sleeps for as long as it takes for that block to fit within the
+    bandwidth cap.  Up to one second's worth of unused bandwidth can be
+    carried over, so short pauses don't reduce the overall throughput.
+
+    :param bytes_per_second: The maximum combined throughput.
+    """
+    # pylint: disable=too-few-public-methods
+    def __init__(self, bytes_per_second):
+        self.bytes_per_second = float(bytes_per_second)
+        self._lock = threading.Lock()
+        self._next_time = time.time()
+
+    def consume(self, num_bytes):
+        """
+        Account for num_bytes being transferred, sleeping if necessary
+        to stay within the bandwidth cap.
+        """
+        with self._lock:
+            now = time.time()
+            self._next_time = max(self._next_time, now - 1.0) + \
+                num_bytes / self.bytes_per_second
+            delay = self._next_time - now
+        if delay > 0:
+            time.sleep(delay)
@@ -0,0 +1,284 @@
+"""
+Hierarchical tracing spans for multi-step operations.
+
+Operations like downloading a dataset or creating DataFile records for a
+directory make many requests.  Wrapping them (and each HTTP request, see
+:class:`mtclient.utils.instrumentation.InstrumentedSession`) in spans
+records them as a tree, e.g. a dataset download span containing a span
+for each datafile's download, each containing its HTTP requests.
+
+Spans are recorded by :data:`tracer` while it is enabled (e.g. by
+'mytardis --trace FILE ...'), and can be exported to a JSON file.  If the
+opentelemetry-api package is installed, each span is also started as an
+OpenTelemetry span, so traces can be sent to any OpenTelemetry exporter
+configured by the application.  Otherwise (and while the tracer is
+disabled), spans are no-ops.
+
+Spans started in a worker thread don't have a parent by default, so the
+current span should be passed to the worker and activated there, e.g.
+``with activated(parent_span): ...``.
+"""
+import binascii
+import functools
+import inspect
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+import six
+
+_otel_tracer = None  # pylint: disable=invalid-name
+_otel_checked = False  # pylint: disable=invalid-name
+
+
+def get_otel_tracer():
+    """
+    Return an OpenTelemetry tracer, or None if opentelemetry-api isn't
+    installed.
+    """
+    # pylint: disable=global-statement,invalid-name
+    global _otel_tracer, _otel_checked
+    if not _otel_checked:
+        try:
+            from opentelemetry import trace  # pylint: disable=import-error
+            _otel_tracer = trace.get_tracer("mtclient")
+        except ImportError:
+            _otel_tracer = None
+        _otel_checked = True
+    return _otel_tracer
+
+
+def new_id(num_bytes):
+    """
+    Return a random hexadecimal ID.
+    """
+    return binascii.hexlify(os.urandom(num_bytes)).decode('ascii')
+
+
+def attribute_value(value):
+    """
+    Convert an attribute value to a type supported by OpenTelemetry.
+    """
+    if value is None or isinstance(value, (bool, int, float) +
+                                   six.string_types):
+        return value
+    return six.text_type(value)
+
+
+class Span(object):
+    """
+    A timed operation, which may be part of a larger operation.
+    """
+    # pylint: disable=too-many-instance-attributes
+    def __init__(self, name, parent=None, attributes=None):
+        self.name = name
+        self.trace_id = parent.trace_id if parent else new_id(16)
+        self.span_id = new_id(8)
+        self.parent_id = parent.span_id if parent else None
+        self.attributes = dict(attributes or {})
+        self.start_time = time.time()
+        self.end_time = None
+        self.status = 'ok'
+        self.error = None
+        self.thread = threading.current_thread().name
+        #: The corresponding OpenTelemetry span, if any.
+        self.otel_span = None
+
+    def set_attribute(self, key, value):
+        """
+        Set an attribute (e.g. the status code of an HTTP request).
+        """
+        self.attributes[key] = attribute_value(value)
+        if self.otel_span is not None and value is not None:
+            self.otel_span.set_attribute(key, attribute_value(value))
+
+    def to_dict(self):
+        """
+        Return a JSON-serializable dictionary describing the span.
+        """
+        return dict(
+            name=self.name, trace_id=self.trace_id, span_id=self.span_id,
+            parent_id=self.parent_id, start_time=self.start_time,
+            end_time=self.end_time,
+            duration=self.end_time - self.start_time
+            if self.end_time else None,
+            thread=self.thread, status=self.status, error=self.error,
+            attributes=self.attributes)
+
+
+class Tracer(object):
+    """
+    Records finished spans while enabled, and keeps track of each thread's
+    current span.
+    """
+    def __init__(self):
+        #: Whether spans are recorded.
+        self.enabled = False
+        self._spans = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def current_span(self):
+        """
+        Return the current thread's innermost span, or None.
+        """
+        stack = getattr(self._local, 'stack', None)
+        return stack[-1] if stack else None
+
+    def push(self, span_):
+        """
+        Make span_ the current thread's innermost span.
+        """
+        if not hasattr(self._local, 'stack'):
+            self._local.stack = []
+        self._local.stack.append(span_)
+
+    def deactivate(self, span_):
+        """
+        Remove span_ from the current thread's stack of spans, without
+        recording it.
+        """
+        self._local.stack.remove(span_)
+
+    def pop(self, span_):
+        """
+        Record a finished span (if enabled), and make its parent the
+        current thread's current span.
+        """
+        self.deactivate(span_)
+        if self.enabled:
+            with self._lock:
+                self._spans.append(span_)
+
+    @property
+    def spans(self):
+        """
+        A list of the finished spans, in order of their start times.
+        """
+        with self._lock:
+            return sorted(self._spans, key=lambda span_: span_.start_time)
+
+    def clear(self):
+        """
+        Discard all recorded spans.
+        """
+        with self._lock:
+            del self._spans[:]
+
+    def export_json(self, path):
+        """
+        Write the recorded spans to a JSON file.
+        """
+        with open(path, 'w') as trace_file:
+            json.dump(dict(spans=[span_.to_dict() for span_ in self.spans]),
+                      trace_file, indent=2, sort_keys=True)
+
+
+tracer = Tracer()  # pylint: disable=invalid-name
+
+
+def tracing_enabled():
+    """
+    Return True if spans are being recorded, or started as OpenTelemetry
+    spans.
+    """
+    return tracer.enabled or get_otel_tracer() is not None
+
+
+@contextmanager
+def span(name, parent=None, **attributes):
+    """
+    Run the code within the context as a span, which is a child of parent
+    (default: the current thread's current span).
+
+    :return: A context manager providing the :class:`Span`, or None if
+        tracing isn't enabled.
+    """
+    if not tracing_enabled():
+        yield None
+        return
+    otel_tracer = get_otel_tracer()
+    if parent is None:
+        parent = tracer.current_span()
+    span_ = Span(name, parent=parent, attributes=dict(
+        (key, attribute_value(value)) for key, value in attributes.items()))
+    tracer.push(span_)
+    try:
+        if otel_tracer is not None:
+            from opentelemetry import trace  # pylint: disable=import-error
+            context = trace.set_span_in_context(parent.otel_span) \
+                if parent is not None and parent.otel_span is not None \
+                else None
+            otel_attributes = dict(
+                (key, value) for key, value in span_.attributes.items()
+                if value is not None)
+            with otel_tracer.start_as_current_span(
+                    name, context=context,
+                    attributes=otel_attributes) as otel_span:
+                span_.otel_span = otel_span
+                yield span_
+        else:
+            yield span_
+    except BaseException as err:
+        span_.status = 'error'
+        span_.error = str(err) or err.__class__.__name__
+        raise
+    finally:
+        span_.end_time = time.time()
+        tracer.pop(span_)
+
+
+@contextmanager
+def activated(span_):
+    """
+    Make span_ (e.g. a span started in another thread) the current span
+    within the context, so that spans started within the context are its
+    children.
+    """
+    if span_ is None:
+        yield
+        return
+    tracer.push(span_)
+    try:
+        yield
+    finally:
+        tracer.deactivate(span_)
+
+
+def current_span():
+    """
+    Return the current thread's current span, or None.
+    """
+    return tracer.current_span()
+
+
+def traced(name, *arg_names):
+    r"""
+    Decorator which runs a function as a span.
+
+    :param name: The span's name, e.g. "DataFile.download".
+    :param arg_names: The names of the function's arguments (including
+        keyword arguments accepted by its \**kwargs) to record as the
+        span's attributes.
+    """
+    def decorator(func):
+        """
+        Wrap func in a span.
+        """
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            """
+            Run func as a span.
+            """
+            if not tracing_enabled():
+                return func(*args, **kwargs)
+            call_args = inspect.getcallargs(func, *args, **kwargs)
+            attributes = dict(
+                (arg_name, call_args.get(arg_name, kwargs.get(arg_name)))
+                for arg_name in arg_names)
+            with span(name, **attributes):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
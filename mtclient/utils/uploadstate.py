@@ -0,0 +1,50 @@
+"""
+Resumable state for uploading a directory of datafiles.
+"""
+import os
+import threading
+
+
+class UploadState(object):
+    """
+    Records which files have been uploaded, so that an interrupted
+    directory upload can be resumed without re-uploading them.
+
+    The state file is append-only, containing one path (relative to the
+    dataset path) per line, so a file is only recorded as uploaded once
+    its upload has completed, even if the process is killed.
+
+    :param path: The location of the state file.
+    """
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._completed = set()
+        if os.path.exists(path):
+            with open(path, 'r') as state_file:
+                for line in state_file:
+                    if line.strip():
+                        self._completed.add(line.rstrip('\n'))
+        elif not os.path.exists(os.path.dirname(os.path.abspath(path))):
+            os.makedirs(os.path.dirname(os.path.abspath(path)))
+
+    def __contains__(self, relpath):
+        """
+        Return True if the file at relpath has already been uploaded.
+        """
+        return relpath in self._completed
+
+    def __len__(self):
+        """
+        Return the number of files recorded as uploaded.
+        """
+        return len(self._completed)
+
+    def mark_done(self, relpath):
+        """
+        Record that the file at relpath has been uploaded.
+        """
+        with self._lock:
+            self._completed.add(relpath)
+            with open(self.path, 'a') as state_file:
+                state_file.write(relpath + '\n')
@@ -0,0 +1,180 @@
+"""
+Watching a directory for new files, e.g. an instrument's output directory.
+
+When the optional inotify_simple package is installed (on Linux), the
+watcher is notified by the kernel when a file is closed after writing, so
+the work done for each poll is proportional to the number of new files.
+Otherwise it falls back to rescanning the directory tree, and considers a
+file complete once its size and modification time stop changing.
+"""
+import logging
+import os
+import time
+
+from .scan import ScanEntry, scan_directory
+
+logger = logging.getLogger(__name__)  # pylint: disable=invalid-name
+
+
+class DirectoryWatcher(object):
+    """
+    Finds files within a directory (recursively) once they are complete.
+
+    :param dir_path: The directory to watch.
+    :param interval: How often (in seconds) to check for new files.
+    :param settle_time: How long (in seconds) a file must remain unmodified
+        before it is considered complete, unless inotify reports that it
+        has been closed after writing.
+    :param use_inotify: Use inotify if the inotify_simple package is
+        installed, rather than rescanning the directory tree.
+    """
+    def __init__(self, dir_path, interval=5.0, settle_time=10.0,
+                 use_inotify=True):
+        self.dir_path = dir_path
+        self.interval = interval
+        self.settle_time = settle_time
+        self._inotify = None
+        self._watches = {}
+        if use_inotify:
+            try:
+                import inotify_simple  # pylint: disable=import-error
+                self._inotify = inotify_simple.INotify()
+            except (ImportError, OSError) as err:
+                logger.info("Polling %s because inotify is unavailable: %s",
+                            dir_path, err)
+        # Files which have been found, but aren't complete yet,
+        # mapped to their (size, mtime) when they were last checked:
+        self._pending = {}
+        # Files which have already been reported as complete:
+        self._completed = set()
+
+    def close(self):
+        """
+        Stop watching.
+        """
+        if self._inotify:
+            self._inotify.close()
+            self._inotify = None
+
+    def batches(self, batch_size=100, max_polls=None):
+        """
+        Yield lists of up to batch_size :class:`mtclient.utils.scan.ScanEntry`
+        tuples for files which have become complete.
+
+        :param batch_size: The maximum number of files per batch.
+        :param max_polls: Stop after this many polls (default: never stop).
+        """
+        polls = 0
+        while max_polls is None or polls < max_polls:
+            if self._inotify:
+                if polls == 0:
+                    self._add_watches("")
+                    self._scan("")
+                closed = self._read_inotify_events()
+            else:
+                if polls > 0:
+                    time.sleep(self.interval)
+                self._scan("")
+                closed = []
+            ready = closed + self._check_pending()
+            for index in range(0, len(ready), batch_size):
+                yield ready[index:index + batch_size]
+            polls += 1
+
+    def _scan(self, relpath):
+        """
+        Add any files within relpath which haven't been reported yet to the
+        pending files.
+        """
+        for scan_entry in scan_directory(
+                os.path.join(self.dir_path, relpath),
+                onerror=lambda err: logger.error(str(err))):
+            if relpath:
+                scan_entry = scan_entry._replace(
+                    relpath=os.path.join(relpath, scan_entry.relpath))
+            if scan_entry.relpath not in self._completed and \
+                    scan_entry.relpath not in self._pending:
+                self._pending[scan_entry.relpath] = None
+
+    def _check_pending(self):
+        """
+        Return ScanEntry tuples for pending files which have become
+        complete, i.e. whose size and modification time haven't changed
+        since they were last checked and were last modified at least
+        settle_time seconds ago.
+        """
+        ready = []
+        now = time.time()
+        for relpath in sorted(self._pending):
+            try:
+                stat = os.stat(os.path.join(self.dir_path, relpath))
+            except OSError:
+                # The file has been deleted or renamed
+                del self._pending[relpath]
+                continue
+            size_and_mtime = (stat.st_size, stat.st_mtime)
+            if self._pending[relpath] == size_and_mtime and \
+                    now - stat.st_mtime >= self.settle_time:
+                del self._pending[relpath]
+                self._completed.add(relpath)
+                ready.append(ScanEntry(relpath, *size_and_mtime))
+            else:
+                self._pending[relpath] = size_and_mtime
+        return ready
+
+    def _add_watches(self, relpath):
+        """
+        Add inotify watches for relpath and its subdirectories.
+        """
+        from inotify_simple import flags  # pylint: disable=import-error
+
+        mask = flags.CLOSE_WRITE | flags.MOVED_TO | flags.CREATE
+        for root, _, _ in os.walk(os.path.join(self.dir_path, relpath)):
+            try:
+                watch_descriptor = self._inotify.add_watch(root, mask)
+            except OSError as err:
+                logger.error(str(err))
+                continue
+            self._watches[watch_descriptor] = \
+                os.path.relpath(root, self.dir_path)
+
+    def _read_inotify_events(self):
+        """
+        Wait up to one interval for inotify events, returning ScanEntry
+        tuples for files which have been closed after writing (or moved
+        into the directory tree).  New subdirectories are watched and
+        scanned, because files may have been created in them before
+        they were watched.  If the kernel's event queue overflowed, events
+        have been lost, so the whole directory tree is watched and scanned
+        again.
+        """
+        from inotify_simple import flags  # pylint: disable=import-error
+
+        closed = []
+        for event in self._inotify.read(timeout=int(self.interval * 1000)):
+            if event.mask & flags.Q_OVERFLOW:
+                logger.warning("Rescanning %s because inotify events were "
+                               "lost", self.dir_path)
+                self._add_watches("")
+                self._scan("")
+                continue
+            if event.wd not in self._watches or not event.name:
+                continue
+            relpath = os.path.normpath(
+                os.path.join(self._watches[event.wd], event.name))
+            if event.mask & flags.ISDIR:
+                if event.mask & (flags.CREATE | flags.MOVED_TO):
+                    self._add_watches(relpath)
+                    self._scan(relpath)
+                continue
+            if not event.mask & (flags.CLOSE_WRITE | flags.MOVED_TO) or \
+                    relpath in self._completed:
+                continue
+            try:
+                stat = os.stat(os.path.join(self.dir_path, relpath))
+            except OSError:
+                continue
+            self._pending.pop(relpath, None)
+            self._completed.add(relpath)
+            closed.append(ScanEntry(relpath, stat.st_size, stat.st_mtime))
+        return closed
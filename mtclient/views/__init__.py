@@ -3,30 +3,44 @@ Views for MyTardis records
 """
 from __future__ import print_function
 
-import json
-from texttable import Texttable
-
-from ..models.api import ApiEndpoints, ApiSchema
-from ..models.facility import Facility
-from ..models.instrument import Instrument
-from ..models.experiment import Experiment
-from ..models.dataset import Dataset
-from ..models.datafile import DataFile
-from ..models.storagebox import StorageBox
-from ..models.schema import Schema
-from ..models.resultset import ResultSet
-
-from .api import render_api_endpoints, render_api_schema
-from .facility import render_facility, render_facilities
-from .instrument import render_instrument, render_instruments
-from .experiment import render_experiment, render_experiments
-from .dataset import render_dataset, render_datasets
-from .datafile import render_datafile, render_datafiles
-from .storagebox import render_storage_box, render_storage_boxes
-from .schema import render_schema, render_schemas
-
-
-def render(data, render_format='table', display_heading=True):
+from importlib import import_module
+
+#: The view module and function for rendering a single record of each
+#: model, imported only when needed, so that running a command doesn't
+#: import every model and view.
+RECORD_RENDERERS = dict(
+    ApiSchema=('api', 'render_api_schema'),
+    Facility=('facility', 'render_facility'),
+    Instrument=('instrument', 'render_instrument'),
+    Experiment=('experiment', 'render_experiment'),
+    Dataset=('dataset', 'render_dataset'),
+    DataFile=('datafile', 'render_datafile'),
+    StorageBox=('storagebox', 'render_storage_box'),
+    Schema=('schema', 'render_schema'))
+
+#: The view module and function for rendering a result set of each model.
+RESULT_SET_RENDERERS = dict(
+    Facility=('facility', 'render_facilities'),
+    Instrument=('instrument', 'render_instruments'),
+    Experiment=('experiment', 'render_experiments'),
+    Dataset=('dataset', 'render_datasets'),
+    DataFile=('datafile', 'render_datafiles'),
+    StorageBox=('storagebox', 'render_storage_boxes'),
+    Schema=('schema', 'render_schemas'))
+
+
+def get_renderer(renderers, data_type):
+    """
+    Import and return the render function for data_type.
+    """
+    if data_type not in renderers:
+        raise NotImplementedError("Unexpected data type: %s" % data_type)
+    module_name, function_name = renderers[data_type]
+    module = import_module("%s.%s" % (__name__, module_name))
+    return getattr(module, function_name)
+
+
+def render(data, render_format='table', display_heading=True, stream=None):
     """
     Generic render function.
 
@@ -46,11 +60,18 @@ def render(data, render_format='table', display_heading=True):
         displaying the table.  This meta information can be used to
         determine whether the query results have been truncated due
         to pagination.
+    :param stream: If supplied, a `ResultSet` or `ApiEndpoints` table is
+        written to stream (one line at a time for large tables), and None
+        is returned.
     """
-    if data.__class__ == ResultSet:
-        return render_result_set(data, render_format, display_heading)
-    if data.__class__ == ApiEndpoints:
-        return render_api_endpoints(data, render_format, display_heading)
+    data_type = data.__class__.__name__
+    if data_type == 'ResultSet':
+        return render_result_set(data, render_format, display_heading,
+                                 stream)
+    if data_type == 'ApiEndpoints':
+        from .api import render_api_endpoints
+        return render_api_endpoints(data, render_format, display_heading,
+                                    stream)
     return render_single_record(data, render_format)
 
 
@@ -68,22 +89,12 @@ def render_single_record(data, render_format):
     """
     if not data:
         return ""
-    renderers = dict(
-        ApiSchema=render_api_schema,
-        Facility=render_facility,
-        Instrument=render_instrument,
-        Experiment=render_experiment,
-        Dataset=render_dataset,
-        DataFile=render_datafile,
-        StorageBox=render_storage_box,
-        Schema=render_schema)
-    data_type = data.__class__.__name__
-    if data_type not in renderers:
-        raise NotImplementedError("Unexpected data type: %s" % data_type)
-    return renderers[data_type](data, render_format)
+    renderer = get_renderer(RECORD_RENDERERS, data.__class__.__name__)
+    return renderer(data, render_format)
 
 
-def render_result_set(result_set, render_format, display_heading=True):
+def render_result_set(result_set, render_format, display_heading=True,
+                      stream=None):
     """
     Render result set.
 
@@ -102,16 +113,8 @@ def render_result_set(result_set, render_format, display_heading=True):
         displaying the table.  This meta information can be used to
         determine whether the query results have been truncated due
         to pagination.
+    :param stream: If supplied, a table is written to stream (one line at
+        a time for large tables), and None is returned.
     """
-    renderers = dict(
-        Facility=render_facilities,
-        Instrument=render_instruments,
-        Experiment=render_experiments,
-        Dataset=render_datasets,
-        DataFile=render_datafiles,
-        StorageBox=render_storage_boxes,
-        Schema=render_schemas)
-    data_type = result_set.model.__name__
-    if data_type not in renderers:
-        raise NotImplementedError("Unexpected data type: %s" % data_type)
-    return renderers[data_type](result_set, render_format, display_heading)
+    renderer = get_renderer(RESULT_SET_RENDERERS, result_set.model.__name__)
+    return renderer(result_set, render_format, display_heading, stream)
@@ -6,6 +6,8 @@ from __future__ import print_function
 import json
 from texttable import Texttable
 
+from .table import new_table, output_table
+
 
 def render_api_schema(api_schema, render_format):
     """
@@ -58,7 +60,8 @@ def render_api_schema_as_table(api_schema):
     return table.draw() + "\n"
 
 
-def render_api_endpoints(api_endpoints, render_format, display_heading=True):
+def render_api_endpoints(api_endpoints, render_format, display_heading=True,
+                         stream=None):
     """
     Render API endpoints
 
@@ -70,10 +73,13 @@ def render_api_endpoints(api_endpoints, render_format, display_heading=True):
         an `ApiEndpoints` set, setting `display_heading` to True
         ensures that a heading is displayed before the results table.
         The heading includes the URL resolved to perform the query.
+    :param stream: If supplied, a table is written to stream (one line at
+        a time for large tables) instead of being returned.
     """
     if render_format == 'json':
         return render_api_endpoints_as_json(api_endpoints)
-    return render_api_endpoints_as_table(api_endpoints, display_heading)
+    return render_api_endpoints_as_table(api_endpoints, display_heading,
+                                         stream)
 
 
 def render_api_endpoints_as_json(api_endpoints, indent=2, sort_keys=True):
@@ -92,7 +98,8 @@ def render_api_endpoints_as_json(api_endpoints, indent=2, sort_keys=True):
         api_endpoints.response_dict, indent=indent, sort_keys=sort_keys)
 
 
-def render_api_endpoints_as_table(api_endpoints, display_heading=True):
+def render_api_endpoints_as_table(api_endpoints, display_heading=True,
+                                  stream=None):
     """
     Returns ASCII table view of api_endpoints.
 
@@ -104,15 +111,17 @@ def render_api_endpoints_as_table(api_endpoints, display_heading=True):
         an `ApiEndpoints` set, setting `display_heading` to True
         ensures that a heading is displayed before the results table.
         The heading includes the URL resolved to perform the query.
+    :param stream: If supplied, the table is written to stream (one line
+        at a time for large tables) instead of being returned.
     """
     heading = "\n" \
         "API Endpoints\n" if display_heading else ""
 
-    table = Texttable(max_width=0)
+    table = new_table(len(api_endpoints))
     table.set_cols_align(["l", 'l', 'l'])
     table.set_cols_valign(['m', 'm', 'm'])
     table.header(["Model", "List Endpoint", "Schema"])
     for api_endpoint in api_endpoints:
         table.add_row([api_endpoint.model, api_endpoint.list_endpoint,
                        api_endpoint.schema])
-    return heading + table.draw() + "\n"
+    return output_table(heading, table, stream)
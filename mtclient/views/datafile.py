@@ -7,6 +7,7 @@ import json
 from texttable import Texttable
 
 from ..utils import human_readable_size_string
+from .table import new_table, output_table
 
 
 def render_datafile(datafile, render_format):
@@ -84,7 +85,8 @@ def render_datafile_as_table(datafile):
     return datafile_and_param_sets
 
 
-def render_datafiles(datafiles, render_format, display_heading=True):
+def render_datafiles(datafiles, render_format, display_heading=True,
+                     stream=None):
     """
     Render datafiles
 
@@ -99,10 +101,12 @@ def render_datafiles(datafiles, render_format, display_heading=True):
         displaying the table.  This meta information can be used to
         determine whether the query results have been truncated due
         to pagination.
+    :param stream: If supplied, a table is written to stream (one line at
+        a time for large tables) instead of being returned.
     """
     if render_format == 'json':
         return render_datafiles_as_json(datafiles)
-    return render_datafiles_as_table(datafiles, display_heading)
+    return render_datafiles_as_table(datafiles, display_heading, stream)
 
 
 def render_datafiles_as_json(datafiles, indent=2, sort_keys=True):
@@ -121,7 +125,8 @@ def render_datafiles_as_json(datafiles, indent=2, sort_keys=True):
         datafiles.response_dict, indent=indent, sort_keys=sort_keys)
 
 
-def render_datafiles_as_table(datafiles, display_heading=True):
+def render_datafiles_as_table(datafiles, display_heading=True,
+                              stream=None):
     """
     Returns ASCII table view of datafiles.
 
@@ -134,6 +139,8 @@ def render_datafiles_as_table(datafiles, display_heading=True):
         in a 'heading' before displaying the table.  This meta
         information can be used to determine whether the query results
         have been truncated due to pagination.
+    :param stream: If supplied, the table is written to stream (one line
+        at a time for large tables) instead of being returned.
     """
     heading = "\n" \
         "Model: DataFile\n" \
@@ -144,7 +151,7 @@ def render_datafiles_as_table(datafiles, display_heading=True):
         % (datafiles.url, datafiles.total_count, datafiles.limit,
            datafiles.offset) if display_heading else ""
 
-    table = Texttable(max_width=0)
+    table = new_table(len(datafiles))
     table.set_cols_align(["r", 'l', 'l', 'l', 'l', 'l', 'l'])
     table.set_cols_valign(['m', 'm', 'm', 'm', 'm', 'm', 'm'])
     table.header(["DataFile ID", "Filename", "Storage Box",
@@ -156,4 +163,4 @@ def render_datafiles_as_table(datafiles, display_heading=True):
                        "\n".join(uris), str(datafile.verified),
                        human_readable_size_string(datafile.size),
                        datafile.md5sum])
-    return heading + table.draw() + "\n"
+    return output_table(heading, table, stream)
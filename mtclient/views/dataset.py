@@ -6,6 +6,8 @@ from __future__ import print_function
 import json
 from texttable import Texttable
 
+from .table import new_table, output_table
+
 
 def render_dataset(dataset, render_format):
     """
@@ -75,7 +77,8 @@ def render_dataset_as_table(dataset):
     return dataset_and_param_sets
 
 
-def render_datasets(datasets, render_format, display_heading=True):
+def render_datasets(datasets, render_format, display_heading=True,
+                    stream=None):
     """
     Render datasets
 
@@ -90,10 +93,12 @@ def render_datasets(datasets, render_format, display_heading=True):
         displaying the table.  This meta information can be used to
         determine whether the query results have been truncated due
         to pagination.
+    :param stream: If supplied, a table is written to stream (one line at
+        a time for large tables) instead of being returned.
     """
     if render_format == 'json':
         return render_datasets_as_json(datasets)
-    return render_datasets_as_table(datasets, display_heading)
+    return render_datasets_as_table(datasets, display_heading, stream)
 
 
 def render_datasets_as_json(datasets, indent=2, sort_keys=True):
@@ -112,7 +117,8 @@ def render_datasets_as_json(datasets, indent=2, sort_keys=True):
         datasets.response_dict, indent=indent, sort_keys=sort_keys)
 
 
-def render_datasets_as_table(datasets, display_heading=True):
+def render_datasets_as_table(datasets, display_heading=True,
+                             stream=None):
     """
     Returns ASCII table view of datasets.
 
@@ -125,6 +131,8 @@ def render_datasets_as_table(datasets, display_heading=True):
         in a 'heading' before displaying the table.  This meta
         information can be used to determine whether the query results
         have been truncated due to pagination.
+    :param stream: If supplied, the table is written to stream (one line
+        at a time for large tables) instead of being returned.
     """
     heading = "\n" \
         "Model: Dataset\n" \
@@ -135,11 +143,11 @@ def render_datasets_as_table(datasets, display_heading=True):
         % (datasets.url, datasets.total_count,
            datasets.limit, datasets.offset) if display_heading else ""
 
-    table = Texttable(max_width=0)
+    table = new_table(len(datasets))
     table.set_cols_align(["r", 'l', 'l', 'l'])
     table.set_cols_valign(['m', 'm', 'm', 'm'])
     table.header(["Dataset ID", "Experiment(s)", "Description", "Instrument"])
     for dataset in datasets:
         table.add_row([dataset.id, "\n".join(dataset.experiments),
                        dataset.description, dataset.instrument])
-    return heading + table.draw() + "\n"
+    return output_table(heading, table, stream)
@@ -6,6 +6,8 @@ from __future__ import print_function
 import json
 from texttable import Texttable
 
+from .table import new_table, output_table
+
 
 def render_experiment(experiment, render_format):
     """
@@ -77,7 +79,8 @@ def render_experiment_as_table(experiment):
     return exp_and_param_sets
 
 
-def render_experiments(experiments, render_format, display_heading=True):
+def render_experiments(experiments, render_format, display_heading=True,
+                       stream=None):
     """
     Render experiments
 
@@ -92,10 +95,12 @@ def render_experiments(experiments, render_format, display_heading=True):
         displaying the table.  This meta information can be used to
         determine whether the query results have been truncated due
         to pagination.
+    :param stream: If supplied, a table is written to stream (one line at
+        a time for large tables) instead of being returned.
     """
     if render_format == 'json':
         return render_experiments_as_json(experiments)
-    return render_experiments_as_table(experiments, display_heading)
+    return render_experiments_as_table(experiments, display_heading, stream)
 
 
 def render_experiments_as_json(experiments, indent=2, sort_keys=True):
@@ -114,7 +119,8 @@ def render_experiments_as_json(experiments, indent=2, sort_keys=True):
         experiments.response_dict, indent=indent, sort_keys=sort_keys)
 
 
-def render_experiments_as_table(experiments, display_heading=True):
+def render_experiments_as_table(experiments, display_heading=True,
+                                stream=None):
     """
     Returns ASCII table view of experiments.
 
@@ -127,6 +133,8 @@ def render_experiments_as_table(experiments, display_heading=True):
         in a 'heading' before displaying the table.  This meta
         information can be used to determine whether the query results
         have been truncated due to pagination.
+    :param stream: If supplied, the table is written to stream (one line
+        at a time for large tables) instead of being returned.
     """
     heading = "\n" \
         "Model: Experiment\n" \
@@ -137,11 +145,11 @@ def render_experiments_as_table(experiments, display_heading=True):
         % (experiments.url, experiments.total_count,
            experiments.limit, experiments.offset) if display_heading else ""
 
-    table = Texttable(max_width=0)
+    table = new_table(len(experiments))
     table.set_cols_align(["r", 'l', 'l'])
     table.set_cols_valign(['m', 'm', 'm'])
     table.header(["ID", "Institution", "Title"])
     for experiment in experiments:
         table.add_row([experiment.id, experiment.institution_name,
                        experiment.title])
-    return heading + table.draw() + "\n"
+    return output_table(heading, table, stream)
@@ -6,6 +6,8 @@ from __future__ import print_function
 import json
 from texttable import Texttable
 
+from .table import new_table, output_table
+
 
 def render_facility(facility, render_format, display_heading=True):
     """
@@ -64,7 +66,8 @@ def render_facility_as_table(facility, display_heading=True):
     return heading + table.draw() + "\n"
 
 
-def render_facilities(facilities, render_format, display_heading=True):
+def render_facilities(facilities, render_format, display_heading=True,
+                      stream=None):
     """
     Render facilities
 
@@ -79,10 +82,12 @@ def render_facilities(facilities, render_format, display_heading=True):
         displaying the table.  This meta information can be used to
         determine whether the query results have been truncated due
         to pagination.
+    :param stream: If supplied, a table is written to stream (one line at
+        a time for large tables) instead of being returned.
     """
     if render_format == 'json':
         return render_facilities_as_json(facilities)
-    return render_facilities_as_table(facilities, display_heading)
+    return render_facilities_as_table(facilities, display_heading, stream)
 
 
 def render_facilities_as_json(facilities, indent=2, sort_keys=True):
@@ -101,7 +106,8 @@ def render_facilities_as_json(facilities, indent=2, sort_keys=True):
         facilities.response_dict, indent=indent, sort_keys=sort_keys)
 
 
-def render_facilities_as_table(facilities, display_heading=True):
+def render_facilities_as_table(facilities, display_heading=True,
+                               stream=None):
     """
     Returns ASCII table view of facilities.
 
@@ -114,6 +120,8 @@ def render_facilities_as_table(facilities, display_heading=True):
         in a 'heading' before displaying the table.  This meta
         information can be used to determine whether the query results
         have been truncated due to pagination.
+    :param stream: If supplied, the table is written to stream (one line
+        at a time for large tables) instead of being returned.
     """
     heading = "\n" \
         "Model: Facility\n" \
@@ -124,10 +132,10 @@ def render_facilities_as_table(facilities, display_heading=True):
         % (facilities.url, facilities.total_count,
            facilities.limit, facilities.offset) if display_heading else ""
 
-    table = Texttable(max_width=0)
+    table = new_table(len(facilities))
     table.set_cols_align(["r", 'l', 'l'])
     table.set_cols_valign(['m', 'm', 'm'])
     table.header(["ID", "Name", "Manager Group"])
     for facility in facilities:
         table.add_row([facility.id, facility.name, facility.manager_group])
-    return heading + table.draw() + "\n"
+    return output_table(heading, table, stream)
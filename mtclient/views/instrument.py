@@ -6,6 +6,8 @@ from __future__ import print_function
 import json
 from texttable import Texttable
 
+from .table import new_table, output_table
+
 
 def render_instrument(instrument, render_format):
     """
@@ -54,7 +56,8 @@ def render_instrument_as_table(instrument):
     return instrument_table.draw() + "\n"
 
 
-def render_instruments(instruments, render_format, display_heading=True):
+def render_instruments(instruments, render_format, display_heading=True,
+                       stream=None):
     """
     Render instruments
 
@@ -69,10 +72,12 @@ def render_instruments(instruments, render_format, display_heading=True):
         displaying the table.  This meta information can be used to
         determine whether the query results have been truncated due
         to pagination.
+    :param stream: If supplied, a table is written to stream (one line at
+        a time for large tables) instead of being returned.
     """
     if render_format == 'json':
         return render_instruments_as_json(instruments)
-    return render_instruments_as_table(instruments, display_heading)
+    return render_instruments_as_table(instruments, display_heading, stream)
 
 
 def render_instruments_as_json(instruments, indent=2, sort_keys=True):
@@ -91,7 +96,8 @@ def render_instruments_as_json(instruments, indent=2, sort_keys=True):
         instruments.response_dict, indent=indent, sort_keys=sort_keys)
 
 
-def render_instruments_as_table(instruments, display_heading=True):
+def render_instruments_as_table(instruments, display_heading=True,
+                                stream=None):
     """
     Returns ASCII table view of instruments.
 
@@ -104,6 +110,8 @@ def render_instruments_as_table(instruments, display_heading=True):
         in a 'heading' before displaying the table.  This meta
         information can be used to determine whether the query results
         have been truncated due to pagination.
+    :param stream: If supplied, the table is written to stream (one line
+        at a time for large tables) instead of being returned.
     """
     heading = "\n" \
         "Model: Instrument\n" \
@@ -114,10 +122,10 @@ def render_instruments_as_table(instruments, display_heading=True):
         % (instruments.url, instruments.total_count,
            instruments.limit, instruments.offset) if display_heading else ""
 
-    table = Texttable(max_width=0)
+    table = new_table(len(instruments))
     table.set_cols_align(["r", 'l', 'l'])
     table.set_cols_valign(['m', 'm', 'm'])
     table.header(["ID", "Name", "Facility"])
     for instrument in instruments:
         table.add_row([instrument.id, instrument.name, instrument.facility])
-    return heading + table.draw() + "\n"
+    return output_table(heading, table, stream)
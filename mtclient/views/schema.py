@@ -6,6 +6,8 @@ from __future__ import print_function
 import json
 from texttable import Texttable
 
+from .table import new_table, output_table
+
 
 def render_schema(schema, render_format):
     """
@@ -84,7 +86,8 @@ def render_schema_as_table(schema):
     return schema_parameter_names
 
 
-def render_schemas(schemas, render_format, display_heading=True):
+def render_schemas(schemas, render_format, display_heading=True,
+                   stream=None):
     """
     Render schemas
 
@@ -99,10 +102,12 @@ def render_schemas(schemas, render_format, display_heading=True):
         displaying the table.  This meta information can be used to
         determine whether the query results have been truncated due
         to pagination.
+    :param stream: If supplied, a table is written to stream (one line at
+        a time for large tables) instead of being returned.
     """
     if render_format == 'json':
         return render_schemas_as_json(schemas)
-    return render_schemas_as_table(schemas, display_heading)
+    return render_schemas_as_table(schemas, display_heading, stream)
 
 
 def render_schemas_as_json(schemas, indent=2, sort_keys=True):
@@ -121,7 +126,8 @@ def render_schemas_as_json(schemas, indent=2, sort_keys=True):
         schemas.response_dict, indent=indent, sort_keys=sort_keys)
 
 
-def render_schemas_as_table(schemas, display_heading=True):
+def render_schemas_as_table(schemas, display_heading=True,
+                            stream=None):
     """
     Returns ASCII table view of schemas.
 
@@ -134,6 +140,8 @@ def render_schemas_as_table(schemas, display_heading=True):
         in a 'heading' before displaying the table.  This meta
         information can be used to determine whether the query results
         have been truncated due to pagination.
+    :param stream: If supplied, the table is written to stream (one line
+        at a time for large tables) instead of being returned.
     """
     heading = "\n" \
         "Model: Schema\n" \
@@ -144,7 +152,7 @@ def render_schemas_as_table(schemas, display_heading=True):
         % (schemas.url, schemas.total_count,
            schemas.limit, schemas.offset) if display_heading else ""
 
-    table = Texttable(max_width=0)
+    table = new_table(len(schemas))
     table.set_cols_align(["r", 'l', 'l', 'l', 'l', 'l', 'l'])
     table.set_cols_valign(['m', 'm', 'm', 'm', 'm', 'm', 'm'])
     table.header(["ID", "Name", "Namespace", "Type", "Subtype", "Immutable",
@@ -153,4 +161,4 @@ def render_schemas_as_table(schemas, display_heading=True):
         table.add_row([schema.id, schema.name, schema.namespace,
                        schema.type, schema.subtype or '',
                        str(bool(schema.immutable)), str(bool(schema.hidden))])
-    return heading + table.draw() + "\n"
+    return output_table(heading, table, stream)
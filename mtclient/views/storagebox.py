@@ -6,6 +6,8 @@ from __future__ import print_function
 import json
 from texttable import Texttable
 
+from .table import new_table, output_table
+
 
 def render_storage_box(storage_box, render_format):
     """
@@ -76,7 +78,8 @@ def render_storage_box_as_table(storage_box):
     return storage_box_options_attributes
 
 
-def render_storage_boxes(storage_boxes, render_format, display_heading=True):
+def render_storage_boxes(storage_boxes, render_format, display_heading=True,
+                         stream=None):
     """
     Render storage boxes.
 
@@ -91,10 +94,13 @@ def render_storage_boxes(storage_boxes, render_format, display_heading=True):
         displaying the table.  This meta information can be used to
         determine whether the query results have been truncated due
         to pagination.
+    :param stream: If supplied, a table is written to stream (one line at
+        a time for large tables) instead of being returned.
     """
     if render_format == 'json':
         return render_storage_boxes_as_json(storage_boxes)
-    return render_storage_boxes_as_table(storage_boxes, display_heading)
+    return render_storage_boxes_as_table(storage_boxes, display_heading,
+                                         stream)
 
 
 def render_storage_boxes_as_json(storage_boxes, indent=2, sort_keys=True):
@@ -113,7 +119,8 @@ def render_storage_boxes_as_json(storage_boxes, indent=2, sort_keys=True):
         storage_boxes.response_dict, indent=indent, sort_keys=sort_keys)
 
 
-def render_storage_boxes_as_table(storage_boxes, display_heading=True):
+def render_storage_boxes_as_table(storage_boxes, display_heading=True,
+                                  stream=None):
     """
     Returns ASCII table view of storage_boxes.
 
@@ -126,6 +133,8 @@ def render_storage_boxes_as_table(storage_boxes, display_heading=True):
         in a 'heading' before displaying the table.  This meta
         information can be used to determine whether the query results
         have been truncated due to pagination.
+    :param stream: If supplied, the table is written to stream (one line
+        at a time for large tables) instead of being returned.
     """
     heading = "\n" \
         "Model: StorageBox\n" \
@@ -137,11 +146,11 @@ def render_storage_boxes_as_table(storage_boxes, display_heading=True):
            storage_boxes.limit,
            storage_boxes.offset) if display_heading else ""
 
-    table = Texttable(max_width=0)
+    table = new_table(len(storage_boxes))
     table.set_cols_align(["r", 'l', 'l'])
     table.set_cols_valign(['m', 'm', 'm'])
     table.header(["ID", "Name", "Description"])
     for storage_box in storage_boxes:
         table.add_row([storage_box.id, storage_box.name,
                        storage_box.description])
-    return heading + table.draw() + "\n"
+    return output_table(heading, table, stream)
@@ -0,0 +1,118 @@
+"""
+Streaming views for large listings.
+
+Rather than building the whole output in memory before printing it,
+these views write one record per line as each page of results arrives,
+so the first records are displayed immediately and memory use doesn't
+grow with the number of records.
+"""
+from __future__ import print_function
+
+import csv
+import json
+import logging
+import sys
+
+from ..utils.jsoncodec import dumps
+
+logger = logging.getLogger(__name__)  # pylint: disable=invalid-name
+
+#: The formats which write one record per line.
+STREAM_FORMATS = ('ndjson', 'csv')
+
+
+def csv_value(value):
+    """
+    Convert a field of an API response to a CSV value.  Nested objects
+    and lists are written as JSON.
+    """
+    if value is None:
+        return ""
+    if isinstance(value, (dict, list)):
+        return dumps(value, sort_keys=True)
+    return value
+
+
+def render_ndjson(records, stream):
+    """
+    Write each record as a line of compact JSON.
+    """
+    for record in records:
+        stream.write(dumps(record, sort_keys=True))
+        stream.write("\n")
+
+
+def render_csv(records, stream):
+    """
+    Write a CSV header (from the first record's fields) followed by a line
+    for each record.
+
+    The header is written before the rest of the records have been
+    retrieved, so it can't include fields which only appear in later
+    records.  Those fields are left out (with a warning), and fields
+    missing from later records are left empty.  Use the ndjson format to
+    keep every field.
+    """
+    writer = None
+    dropped_fields = set()
+    for record in records:
+        if not writer:
+            writer = csv.DictWriter(stream, sorted(record.keys()),
+                                    extrasaction='ignore',
+                                    lineterminator='\n')
+            writer.writeheader()
+        new_fields = set(record) - set(writer.fieldnames) - dropped_fields
+        if new_fields:
+            logger.warning(
+                "Leaving out fields which weren't in the first record "
+                "(use --format ndjson to include them): %s",
+                ", ".join(sorted(new_fields)))
+            dropped_fields.update(new_fields)
+        writer.writerow(dict((field, csv_value(value))
+                             for field, value in record.items()))
+
+
+def render_json_array(records, stream):
+    """
+    Write the records as a JSON array, one record at a time.
+    """
+    stream.write("[")
+    separator = "\n"
+    for record in records:
+        stream.write(separator)
+        stream.write(json.dumps(record, indent=2, sort_keys=True))
+        separator = ",\n"
+    stream.write("\n]\n")
+
+
+def page_records(pages, stream=None):
+    """
+    Yield the records (API response dictionaries) from each page of
+    results, flushing the output stream (if supplied) after each page, so
+    that the page's records are displayed before the next page is
+    requested.
+
+    :param pages: An iterable of :class:`mtclient.models.resultset.ResultSet`
+        (or :class:`mtclient.models.resultset.StreamingResultSet`) pages.
+    """
+    for page in pages:
+        for record in page.records():
+            yield record
+        if stream:
+            stream.flush()
+
+
+def render_pages(pages, render_format, stream=None):
+    """
+    Render the records from each page of results, as they arrive.
+
+    :param pages: An iterable of :class:`mtclient.models.resultset.ResultSet`
+        pages, e.g. from :func:`mtclient.models.queryset.QuerySet.pages`.
+    :param render_format: 'ndjson', 'csv' or 'json'.
+    :param stream: The stream to write to.  Default: sys.stdout.
+    """
+    stream = stream or sys.stdout
+    renderers = dict(ndjson=render_ndjson, csv=render_csv,
+                     json=render_json_array)
+    renderers[render_format](page_records(pages, stream), stream)
+    stream.flush()
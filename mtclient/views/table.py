@@ -0,0 +1,202 @@
+"""
+Fast ASCII tables for large result sets.
+
+Texttable measures, formats and wraps every cell, and builds the whole
+table as one string, which becomes very slow above a few thousand rows.
+:class:`FastTable` draws tables in the same style as
+``Texttable(max_width=0)``, but treats every cell as text (without
+Texttable's number formatting or wrapping), and can yield the table one
+line at a time.  :func:`new_table` chooses between them depending on the
+number of rows, so small tables are still drawn by Texttable, and large
+tables' column widths are computed from a bounded sample of their rows.
+:func:`output_table` writes a large table to a stream one line at a time,
+rather than building the whole table as one string.
+"""
+import itertools
+
+import six
+from texttable import Texttable
+
+#: Tables with more rows than this are drawn with :class:`FastTable`.
+FAST_TABLE_THRESHOLD = 1000
+
+#: The number of rows :class:`FastTable` tables created by
+#: :func:`new_table` compute their column widths from.
+SAMPLE_SIZE = 1000
+
+
+def new_table(num_rows, threshold=FAST_TABLE_THRESHOLD,
+              sample_size=SAMPLE_SIZE):
+    """
+    Return a ``Texttable(max_width=0)`` for a table with up to threshold
+    rows, or a :class:`FastTable` (with column widths computed from its
+    first sample_size rows) for a larger table.
+    """
+    if num_rows > threshold:
+        return FastTable(sample_size=sample_size)
+    return Texttable(max_width=0)
+
+
+def output_table(heading, table, stream=None):
+    """
+    Return heading followed by the drawn table, or if stream is supplied,
+    write them to stream (a :class:`FastTable` one line at a time) and
+    return None.
+    """
+    if stream is None:
+        return heading + table.draw() + "\n"
+    stream.write(heading)
+    if isinstance(table, FastTable):
+        lines = table.draw_lines()
+    else:
+        lines = [table.draw()]
+    for line in lines:
+        stream.write(line)
+        stream.write("\n")
+    return None
+
+
+class FastTable(object):
+    """
+    Draws ASCII tables in the same style as ``Texttable(max_width=0)``,
+    supporting the subset of Texttable's API used by the views.
+
+    :param sample_size: Compute the column widths from the header and the
+        first sample_size rows, instead of from every row, so that the
+        first lines can be drawn before the remaining rows are measured.
+        Cells wider than their column then extend beyond it.
+    """
+    def __init__(self, sample_size=None):
+        self.sample_size = sample_size
+        self._header = None
+        self._rows = []
+        self._align = None
+        self._valign = None
+
+    def set_cols_align(self, array):
+        """
+        Set each column's horizontal alignment ('l', 'c' or 'r').
+        """
+        self._align = array
+
+    def set_cols_valign(self, array):
+        """
+        Set each column's vertical alignment ('t', 'm' or 'b').
+        """
+        self._valign = array
+
+    def header(self, array):
+        """
+        Set the header row.
+        """
+        self._header = [self._split(cell) for cell in array]
+
+    def add_row(self, array):
+        """
+        Add a row.
+        """
+        self._rows.append([self._split(cell) for cell in array])
+
+    def add_rows(self, rows, header=True):
+        """
+        Add several rows, the first of which is the header by default.
+        """
+        rows = iter(rows)
+        if header:
+            self.header(next(rows))
+        for row in rows:
+            self.add_row(row)
+
+    @staticmethod
+    def _split(cell):
+        """
+        Split a cell into lines.
+        """
+        text = six.text_type(cell)
+        if '\n' not in text:
+            return [text if text.strip() else ""]
+        return [line if line.strip() else "" for line in text.split('\n')]
+
+    def _widths(self):
+        """
+        Compute each column's width from the header and the sampled rows.
+        """
+        rows = self._rows
+        if self.sample_size is not None:
+            rows = itertools.islice(rows, self.sample_size)
+        if self._header:
+            rows = itertools.chain([self._header], rows)
+        widths = []
+        for row in rows:
+            for index, cell in enumerate(row):
+                width = max(len(line) for line in cell)
+                if index < len(widths):
+                    if width > widths[index]:
+                        widths[index] = width
+                else:
+                    widths.append(width)
+        return widths
+
+    @staticmethod
+    def _pad(line, width, align):
+        """
+        Pad a line to the column's width.
+        """
+        if align == 'r':
+            return line.rjust(width)
+        if align == 'c':
+            left = (width - len(line)) // 2
+            return " " * left + line + " " * (width - len(line) - left)
+        return line.ljust(width)
+
+    def _draw_row(self, row, widths, aligns, valigns):
+        """
+        Yield the lines of a (possibly multi-line) row.
+        """
+        height = max(len(cell) for cell in row)
+        if height == 1:
+            yield "| %s |" % " | ".join(
+                self._pad(cell[0], width, align)
+                for cell, width, align in zip(row, widths, aligns))
+            return
+        columns = []
+        for cell, width, align, valign in zip(row, widths, aligns, valigns):
+            missing = height - len(cell)
+            if valign == 'm':
+                cell = [""] * (missing // 2) + cell + \
+                    [""] * (missing - missing // 2)
+            elif valign == 'b':
+                cell = [""] * missing + cell
+            else:
+                cell = cell + [""] * missing
+            columns.append([self._pad(line, width, align) for line in cell])
+        for index in range(height):
+            yield "| %s |" % " | ".join(column[index] for column in columns)
+
+    def draw_lines(self):
+        """
+        Yield the table one line at a time (without line endings).
+        """
+        widths = self._widths()
+        num_cols = len(widths)
+        aligns = self._align or ['l'] * num_cols
+        valigns = self._valign or ['t'] * num_cols
+        hline = "+-%s-+" % "-+-".join("-" * width for width in widths)
+        yield hline
+        if self._header:
+            for line in self._draw_row(self._header, widths,
+                                       ['c'] * num_cols, ['t'] * num_cols):
+                yield line
+            yield hline.replace('-', '=')
+        for row in self._rows:
+            for line in self._draw_row(row, widths, aligns, valigns):
+                yield line
+            yield hline
+
+    def draw(self):
+        """
+        Return the table as a string.
+        """
+        if not self._header and not self._rows:
+            return None
+        return "\n".join(self.draw_lines())
@@ -21,10 +21,11 @@ def test_invalid_model_argparse(capfd):
     assert err.value.code == 2
 
     expected = textwrap.dedent("""
-         usage: mytardis [-h] [--verbose] [--version]
-                         {api,config,version,facility,instrument,experiment,dataset,datafile,storagebox,schema}
+         usage: mytardis [-h] [--verbose] [--version] [--stats] [--profile [FILE]]
+                         [--trace FILE]
+                         {api,config,version,batch,serve,facility,instrument,experiment,dataset,datafile,storagebox,schema}
                          ...
-         mytardis: error: argument model: invalid choice: 'invalid_model' (choose from 'api', 'config', 'version', 'facility', 'instrument', 'experiment', 'dataset', 'datafile', 'storagebox', 'schema')
+         mytardis: error: argument model: invalid choice: 'invalid_model' (choose from 'api', 'config', 'version', 'batch', 'serve', 'facility', 'instrument', 'experiment', 'dataset', 'datafile', 'storagebox', 'schema')
     """)
     _, err = capfd.readouterr()
     assert err.strip() == expected.strip()
@@ -0,0 +1,132 @@
+"""
+test_batch_cli.py
+
+Tests for running many commands in a single process with 'mytardis batch'
+"""
+import json
+import os
+import sys
+import tempfile
+
+import pytest
+import requests_mock
+
+import mtclient.client
+from mtclient.conf import config
+from mtclient.controllers.batch import parse_request
+
+
+def test_parse_request():
+    """
+    Test parsing command lines and JSON requests from a batch file
+    """
+    assert parse_request("  \n") is None
+    assert parse_request("# comment\n") is None
+    assert parse_request("mytardis dataset get 1 --json\n") == \
+        (['dataset', 'get', '1', '--json'], None)
+    assert parse_request('datafile list --filename "my file.txt"') == \
+        (['datafile', 'list', '--filename', 'my file.txt'], None)
+    assert parse_request('{"id": 7, "argv": ["schema", "get", 1]}') == \
+        (['schema', 'get', '1'], 7)
+    assert parse_request('{"command": "facility list"}') == \
+        (['facility', 'list'], None)
+    with pytest.raises(ValueError):
+        parse_request('{"id": 7}')
+
+
+def test_batch_cli(capfd):
+    """
+    Test running a batch of commands, reusing cached schemas between
+    commands, and reporting errors without stopping the batch
+    """
+    mock_schema = {
+        "hidden": False,
+        "id": 1,
+        "immutable": False,
+        "name": "Test Schema",
+        "namespace": "http://example.com/schema",
+        "resource_uri": "/api/v1/schema/1/",
+        "subtype": "",
+        "type": 1
+    }
+    with tempfile.NamedTemporaryFile(mode='w', suffix='.txt',
+                                     delete=False) as batch_file:
+        batch_file.write("schema get 1 --json\n")
+        batch_file.write("\n")
+        batch_file.write('{"id": "second", "argv": ["schema", "get", "1", '
+                         '"--json"]}\n')
+        batch_file.write("schema invalid_command\n")
+        batch_file.write("config\n")
+        batch_file.write("version\n")
+
+    with requests_mock.Mocker() as mocker:
+        get_schema_url = "%s/api/v1/schema/1/?format=json" % config.url
+        mocker.get(get_schema_url, text=json.dumps(mock_schema))
+        sys_argv = sys.argv
+        sys.argv = ['mytardis', 'batch', batch_file.name]
+        with pytest.raises(SystemExit) as err:
+            mtclient.client.run()
+        sys.argv = sys_argv
+        assert err.value.code == 1
+        # The second "schema get" used the cached schema:
+        assert mocker.call_count == 1
+
+    out, _ = capfd.readouterr()
+    results = [json.loads(line) for line in out.splitlines()]
+    assert [result['line'] for result in results] == [1, 3, 4, 5, 6]
+    assert [result['status'] for result in results] == \
+        ['ok', 'ok', 'error', 'error', 'ok']
+    assert results[0]['result'] == mock_schema
+    assert results[1]['result'] == mock_schema
+    assert results[1]['id'] == "second"
+    assert "invalid choice: 'invalid_command'" in results[2]['error']
+    assert "can't be run in a batch" in results[3]['error']
+    assert results[4]['output'].startswith("MyTardis Client v")
+
+    os.remove(batch_file.name)
+
+
+def test_batch_cli_stdin_non_interactive(capfd, monkeypatch):
+    """
+    Test that commands read from stdin don't prompt for confirmation
+    (which would consume the following commands), and that options which
+    apply to the whole process are rejected for commands in a batch
+    """
+    from six import StringIO
+
+    mock_dataset = {
+        "description": "dataset1",
+        "experiments": ["/api/v1/experiment/1/"],
+        "id": 1,
+        "instrument": None,
+        "parameter_sets": [],
+        "resource_uri": "/api/v1/dataset/1/"
+    }
+    tmpdir = tempfile.mkdtemp()
+    monkeypatch.chdir(tmpdir)
+    os.makedirs("dataset1")
+    monkeypatch.setattr(sys, 'stdin', StringIO(
+        "dataset download 1\n"
+        "y\n"
+        "--stats version\n"))
+
+    with requests_mock.Mocker() as mocker:
+        get_dataset_url = "%s/api/v1/dataset/1/?format=json" % config.url
+        mocker.get(get_dataset_url, text=json.dumps(mock_dataset))
+        sys_argv = sys.argv
+        sys.argv = ['mytardis', 'batch', '-']
+        with pytest.raises(SystemExit) as err:
+            mtclient.client.run()
+        sys.argv = sys_argv
+        assert err.value.code == 1
+
+    out, _ = capfd.readouterr()
+    results = [json.loads(line) for line in out.splitlines()]
+    assert [result['line'] for result in results] == [1, 2, 3]
+    assert [result['status'] for result in results] == \
+        ['error', 'error', 'error']
+    assert "Overwrite 'dataset1/'?" in results[0]['error']
+    assert "invalid choice: 'y'" in results[1]['error']
+    assert "--stats option can't be used in a batch" in results[2]['error']
+    os.rmdir(os.path.join(tmpdir, "dataset1"))
+    os.rmdir(tmpdir)
@@ -14,6 +14,7 @@ import requests_mock
 import mtclient.client
 from mtclient.conf import config
 from mtclient.controllers.datafile import DataFileController
+from mtclient.models.datafile import DataFile
 
 
 def test_datafile_list_cli_json(capfd):
@@ -82,6 +83,90 @@ def test_datafile_list_cli_json(capfd):
         sys.argv = sys_argv
 
 
+def test_datafile_list_cli_all_ndjson_csv(capfd, monkeypatch):
+    """
+    Test listing every page of datafiles, one record per line
+    in NDJSON and CSV formats
+    """
+    # Wrap DataFile.list (as a decorator would), recording whether each
+    # page was streamed:
+    streamed = []
+    unwrapped_list = DataFile.list
+
+    def recording_list(*args, **kwargs):
+        """
+        Record the stream argument, and call DataFile.list
+        """
+        streamed.append(kwargs.get('stream', False))
+        return unwrapped_list(*args, **kwargs)
+
+    monkeypatch.setattr(DataFile, 'list', staticmethod(recording_list))
+
+    def mock_page(offset):
+        """
+        A page containing a single datafile
+        """
+        return {
+            "meta": {
+                "limit": 1,
+                "next": "/api/v1/dataset_file/?limit=1&offset=1"
+                        if offset == 0 else None,
+                "offset": offset,
+                "previous": None,
+                "total_count": 2
+            },
+            "objects": [
+                {
+                    "id": offset + 1,
+                    "dataset": "/api/v1/dataset/1/",
+                    "directory": "",
+                    "filename": "testfile%s.txt" % (offset + 1),
+                    "md5sum": "bogus",
+                    "replicas": [],
+                    "resource_uri": "/api/v1/dataset_file/%s/" % (offset + 1),
+                    "size": 32
+                }
+            ]
+        }
+    with requests_mock.Mocker() as mocker:
+        datafile_list_url = \
+            "%s/api/v1/dataset_file/?format=json&dataset__id=1&limit=1" \
+            % config.url
+        mocker.get(datafile_list_url, text=json.dumps(mock_page(0)),
+                   complete_qs=True)
+        mocker.get(datafile_list_url + "&offset=1",
+                   text=json.dumps(mock_page(1)), complete_qs=True)
+
+        sys_argv = sys.argv
+        sys.argv = ['mytardis', 'datafile', 'list', '--dataset', '1',
+                    '--limit', '1', '--all', '--format', 'ndjson']
+        mtclient.client.run()
+        out, _ = capfd.readouterr()
+        assert [json.loads(line) for line in out.splitlines()] == \
+            mock_page(0)['objects'] + mock_page(1)['objects']
+        assert streamed == [True, True]
+
+        sys.argv = ['mytardis', 'datafile', 'list', '--dataset', '1',
+                    '--limit', '1', '--all', '--format', 'csv']
+        mtclient.client.run()
+        out, _ = capfd.readouterr()
+        assert out.splitlines() == [
+            "dataset,directory,filename,id,md5sum,replicas,resource_uri,size",
+            "/api/v1/dataset/1/,,testfile1.txt,1,bogus,[],"
+            "/api/v1/dataset_file/1/,32",
+            "/api/v1/dataset/1/,,testfile2.txt,2,bogus,[],"
+            "/api/v1/dataset_file/2/,32"]
+
+        # Without --all, only the first page is displayed:
+        sys.argv = ['mytardis', 'datafile', 'list', '--dataset', '1',
+                    '--limit', '1', '--format', 'ndjson']
+        mtclient.client.run()
+        out, _ = capfd.readouterr()
+        assert [json.loads(line) for line in out.splitlines()] == \
+            mock_page(0)['objects']
+        sys.argv = sys_argv
+
+
 def test_datafile_list_cli_table(capfd):
     """
     Test listing datafile records, requesting output in ASCII table format
@@ -313,3 +398,54 @@ def test_datafile_get_cli_table(capfd):
         out, _ = capfd.readouterr()
         assert out.strip() == expected.strip()
         sys.argv = sys_argv
+
+
+def test_datafile_create_cli_digest_validation(capfd):
+    """
+    Test that unsupported --digest algorithms are rejected before any
+    files are read, and that --digest is rejected when creating a record
+    for a single file, because its checksums couldn't be recorded
+    """
+    import tempfile
+
+    import pytest
+
+    from mtclient.argparser import ArgParser
+
+    for algorithm in ("bogus", "shake_128"):
+        with pytest.raises(SystemExit) as err:
+            ArgParser().get_args(
+                ['datafile', 'create', '--digest', algorithm, '1', '.'])
+        assert err.value.code == 2
+        _, err_output = capfd.readouterr()
+        assert algorithm in err_output
+
+    with tempfile.NamedTemporaryFile() as datafile:
+        args = ArgParser().get_args(
+            ['datafile', 'create', '--digest', 'sha512', '1', datafile.name])
+        assert args.digests == ['sha512']
+        with pytest.raises(Exception) as err:
+            DataFileController().create(args, 'table')
+        assert "--digest requires a directory path" in str(err.value)
+
+
+def test_datafile_cli_drop_page_cache_restored(monkeypatch):
+    """
+    Test that --drop-page-cache only applies to the command it was given
+    for, so later commands in the same process (e.g. in a batch) don't
+    inherit it
+    """
+    from mtclient.argparser import ArgParser
+
+    drop_page_cache = []
+    monkeypatch.setattr(
+        DataFileController, 'upload',
+        lambda self, args, render_format:
+        drop_page_cache.append(config.drop_page_cache))
+    monkeypatch.setattr(config, 'drop_page_cache', False)
+
+    args = ArgParser().get_args(
+        ['datafile', 'upload', '--drop-page-cache', '1', 'file1.txt'])
+    DataFileController().run_command(args)
+    assert drop_page_cache == [True]
+    assert config.drop_page_cache is False
@@ -0,0 +1,119 @@
+"""
+test_serve_cli.py
+
+Tests for forwarding commands to a 'mytardis serve' daemon
+"""
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from argparse import Namespace
+
+import requests_mock
+
+import mtclient.client
+from mtclient.conf import config
+from mtclient.controllers.serve import ServeController
+from mtclient.utils.daemon import (
+    config_identity, forward_command, should_forward)
+
+
+def test_serve_cli(capfd, monkeypatch):
+    """
+    Test forwarding get commands to a daemon, which caches schemas
+    between commands, and falling back to running commands locally
+    if the daemon isn't running
+    """
+    mock_schema = {
+        "hidden": False,
+        "id": 1,
+        "immutable": False,
+        "name": "Test Schema",
+        "namespace": "http://example.com/schema",
+        "resource_uri": "/api/v1/schema/1/",
+        "subtype": "",
+        "type": 1
+    }
+    tmpdir = tempfile.mkdtemp()
+    socket_path = os.path.join(tmpdir, "mytardisclient.sock")
+    monkeypatch.setenv("MYTARDISCLIENT_SOCKET", socket_path)
+    sys_argv = sys.argv
+
+    with requests_mock.Mocker() as mocker:
+        get_schema_url = "%s/api/v1/schema/1/?format=json" % config.url
+        mocker.get(get_schema_url, text=json.dumps(mock_schema))
+
+        serve_controller = ServeController()
+        daemon = threading.Thread(
+            target=serve_controller.run_command,
+            args=(Namespace(model='serve', socket=socket_path),))
+        daemon.start()
+        while not serve_controller.server:
+            time.sleep(0.01)
+        capfd.readouterr()
+
+        for _ in range(2):
+            sys.argv = ['mytardis', 'schema', 'get', '1', '--json']
+            mtclient.client.run()
+            out, _ = capfd.readouterr()
+            assert json.loads(out) == mock_schema
+        # The second command used the daemon's cached schema:
+        assert mocker.call_count == 1
+
+        # The daemon refuses to run commands for a client with a
+        # different config, which then runs them locally:
+        identity = config_identity(config)
+        identity['username'] = "otheruser"
+        assert forward_command(['schema', 'get', '1', '--json'],
+                               socket_path, identity) is None
+        monkeypatch.setenv("MYTARDISCLIENT_USERNAME", "otheruser")
+        sys.argv = ['mytardis', 'schema', 'get', '1', '--json']
+        mtclient.client.run()
+        out, _ = capfd.readouterr()
+        assert json.loads(out) == mock_schema
+        monkeypatch.setenv("MYTARDISCLIENT_USERNAME", config.username)
+
+        serve_controller.server.shutdown()
+        daemon.join()
+        assert not os.path.exists(socket_path)
+
+        # Simulate a stale socket left behind by a daemon which crashed:
+        with open(socket_path, 'w'):
+            pass
+        sys.argv = ['mytardis', 'schema', 'get', '1', '--json']
+        mtclient.client.run()
+        out, _ = capfd.readouterr()
+        assert json.loads(out) == mock_schema
+        assert mocker.call_count == 2
+
+    sys.argv = sys_argv
+    shutil.rmtree(tmpdir)
+
+
+def test_serve_cli_not_forwarded(tmpdir):
+    """
+    Test that commands whose output is streamed aren't forwarded, and
+    that a daemon which doesn't respond in time is treated as unreachable
+    """
+    import socket
+
+    socket_path = str(tmpdir.join("mytardisclient.sock"))
+    listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    listener.bind(socket_path)
+    listener.listen(1)
+    try:
+        assert should_forward(['datafile', 'list'], socket_path)
+        for argv in (['datafile', 'list', '--all'],
+                     ['datafile', 'list', '--format', 'csv'],
+                     ['datafile', 'list', '--format=ndjson'],
+                     ['datafile', 'list', '--al']):
+            assert not should_forward(argv, socket_path)
+        # The listener accepts connections, but never responds:
+        assert forward_command(['datafile', 'list'], socket_path,
+                               config_identity(config),
+                               result_timeout=0.1) is None
+    finally:
+        listener.close()
@@ -0,0 +1,75 @@
+"""
+test_startup_cli.py
+
+Tests for keeping the command-line interface's startup fast, by only
+importing the modules needed for the requested command, and by not
+writing to the filesystem until necessary
+"""
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import textwrap
+
+HEAVY_MODULES = ['requests', 'texttable', 'mtclient.views.datafile',
+                 'mtclient.controllers.datafile', 'mtclient.models.datafile']
+
+
+def run_python(code, home):
+    """
+    Run some Python code in a new interpreter with HOME set to home,
+    returning its standard output
+    """
+    env = dict(os.environ, HOME=home)
+    for key in ("MYTARDISCLIENT_URL", "MYTARDISCLIENT_USERNAME",
+                "MYTARDISCLIENT_APIKEY"):
+        env.pop(key, None)
+    return subprocess.check_output(
+        [sys.executable, "-c", textwrap.dedent(code)], env=env,
+        cwd=os.path.dirname(os.path.dirname(os.path.dirname(
+            os.path.abspath(__file__))))).decode('utf-8')
+
+
+def test_lazy_imports():
+    """
+    Test that importing the client (and running "mytardis version")
+    doesn't import requests, texttable or any controller, model or view
+    """
+    home = tempfile.mkdtemp()
+    output = run_python("""
+        import json
+        import sys
+        import mtclient.client
+        sys.argv = ['mytardis', 'version']
+        try:
+            mtclient.client.run()
+        except SystemExit:
+            pass
+        print(json.dumps([module for module in %s if module in sys.modules]))
+        """ % HEAVY_MODULES, home)
+    version_line, imported = output.strip().splitlines()
+    assert version_line.startswith("MyTardis Client v")
+    assert json.loads(imported) == []
+
+    # Constructing the Config singleton shouldn't have written anything:
+    assert os.listdir(home) == []
+    shutil.rmtree(home)
+
+
+def test_ensure_logging_config():
+    """
+    Test that the logging config is written when it is needed
+    """
+    home = tempfile.mkdtemp()
+    output = run_python("""
+        from mtclient.conf import config
+        print(config.ensure_logging_config())
+        """, home)
+    logging_config_path = output.strip()
+    assert logging_config_path == os.path.join(
+        home, ".config", "mytardisclient", "logging.cfg")
+    with open(logging_config_path) as logging_config:
+        assert "[loggers]" in logging_config.read()
+    shutil.rmtree(home)
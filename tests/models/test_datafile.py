@@ -58,6 +58,79 @@ def test_datafile_list():
         datafiles = DataFile.list(filters="dataset__id=1")
         assert datafiles.response_dict == mock_datafile_list
 
+        streamed_datafiles = DataFile.list(filters="dataset__id=1",
+                                           stream=True)
+        assert streamed_datafiles.total_count == 1
+        assert streamed_datafiles.next is None
+        assert [datafile.filename for datafile in streamed_datafiles] == \
+            ["testfile1.txt"]
+
+
+def test_datafile_list_stream_closed(monkeypatch):
+    """
+    Test that each streamed page's response is closed before the next page
+    is requested, and when the pages are abandoned, even if not all of
+    their records have been read
+    """
+    from mtclient.models.queryset import QuerySet
+    from mtclient.models.resultset import StreamingResultSet
+
+    closed = []
+    unwrapped_close = StreamingResultSet.close
+
+    def recording_close(self):
+        """
+        Record the offset of each page which is closed
+        """
+        if not self.closed:
+            closed.append(self.offset)
+        unwrapped_close(self)
+
+    monkeypatch.setattr(StreamingResultSet, 'close', recording_close)
+
+    def mock_page(offset):
+        """
+        A page containing two datafiles
+        """
+        return {
+            "meta": {
+                "limit": 2,
+                "next": "/api/v1/dataset_file/?limit=2&offset=%s"
+                        % (offset + 2) if offset < 4 else None,
+                "offset": offset,
+                "previous": None,
+                "total_count": 6
+            },
+            "objects": [
+                {"id": offset + 1, "filename": "file%s.txt" % (offset + 1)},
+                {"id": offset + 2, "filename": "file%s.txt" % (offset + 2)}
+            ]
+        }
+    with requests_mock.Mocker() as mocker:
+        list_datafiles_url = \
+            "%s/api/v1/dataset_file/?format=json&limit=2" % config.url
+        for offset in (0, 2, 4):
+            url = list_datafiles_url
+            if offset:
+                url += "&offset=%s" % offset
+            mocker.get(url, text=json.dumps(mock_page(offset)),
+                       complete_qs=True)
+
+        pages = QuerySet(DataFile, limit=2, stream=True).pages()
+        records = next(pages).records()
+        assert next(records)['id'] == 1
+        assert closed == []
+        records = next(pages).records()
+        assert closed == [0]
+        assert next(records)['id'] == 3
+        pages.close()
+        assert closed == [0, 2]
+        assert mocker.call_count == 2
+
+        with DataFile.list(limit=2, stream=True) as result_set:
+            assert result_set.total_count == 6
+        assert closed == [0, 2, 0]
+
 
 def test_datafile_get():
     """
@@ -101,6 +174,44 @@ def test_datafile_get():
                 "at this stage.")
 
 
+def test_datafile_without_response_dict():
+    """
+    Test rebuilding a datafile's response_dict from its fields, when the
+    deserialized response isn't kept
+    """
+    mock_datafile = {
+        "id": 1,
+        "created_time": "2016-11-10T13:50:25.258483",
+        "dataset": "/api/v1/dataset/1/",
+        "directory": "subdir",
+        "filename": "testfile1.txt",
+        "md5sum": "bogus",
+        "mimetype": "text/plain",
+        "parameter_sets": [],
+        "replicas": [
+            {
+                "id": 1,
+                "location": "local box at /home/mytardis/var/local",
+                "uri": "subdir/testfile1.txt",
+                "verified": True
+            }
+        ],
+        "resource_uri": "/api/v1/dataset_file/1/",
+        "size": 32,
+    }
+    config.keep_response_dicts = False
+    try:
+        datafile = DataFile(mock_datafile)
+    finally:
+        config.keep_response_dicts = True
+    assert not hasattr(datafile, '__dict__')
+    expected = dict(mock_datafile)
+    del expected['created_time']
+    del expected['mimetype']
+    assert datafile.response_dict == expected
+    assert DataFile(mock_datafile).response_dict is mock_datafile
+
+
 def test_datafile_create():
     """
     Test creating a datafile record
@@ -214,3 +325,296 @@ def test_md5_sum():
         os.remove(tmpfile_name)
     except IOError as err:
         sys.stderr.write("%s\n" % err)
+
+
+def test_datafile_upload_stream():
+    """
+    Test uploading a datafile with a streamed request body, calculating
+    its MD5 sum on the same read pass as the upload
+    """
+    import os
+    import sys
+
+    mock_datafile_list = {
+        "meta": {
+            "limit": 20,
+            "next": None,
+            "offset": 0,
+            "previous": None,
+            "total_count": 0
+        },
+        "objects": [
+        ]
+    }
+    mock_df_list_response = json.dumps(mock_datafile_list)
+    mock_updated_datafile = {
+        "id": 1,
+        "created_time": "2016-11-10T13:50:25.258483",
+        "dataset": "/api/v1/dataset/1/",
+        "directory": "",
+        "filename": "testfile.txt",
+        "md5sum": "746308829575e17c3331bbcb00c0898b",
+        "mimetype": "text/plain",
+        "modification_time": None,
+        "parameter_sets": [
+        ],
+        "replicas": [
+        ],
+        "resource_uri": "/api/v1/dataset_file/1/",
+        "size": 14,
+    }
+    mock_patch_response = json.dumps(mock_updated_datafile)
+
+    tmpdir = tempfile.mkdtemp()
+    file_path = os.path.join(tmpdir, "testfile.txt")
+    with open(file_path, 'w') as tmpfile:
+        tmpfile.write("Hello, world!\n")
+
+    uploaded = {}
+
+    def post_callback(request, context):
+        """
+        Consume the streamed request body, as the real server would.
+        """
+        uploaded['body'] = b"".join(request.body)
+        uploaded['content_length'] = request.headers['Content-Length']
+        context.status_code = 201
+        context.headers['location'] = "/api/v1/dataset_file/1/"
+        return ""
+
+    with requests_mock.Mocker() as mocker:
+        df_list_url = ("%s/api/v1/dataset_file/?format=json"
+                       "&dataset__id=1&filename=testfile.txt" % config.url)
+        mocker.get(df_list_url, text=mock_df_list_response)
+        post_datafile_url = "%s/api/v1/dataset_file/" % config.url
+        mocker.post(post_datafile_url, text=post_callback)
+        patch_datafile_url = "%s/api/v1/dataset_file/1/" % config.url
+        mocker.patch(patch_datafile_url, text=mock_patch_response)
+        DataFile.upload(
+            dataset_id=1, storagebox=None, dataset_path=tmpdir,
+            file_path=file_path, stream=True)
+        assert b"Hello, world!\n" in uploaded['body']
+        assert int(uploaded['content_length']) == len(uploaded['body'])
+        assert json.loads(mocker.last_request.text) == {
+            "md5sum": "746308829575e17c3331bbcb00c0898b"}
+
+    try:
+        os.remove(file_path)
+        os.rmdir(tmpdir)
+    except (IOError, OSError) as err:
+        sys.stderr.write("%s\n" % err)
+
+
+def test_datafile_upload_directory():
+    """
+    Test uploading a directory of datafiles concurrently, and resuming
+    the upload without re-uploading any files
+    """
+    import os
+    import shutil
+
+    mock_datafile_list = {
+        "meta": {
+            "limit": 20,
+            "next": None,
+            "offset": 0,
+            "previous": None,
+            "total_count": 0
+        },
+        "objects": [
+        ]
+    }
+    mock_df_list_response = json.dumps(mock_datafile_list)
+
+    tmpdir = tempfile.mkdtemp()
+    dataset_path = os.path.join(tmpdir, "dataset1")
+    os.makedirs(os.path.join(dataset_path, "subdir"))
+    for relpath in ("file1.txt", "subdir/file2.txt"):
+        with open(os.path.join(dataset_path, relpath), 'w') as datafile:
+            datafile.write("Hello, world!\n")
+    state_path = os.path.join(tmpdir, "upload.state")
+
+    with requests_mock.Mocker() as mocker:
+        df_list_url = "%s/api/v1/dataset_file/?format=json" % config.url
+        mocker.get(df_list_url, text=mock_df_list_response)
+        post_datafile_url = "%s/api/v1/dataset_file/" % config.url
+        mocker.post(post_datafile_url, status_code=201)
+        num_uploaded = DataFile.upload_datafiles(
+            dataset_id=1, storagebox=None, dataset_path=dataset_path,
+            dir_path=dataset_path, jobs=2, state_path=state_path)
+        assert num_uploaded == 2
+        assert mocker.call_count == 4
+
+        num_uploaded = DataFile.upload_datafiles(
+            dataset_id=1, storagebox=None, dataset_path=dataset_path,
+            dir_path=dataset_path, jobs=2, state_path=state_path)
+        assert num_uploaded == 0
+        assert mocker.call_count == 4
+
+    with open(state_path) as state_file:
+        assert sorted(state_file.read().split()) == \
+            ["file1.txt", os.path.join("subdir", "file2.txt")]
+
+    shutil.rmtree(tmpdir)
+
+
+def test_datafile_create_directory_resume(monkeypatch):
+    """
+    Test creating DataFile records for a directory with an ingestion
+    journal, and resuming the ingestion without re-querying MyTardis
+    for files whose records have already been created
+    """
+    import os
+    import shutil
+
+    from mtclient.models import config as config_module
+    from mtclient.utils.journal import IngestionJournal, CREATED
+
+    tmpdir = tempfile.mkdtemp()
+    monkeypatch.setattr(config_module, "DATASETS_PATH_PREFIX",
+                        os.path.join(tmpdir, "servers"))
+    dataset_path = os.path.join(tmpdir, "dataset1")
+    os.makedirs(os.path.join(dataset_path, "subdir"))
+    for relpath in ("file1.txt", "subdir/file2.txt"):
+        with open(os.path.join(dataset_path, relpath), 'w') as datafile:
+            datafile.write("Hello, world!\n")
+    journal_path = os.path.join(tmpdir, "journal.sqlite")
+
+    mock_dataset = {
+        "description": "dataset description",
+        "experiments": ["/api/v1/experiment/1/"],
+        "id": 1,
+        "instrument": None,
+        "parameter_sets": [],
+        "resource_uri": "/api/v1/dataset/1/"
+    }
+    mock_datafile_list = {
+        "meta": {
+            "limit": 20,
+            "next": None,
+            "offset": 0,
+            "previous": None,
+            "total_count": 0
+        },
+        "objects": [
+        ]
+    }
+    with requests_mock.Mocker() as mocker:
+        get_dataset_url = "%s/api/v1/dataset/1/?format=json" % config.url
+        mocker.get(get_dataset_url, text=json.dumps(mock_dataset))
+        df_list_url = "%s/api/v1/dataset_file/?format=json" % config.url
+        mocker.get(df_list_url, text=json.dumps(mock_datafile_list))
+        post_datafile_url = "%s/api/v1/dataset_file/" % config.url
+        mocker.post(post_datafile_url,
+                    headers=dict(location="/api/v1/dataset_file/1/"))
+        num_created = DataFile.create_datafiles(
+            dataset_id=1, storagebox="local box",
+            dataset_path=dataset_path, dir_path=dataset_path,
+            journal_path=journal_path, digests=['sha1'])
+        assert num_created == 2
+        call_count = mocker.call_count
+
+        with IngestionJournal(journal_path) as journal:
+            assert journal.counts() == {CREATED: 2}
+            entry = journal.get(os.path.join("subdir", "file2.txt"))
+            assert entry.md5sum == "746308829575e17c3331bbcb00c0898b"
+            assert entry.digests == {
+                "sha1": "09fac8dbfd27bd9b4d23a00eb648aa751789536d"}
+            assert entry.datafile_id == 1
+
+        num_created = DataFile.create_datafiles(
+            dataset_id=1, storagebox="local box",
+            dataset_path=dataset_path, dir_path=dataset_path,
+            journal_path=journal_path, resume=True)
+        assert num_created == 0
+        assert mocker.call_count == call_count
+
+        # Resuming with an additional algorithm only calculates the
+        # checksums which haven't been journaled:
+        num_created = DataFile.create_datafiles(
+            dataset_id=1, storagebox="local box",
+            dataset_path=dataset_path, dir_path=dataset_path,
+            journal_path=journal_path, resume=True,
+            digests=['sha1', 'sha256'])
+        assert num_created == 0
+        assert mocker.call_count == call_count
+        with IngestionJournal(journal_path) as journal:
+            assert journal.counts() == {CREATED: 2}
+            entry = journal.get(os.path.join("subdir", "file2.txt"))
+            assert entry.md5sum == "746308829575e17c3331bbcb00c0898b"
+            assert entry.digests == {
+                "sha1": "09fac8dbfd27bd9b4d23a00eb648aa751789536d",
+                "sha256": "d9014c4624844aa5bac314773d6b689a"
+                          "d467fa4e1d1a50a1b8a99d5a95f72ff5"}
+
+    shutil.rmtree(tmpdir)
+
+
+def test_datafile_create_from_manifest(monkeypatch):
+    """
+    Test creating DataFile records from a BagIt manifest, without
+    reading the files to calculate their MD5 sums
+    """
+    import os
+    import shutil
+
+    from mtclient.models import config as config_module
+    from mtclient.models import datafile as datafile_module
+
+    tmpdir = tempfile.mkdtemp()
+    monkeypatch.setattr(config_module, "DATASETS_PATH_PREFIX",
+                        os.path.join(tmpdir, "servers"))
+    dataset_path = os.path.join(tmpdir, "data")
+    os.makedirs(os.path.join(dataset_path, "subdir"))
+    for relpath in ("file1.txt", "subdir/file2.txt"):
+        with open(os.path.join(dataset_path, relpath), 'w') as datafile:
+            datafile.write("Hello, world!\n")
+    manifest_path = os.path.join(tmpdir, "manifest-md5.txt")
+    with open(manifest_path, 'w') as manifest:
+        manifest.write("%s  data/file1.txt\n" % ("a" * 32))
+        manifest.write("%s  data/subdir/file2.txt\n" % ("b" * 32))
+
+    def fail_hashing(*args, **kwargs):
+        raise AssertionError("Files shouldn't be hashed.")
+    monkeypatch.setattr(datafile_module, "md5_sum", fail_hashing)
+
+    mock_dataset = {
+        "description": "dataset description",
+        "experiments": ["/api/v1/experiment/1/"],
+        "id": 1,
+        "instrument": None,
+        "parameter_sets": [],
+        "resource_uri": "/api/v1/dataset/1/"
+    }
+    mock_datafile_list = {
+        "meta": {
+            "limit": 20,
+            "next": None,
+            "offset": 0,
+            "previous": None,
+            "total_count": 0
+        },
+        "objects": [
+        ]
+    }
+    with requests_mock.Mocker() as mocker:
+        get_dataset_url = "%s/api/v1/dataset/1/?format=json" % config.url
+        mocker.get(get_dataset_url, text=json.dumps(mock_dataset))
+        df_list_url = "%s/api/v1/dataset_file/?format=json" % config.url
+        mocker.get(df_list_url, text=json.dumps(mock_datafile_list))
+        post_datafile_url = "%s/api/v1/dataset_file/" % config.url
+        mocker.post(post_datafile_url,
+                    headers=dict(location="/api/v1/dataset_file/1/"))
+        num_created = DataFile.create_datafiles_from_manifest(
+            dataset_id=1, storagebox="local box",
+            dataset_path=dataset_path, manifest_path=manifest_path)
+        assert num_created == 2
+        posted = [json.loads(request.body)
+                  for request in mocker.request_history
+                  if request.method == 'POST']
+        assert [(record['directory'], record['filename'], record['md5sum'],
+                 record['size']) for record in posted] == [
+                     ("", "file1.txt", "a" * 32, "14"),
+                     ("subdir", "file2.txt", "b" * 32, "14")]
+
+    shutil.rmtree(tmpdir)
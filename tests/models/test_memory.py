@@ -0,0 +1,160 @@
+"""
+test_memory.py
+
+Tests for the memory used by model objects, measured with tracemalloc, so
+that increases in the memory used per record fail the tests.  The
+thresholds (in bytes per record, or bytes for a whole iteration) are
+roughly 30% above the measured usage.
+"""
+import logging
+import os
+
+import pytest
+import six
+
+from mtclient.conf import config
+from mtclient.models.datafile import DataFile
+from mtclient.models.dataset import Dataset, DatasetParameterSet
+from mtclient.testing import FakeMyTardis, SyntheticData
+from mtclient.testing.memory import (
+    list_response, measure, queryset_count, queryset_models,
+    resultset_models)
+from mtclient.utils.cache import metadata_cache
+
+NUM_RECORDS = 2000
+
+#: The maximum memory retained by each model object, including its
+#: decoded record, in bytes.
+MAX_BYTES_PER_DATAFILE = 3200
+# Streamed records are decoded one at a time, so their dictionary keys
+# aren't shared between records:
+MAX_BYTES_PER_STREAMED_DATAFILE = 4400
+MAX_BYTES_PER_DATASET = 6100
+MAX_BYTES_PER_PARAMETER_SET = 10400
+
+#: The maximum memory retained by each model object when
+#: config.keep_response_dicts is False, in bytes.
+MAX_BYTES_PER_COMPACT_DATAFILE = 1000
+MAX_BYTES_PER_COMPACT_DATASET = 1400
+MAX_BYTES_PER_COMPACT_PARAMETER_SET = 4800
+
+#: The maximum peak memory used while iterating over a QuerySet without
+#: retaining its model objects (which should depend on the page size, not
+#: the number of records), in bytes.
+MAX_ITERATION_PEAK = 250000
+
+pytestmark = [  # pylint: disable=invalid-name
+    pytest.mark.skipif(six.PY2, reason="tracemalloc requires Python 3."),
+    pytest.mark.skipif(not hasattr(os, 'fork'),
+                       reason="The fake server is run in a fork.")]
+
+
+@pytest.fixture(scope='module')
+def synthetic_data():
+    """
+    NUM_RECORDS datafiles in one dataset, and NUM_RECORDS datasets, each
+    with a parameter set
+    """
+    data = SyntheticData().generate(datasets_per_experiment=NUM_RECORDS,
+                                    datafiles_per_dataset=0)
+    dataset = data.get('dataset', 1)
+    storage_box = data.get('storagebox', 1)
+    for index in range(NUM_RECORDS):
+        data.add_datafile(dataset, "file%07d.dat" % index, index,
+                          storage_box=storage_box)
+    return data
+
+
+@pytest.fixture(scope='module')
+def server(synthetic_data):  # pylint: disable=redefined-outer-name
+    """
+    Serve the synthetic data from a fake MyTardis server in a child
+    process, so that its allocations aren't measured
+    """
+    # Running the CLI in other tests can leave DEBUG logging enabled, and
+    # pytest retains the captured log records of each request:
+    root_logger = logging.getLogger()
+    saved_level = root_logger.level
+    root_logger.setLevel(logging.WARNING)
+    saved_url = config.url
+    fake_mytardis = FakeMyTardis(synthetic_data).start(process=True)
+    config.url = fake_mytardis.url
+    yield fake_mytardis
+    config.url = saved_url
+    root_logger.setLevel(saved_level)
+    fake_mytardis.stop()
+
+
+@pytest.fixture(params=[True, False], ids=["keep", "compact"])
+def keep_response_dicts(request):
+    """
+    Run a test with and without keeping each model's response_dict
+    """
+    saved_keep_response_dicts = config.keep_response_dicts
+    config.keep_response_dicts = request.param
+    yield request.param
+    config.keep_response_dicts = saved_keep_response_dicts
+
+
+@pytest.mark.parametrize("model,resource,max_bytes,max_compact_bytes", [
+    (DataFile, 'dataset_file', MAX_BYTES_PER_DATAFILE,
+     MAX_BYTES_PER_COMPACT_DATAFILE),
+    (Dataset, 'dataset', MAX_BYTES_PER_DATASET,
+     MAX_BYTES_PER_COMPACT_DATASET)])
+def test_resultset_memory(synthetic_data, keep_response_dicts, model,  # pylint: disable=redefined-outer-name,too-many-arguments
+                          resource, max_bytes, max_compact_bytes):
+    """
+    Test the memory used by decoding a list response and constructing a
+    model object for each record
+    """
+    body = list_response(synthetic_data, resource)
+    records, usage = measure(resultset_models, model, body)
+    assert len(records) == NUM_RECORDS
+    # The whole decoded response is allocated at the peak, either way:
+    assert usage.peak / len(records) < max_bytes
+    if not keep_response_dicts:
+        max_bytes = max_compact_bytes
+    assert usage.retained / len(records) < max_bytes
+
+
+@pytest.mark.parametrize("stream", [False, True])
+def test_queryset_memory(server, keep_response_dicts, stream):  # pylint: disable=redefined-outer-name,unused-argument
+    """
+    Test the memory used by iterating over a QuerySet spanning many pages,
+    with and without retaining its model objects
+    """
+    datafiles, usage = measure(queryset_models, DataFile,
+                               filters="dataset__id=1", stream=stream)
+    assert len(datafiles) == NUM_RECORDS
+    if not keep_response_dicts:
+        max_bytes = MAX_BYTES_PER_COMPACT_DATAFILE
+    elif stream:
+        max_bytes = MAX_BYTES_PER_STREAMED_DATAFILE
+    else:
+        max_bytes = MAX_BYTES_PER_DATAFILE
+    assert usage.retained / NUM_RECORDS < max_bytes
+    del datafiles
+
+    count, usage = measure(queryset_count, DataFile,
+                           filters="dataset__id=1", stream=stream)
+    assert count == NUM_RECORDS
+    assert usage.peak < MAX_ITERATION_PEAK
+
+
+def test_parameter_set_memory(server, keep_response_dicts):  # pylint: disable=redefined-outer-name,unused-argument
+    """
+    Test the memory used by DatasetParameterSet objects (including their
+    parameters and parameter names)
+    """
+    metadata_cache.clear()
+    metadata_cache.enabled = True
+    try:
+        parameter_sets, usage = measure(queryset_models, DatasetParameterSet)
+    finally:
+        metadata_cache.enabled = False
+        metadata_cache.clear()
+    assert len(parameter_sets) == NUM_RECORDS
+    assert len(parameter_sets[0].parameters) == 2
+    max_bytes = MAX_BYTES_PER_PARAMETER_SET if keep_response_dicts \
+        else MAX_BYTES_PER_COMPACT_PARAMETER_SET
+    assert usage.retained / NUM_RECORDS < max_bytes
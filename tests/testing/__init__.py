@@ -0,0 +1,3 @@
+"""
+tests/testing/__init__.py
+"""
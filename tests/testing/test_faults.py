@@ -0,0 +1,123 @@
+"""
+test_faults.py
+
+Tests for injecting latency and faults into the fake MyTardis server's
+responses
+"""
+import time
+
+import pytest
+import requests
+
+from mtclient.conf import config
+from mtclient.models.dataset import Dataset
+from mtclient.testing.faults import (
+    Constant, FaultInjector, FaultRule, LogNormal, Uniform)
+from mtclient.testing.fixtures import fake_mytardis  # noqa  pylint: disable=unused-import
+from mtclient.utils.session import get_session
+
+DOWNLOAD_URL = "/api/v1/dataset_file/1/download/"
+
+
+def get(path):
+    """
+    Send a GET request to the fake MyTardis server
+    """
+    return get_session().get(config.url + path,
+                             headers=config.default_headers)
+
+
+def test_distributions_are_reproducible():
+    """
+    Test that a seed makes the injected faults reproducible
+    """
+    def choices(seed):
+        """
+        Return the latencies and statuses chosen for some requests
+        """
+        injector = FaultInjector([FaultRule(latency=LogNormal(0.04, 0.5),
+                                            error_rate=0.3)], seed=seed)
+        faults = [injector.choose("GET", DOWNLOAD_URL) for _ in range(50)]
+        return [(fault.latency, fault.status) for fault in faults]
+
+    assert choices(42) == choices(42)
+    assert choices(42) != choices(43)
+    assert {status for _, status in choices(42)} == {None, 503}
+    assert all(0.01 <= Uniform(0.01, 0.02).sample(FaultInjector([]).rng)
+               <= 0.02 for _ in range(10))
+    assert Constant(0.5).sample(None) == 0.5
+
+
+def test_rule_matching():
+    """
+    Test that the first rule matching a request's method and endpoint is
+    used
+    """
+    download = FaultRule(endpoint="/download/$", error_rate=1.0)
+    post = FaultRule(method="post", error_rate=1.0, error_status=500)
+    injector = FaultInjector([download, post])
+    assert injector.rule_for("GET", DOWNLOAD_URL) is download
+    assert injector.rule_for("POST", "/api/v1/dataset_file/") is post
+    assert injector.rule_for("GET", "/api/v1/dataset_file/1/") is None
+    assert injector.choose("GET", "/api/v1/dataset/") is None
+
+
+def test_errors_and_throttling(fake_mytardis):  # pylint: disable=redefined-outer-name
+    """
+    Test injecting 5xx and 429 responses
+    """
+    fake_mytardis.data.generate(datafiles_per_dataset=1)
+    fake_mytardis.faults = FaultInjector([
+        FaultRule(endpoint="^/api/v1/dataset/$", error_rate=1.0),
+        FaultRule(endpoint="^/api/v1/experiment/$", throttle_rate=1.0,
+                  retry_after=7)])
+    assert get("/api/v1/dataset/").status_code == 503
+    response = get("/api/v1/experiment/")
+    assert response.status_code == 429
+    assert response.headers['Retry-After'] == "7"
+    with pytest.raises(requests.exceptions.HTTPError):
+        Dataset.list()
+    assert get("/api/v1/dataset_file/").status_code == 200
+
+    fake_mytardis.faults = None
+    assert Dataset.list().total_count == 1
+
+
+def test_latency_and_bandwidth(fake_mytardis):  # pylint: disable=redefined-outer-name
+    """
+    Test injecting latency, a slow first byte and a bandwidth cap
+    """
+    fake_mytardis.data.generate(datafiles_per_dataset=1,
+                                datafile_size=300000)
+    fake_mytardis.faults = FaultInjector([
+        FaultRule(endpoint="/download/$", first_byte_delay=0.1,
+                  bandwidth=1000000),
+        FaultRule(latency=0.1)])
+    start = time.time()
+    assert get("/api/v1/dataset/1/").status_code == 200
+    assert time.time() - start >= 0.1
+
+    start = time.time()
+    response = get_session().get(config.url + DOWNLOAD_URL,
+                                 headers=config.default_headers,
+                                 stream=True)
+    assert time.time() - start < 0.1
+    content = response.content
+    # 0.1 s before the first byte, then 300 KB at 1 MB/s:
+    assert time.time() - start >= 0.35
+    assert content == fake_mytardis.data.content(1)
+
+
+def test_connection_reset(fake_mytardis):  # pylint: disable=redefined-outer-name
+    """
+    Test resetting the connection part of the way through a download
+    """
+    fake_mytardis.data.generate(datafiles_per_dataset=1,
+                                datafile_size=1000000)
+    fake_mytardis.faults = FaultInjector([
+        FaultRule(endpoint="/download/$", reset_rate=1.0, reset_after=0.3)])
+    with pytest.raises(requests.exceptions.RequestException):
+        get(DOWNLOAD_URL)
+    # The next request uses a new connection:
+    assert get("/api/v1/dataset_file/1/").status_code == 200
+    assert fake_mytardis.connection_count == 2
@@ -0,0 +1,119 @@
+"""
+test_server.py
+
+Tests for the fake MyTardis server in mtclient.testing, using the real
+client (without requests_mock) over local HTTP connections.
+"""
+import hashlib
+import os
+
+import requests
+
+from mtclient.conf import config
+from mtclient.models.datafile import DataFile
+from mtclient.models.dataset import Dataset
+from mtclient.testing.fixtures import fake_mytardis  # noqa  pylint: disable=unused-import
+from mtclient.utils.session import get_session
+
+
+def test_queryset_pagination(fake_mytardis):  # pylint: disable=redefined-outer-name
+    """
+    Test iterating over a QuerySet spanning several pages, over a single
+    kept-alive connection
+    """
+    fake_mytardis.data.generate(datafiles_per_dataset=45)
+    datafiles = list(DataFile.objects.filter(dataset__id=1).order_by('id'))
+    assert [datafile.filename for datafile in datafiles] == [
+        "file%07d.dat" % index for index in range(1, 46)]
+    assert fake_mytardis.request_count == 3
+    assert fake_mytardis.connection_count == 1
+
+
+def test_get_and_filter(fake_mytardis):  # pylint: disable=redefined-outer-name
+    """
+    Test retrieving records and filtering lists
+    """
+    fake_mytardis.data.generate(datasets_per_experiment=2,
+                                datafiles_per_dataset=5)
+    dataset = Dataset.objects.get(id=2)
+    assert dataset.description == "Dataset 1-2"
+    assert dataset.instrument.facility.name == "Test Facility"
+    assert DataFile.list(filters="dataset__id=2").total_count == 5
+    datafiles = DataFile.list(filters="filename=file0000003.dat")
+    assert [datafile.id for datafile in datafiles] == [3, 8]
+    datasets = Dataset.list(filters="experiments__id=1")
+    assert datasets.total_count == 2
+    assert Dataset.list(filters="description__icontains=1-2").total_count == 1
+
+
+def test_create_upload_download_verify(fake_mytardis, tmpdir):  # pylint: disable=redefined-outer-name
+    """
+    Test creating a dataset, uploading a datafile, and downloading and
+    verifying it
+    """
+    fake_mytardis.data.generate(datafiles_per_dataset=0)
+    dataset = Dataset.create(experiment_id=1, description="Uploads",
+                             instrument_id=1)
+    assert dataset.instrument.name == "Test Instrument"
+
+    content = os.urandom(100000)
+    dataset_path = tmpdir.mkdir("Uploads")
+    dataset_path.join("upload.dat").write_binary(content)
+    DataFile.upload(dataset.id, "default", str(dataset_path),
+                    str(dataset_path.join("upload.dat")), stream=True)
+    datafile = DataFile.list(filters="dataset__id=%s" % dataset.id)[0]
+    assert datafile.size == len(content)
+    assert datafile.md5sum == hashlib.md5(content).hexdigest()
+
+    download_dir = tmpdir.mkdir("downloads")
+    DataFile.download(datafile.id, basedir=str(download_dir))
+    assert download_dir.join("upload.dat").read_binary() == content
+
+    assert not DataFile.objects.get(id=datafile.id).replicas[0].verified
+    DataFile.verify(datafile.id)
+    assert DataFile.objects.get(id=datafile.id).replicas[0].verified
+
+
+def test_download_range(fake_mytardis):  # pylint: disable=redefined-outer-name
+    """
+    Test downloading part of a datafile with a Range header
+    """
+    data = fake_mytardis.data.generate(datafiles_per_dataset=1,
+                                       datafile_size=200000)
+    content = data.content(1)
+    url = "%s/api/v1/dataset_file/1/download/" % config.url
+    headers = dict(config.default_headers, Range="bytes=100000-100999")
+    response = get_session().get(url, headers=headers)
+    assert response.status_code == 206
+    assert response.headers['Content-Range'] == "bytes 100000-100999/200000"
+    assert response.content == content[100000:101000]
+
+    headers['Range'] = "bytes=-10"
+    assert get_session().get(url, headers=headers).content == content[-10:]
+
+    headers['Range'] = "bytes=200000-"
+    assert get_session().get(url, headers=headers).status_code == 416
+
+    response = get_session().get(url, headers=config.default_headers)
+    assert response.status_code == 200
+    assert hashlib.md5(response.content).hexdigest() == \
+        data.get('dataset_file', 1)['md5sum']
+
+
+def test_set_and_errors(fake_mytardis):  # pylint: disable=redefined-outer-name
+    """
+    Test the set endpoint, and responses for missing records and
+    unauthorized requests
+    """
+    fake_mytardis.data.generate(datafiles_per_dataset=3)
+    url = "%s/api/v1/dataset_file/set/1;3;4/?format=json" % config.url
+    response = get_session().get(url, headers=config.default_headers)
+    assert [record['id'] for record in response.json()['objects']] == [1, 3]
+    assert response.json()['not_found'] == ["4"]
+
+    url = "%s/api/v1/dataset_file/4/?format=json" % config.url
+    response = get_session().get(url, headers=config.default_headers)
+    assert response.status_code == 404
+
+    url = "%s/api/v1/dataset_file/1/?format=json" % config.url
+    assert requests.get(url).status_code == 401
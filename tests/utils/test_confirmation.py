@@ -6,7 +6,8 @@ from six import StringIO
 
 import pytest
 
-from mtclient.utils.confirmation import query_yes_no
+from mtclient.utils.confirmation import non_interactive, query_yes_no
+from mtclient.utils.exceptions import ConfirmationRequired
 
 
 def test_query_yes_no(capfd):
@@ -49,3 +50,21 @@ def test_query_yes_no(capfd):
         "Question? [y/n] ")
 
     sys.stdin = sys_stdin
+
+
+def test_query_yes_no_non_interactive(capfd):
+    """
+    Test that questions are answered without reading stdin when running
+    non-interactively
+    """
+    sys_stdin = sys.stdin
+    sys.stdin = StringIO("y\n")
+    with non_interactive():
+        assert query_yes_no("Question?", default="yes")
+        assert not query_yes_no("Question?", default="no")
+        with pytest.raises(ConfirmationRequired):
+            query_yes_no("Question?")
+    out, _ = capfd.readouterr()
+    assert out == ""
+    assert sys.stdin.read() == "y\n"
+    sys.stdin = sys_stdin
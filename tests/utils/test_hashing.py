@@ -0,0 +1,57 @@
+"""
+Tests for calculating checksums of large files
+"""
+import hashlib
+import os
+import shutil
+import tempfile
+
+import pytest
+
+from mtclient.utils.hashing import digest_file, hash_file, read_blocks
+
+
+def test_hash_file():
+    """
+    Test that each read strategy gives the same checksum as hashlib
+    for files of various sizes relative to the block size
+    """
+    tmpdir = tempfile.mkdtemp()
+    blocksize = 4096
+    for size in (0, 1, blocksize - 1, blocksize, 3 * blocksize + 5,
+                 8 * blocksize + 5):
+        data = os.urandom(size)
+        file_path = os.path.join(tmpdir, "file%s.dat" % size)
+        with open(file_path, 'wb') as datafile:
+            datafile.write(data)
+        for kwargs in (dict(pipelined=True), dict(pipelined=False),
+                       dict(use_mmap=True), dict(drop_cache=True),
+                       dict(pipelined=False, drop_cache=True)):
+            assert hash_file(file_path, 'md5', blocksize, **kwargs) == \
+                hashlib.md5(data).hexdigest()
+        assert digest_file(file_path, ['md5', 'sha512', 'blake2b'],
+                           blocksize) == {
+                               'md5': hashlib.md5(data).hexdigest(),
+                               'sha512': hashlib.sha512(data).hexdigest(),
+                               'blake2b': hashlib.blake2b(data).hexdigest()}
+    with pytest.raises(ValueError):
+        digest_file(file_path, ['bogus'])
+    shutil.rmtree(tmpdir)
+
+
+def test_read_blocks_closed_early():
+    """
+    Test that each read strategy releases its buffers when the caller
+    stops reading before the end of the file
+    """
+    tmpdir = tempfile.mkdtemp()
+    blocksize = 4096
+    file_path = os.path.join(tmpdir, "file.dat")
+    with open(file_path, 'wb') as datafile:
+        datafile.write(os.urandom(8 * blocksize))
+    for kwargs in (dict(pipelined=True), dict(pipelined=False),
+                   dict(use_mmap=True)):
+        blocks = read_blocks(file_path, blocksize, **kwargs)
+        assert len(next(blocks)) == blocksize
+        blocks.close()
+    shutil.rmtree(tmpdir)
@@ -0,0 +1,105 @@
+"""
+Tests for recording statistics for HTTP requests
+"""
+import json
+import sys
+
+import requests_mock
+
+import mtclient.client
+from mtclient.conf import config
+from mtclient.utils.instrumentation import (
+    endpoint_template, percentile, request_stats)
+from mtclient.utils.session import get_session
+
+
+def test_endpoint_template():
+    """
+    Test identifying endpoints by their URL paths
+    """
+    assert endpoint_template(
+        "https://mytardis.example.com/api/v1/dataset_file/123/?format=json") \
+        == "/api/v1/dataset_file/{id}/"
+    assert endpoint_template(
+        "https://mytardis.example.com/api/v1/dataset/35/files/") \
+        == "/api/v1/dataset/{id}/files/"
+    assert endpoint_template(
+        "https://mytardis.example.com/api/v1/schema/?format=json&limit=0") \
+        == "/api/v1/schema/"
+
+
+def test_percentile():
+    """
+    Test calculating nearest-rank percentiles
+    """
+    values = list(range(1, 101))
+    assert percentile(values, 50) == 50
+    assert percentile(values, 95) == 95
+    assert percentile(values, 99) == 99
+    assert percentile([0.5], 99) == 0.5
+    assert percentile([], 50) is None
+
+
+def test_request_stats():
+    """
+    Test recording requests while enabled
+    """
+    url = "%s/api/v1/dataset/%%s/?format=json" % config.url
+    try:
+        with requests_mock.Mocker() as mocker:
+            for dataset_id in range(1, 4):
+                mocker.get(url % dataset_id, text='{"id": %s}' % dataset_id)
+            mocker.post("%s/api/v1/dataset/" % config.url, status_code=400)
+            get_session().get(url % 1)
+            request_stats.enabled = True
+            for dataset_id in range(1, 4):
+                get_session().get(url % dataset_id)
+            get_session().post("%s/api/v1/dataset/" % config.url,
+                               data=b"x" * 10)
+        summary = dict(((endpoint['method'], endpoint['endpoint']), endpoint)
+                       for endpoint in request_stats.summary())
+        dataset_gets = summary[('GET', '/api/v1/dataset/{id}/')]
+        assert dataset_gets['count'] == 3
+        assert dataset_gets['errors'] == 0
+        assert dataset_gets['response_bytes'] == 3 * len('{"id": 1}')
+        assert dataset_gets['p50'] <= dataset_gets['p99']
+        dataset_posts = summary[('POST', '/api/v1/dataset/')]
+        assert dataset_posts['count'] == 1
+        assert dataset_posts['errors'] == 1
+        assert dataset_posts['request_bytes'] == 10
+        assert "/api/v1/dataset/{id}/" in request_stats.render()
+    finally:
+        request_stats.enabled = False
+        request_stats.clear()
+
+
+def test_stats_cli(capfd):
+    """
+    Test displaying request statistics with 'mytardis --stats'
+    """
+    mock_datafile_list = {
+        "meta": {
+            "limit": 20,
+            "next": None,
+            "offset": 0,
+            "previous": None,
+            "total_count": 0
+        },
+        "objects": []
+    }
+    with requests_mock.Mocker() as mocker:
+        mocker.get("%s/api/v1/dataset_file/?format=json&dataset__id=1"
+                   % config.url, text=json.dumps(mock_datafile_list))
+        sys_argv = sys.argv
+        sys.argv = ['mytardis', '--stats', 'datafile', 'list', '--dataset',
+                    '1', '--json']
+        try:
+            mtclient.client.run()
+        finally:
+            sys.argv = sys_argv
+        out, err = capfd.readouterr()
+        assert json.loads(out) == mock_datafile_list
+        assert "/api/v1/dataset_file/" in err
+        assert "1 requests" in err
+    assert not request_stats.enabled
+    assert not request_stats.records
@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the pluggable JSON codec
+"""
+import os
+
+import pytest
+
+from mtclient.utils import jsoncodec
+
+
+def installed_codecs():
+    """
+    Return the names of the installed codecs
+    """
+    names = []
+    for name in jsoncodec.CODECS:
+        try:
+            jsoncodec.load_codec(name)
+            names.append(name)
+        except ImportError:
+            pass
+    return names
+
+
+@pytest.mark.parametrize("name", installed_codecs())
+def test_codec_round_trip(name):
+    """
+    Test that each installed codec encodes compact JSON identically
+    """
+    codec = jsoncodec.load_codec(name)
+    record = {
+        "id": 1,
+        "filename": u"café.txt",
+        "replicas": [{"uri": "ds1/café.txt", "verified": True}],
+        "size": 1024,
+        "directory": None
+    }
+    encoded = codec.dumps(record, sort_keys=True)
+    assert encoded == (
+        u'{"directory":null,"filename":"café.txt","id":1,'
+        u'"replicas":[{"uri":"ds1/café.txt","verified":true}],'
+        u'"size":1024}')
+    assert codec.loads(encoded) == record
+    assert codec.loads(encoded.encode('utf-8')) == record
+    with pytest.raises(ValueError):
+        codec.loads(b'{"id": ')
+
+
+def test_set_codec(monkeypatch):
+    """
+    Test selecting a codec explicitly and from the environment
+    """
+    try:
+        assert jsoncodec.set_codec('json').name == 'json'
+        assert jsoncodec.get_codec().name == 'json'
+        assert jsoncodec.dumps({"b": 1, "a": [1, 2]}, sort_keys=True) == \
+            '{"a":[1,2],"b":1}'
+
+        monkeypatch.setenv('MYTARDISCLIENT_JSON_CODEC', 'json')
+        assert jsoncodec.set_codec().name == 'json'
+        monkeypatch.delenv('MYTARDISCLIENT_JSON_CODEC')
+        assert jsoncodec.set_codec().name == installed_codecs()[0]
+
+        with pytest.raises(ValueError):
+            jsoncodec.set_codec('pickle')
+    finally:
+        jsoncodec.set_codec(os.environ.get('MYTARDISCLIENT_JSON_CODEC'))
@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for parsing large list responses incrementally
+"""
+import json
+
+import pytest
+
+from mtclient.utils.jsonstream import IncompleteJson, iter_list_response
+
+
+def test_iter_list_response():
+    """
+    Test parsing a list response split into chunks of various sizes
+    """
+    response_dict = {
+        "meta": {"limit": 0, "next": None, "offset": 0, "previous": None,
+                 "total_count": 100},
+        "objects": [{"id": index, "filename": u"café%s.txt" % index,
+                     "size": 123456789 * index}
+                    for index in range(100)]
+    }
+    for indent in (None, 2):
+        body = json.dumps(response_dict, indent=indent, sort_keys=True,
+                          ensure_ascii=False).encode('utf-8')
+        for chunk_size in (1, 7, 4096):
+            chunks = [body[offset:offset + chunk_size]
+                      for offset in range(0, len(body), chunk_size)]
+            events = list(iter_list_response(chunks))
+            assert events[0] == ('meta', response_dict['meta'])
+            assert events[1:] == [('object', record)
+                                  for record in response_dict['objects']]
+
+
+def test_iter_list_response_invalid():
+    """
+    Test parsing truncated and invalid list responses
+    """
+    with pytest.raises(IncompleteJson):
+        list(iter_list_response([b'{"meta": {}, "objects": [{"id": 1}']))
+    with pytest.raises(ValueError):
+        list(iter_list_response([b'{"meta": {"total_count": 12']))
+    with pytest.raises(ValueError):
+        list(iter_list_response([b'[{"id": 1}]']))
+    with pytest.raises(ValueError):
+        list(iter_list_response([b'{"objects": []} []']))
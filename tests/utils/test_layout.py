@@ -0,0 +1,47 @@
+"""
+Tests for ordering files by their physical layout
+"""
+import os
+import shutil
+import tempfile
+
+import pytest
+
+from mtclient.utils.layout import sort_by_physical_layout
+from mtclient.utils.scan import scan_directory, ScanEntry
+
+
+def test_sort_by_physical_layout():
+    """
+    Test sorting scanned files by inode number and by FIEMAP offset
+    """
+    tmpdir = tempfile.mkdtemp()
+    for index in range(10):
+        with open(os.path.join(tmpdir, "file%s.txt" % index), 'wb') \
+                as datafile:
+            datafile.write(b"x" * 4096)
+    scanned = list(scan_directory(tmpdir))
+    inodes = dict((entry.relpath, entry.inode) for entry in scanned)
+    assert inodes == dict(
+        (relpath, os.stat(os.path.join(tmpdir, relpath)).st_ino)
+        for relpath in inodes)
+
+    by_inode = sort_by_physical_layout(scanned, tmpdir, order='inode')
+    assert [entry.inode for entry in by_inode] == sorted(inodes.values())
+
+    # Scan entries without inode numbers (e.g. from the directory watcher)
+    # are stat-ed:
+    without_inodes = [ScanEntry(entry.relpath, entry.size, entry.mtime)
+                      for entry in scanned]
+    assert [entry.relpath for entry in sort_by_physical_layout(
+        without_inodes, tmpdir)] == [entry.relpath for entry in by_inode]
+
+    # FIEMAP isn't supported by every filesystem, so just check that
+    # every file is still there:
+    by_offset = sort_by_physical_layout(scanned, tmpdir, order='fiemap')
+    assert sorted(by_offset) == sorted(scanned)
+
+    with pytest.raises(ValueError):
+        sort_by_physical_layout(scanned, tmpdir, order='random')
+
+    shutil.rmtree(tmpdir)
@@ -0,0 +1,55 @@
+"""
+Tests for reading checksum manifests
+"""
+import json
+import os
+import shutil
+import tempfile
+
+import pytest
+
+from mtclient.utils.manifest import read_manifest, ManifestEntry
+
+
+def test_read_manifest():
+    """
+    Test reading md5sum, CSV, JSON Lines and JSON array manifests
+    """
+    tmpdir = tempfile.mkdtemp()
+    md5sum = "746308829575e17c3331bbcb00c0898b"
+    manifests = {
+        "manifest-md5.txt":
+            "%s  data/file1.txt\n%s *data/file 2.txt\n" % (md5sum, md5sum),
+        "manifest.csv":
+            "path,md5sum,size,mimetype\n"
+            "data/file1.txt,%s,14,text/plain\n"
+            "data/file 2.txt,%s,,\n" % (md5sum, md5sum),
+        "manifest.jsonl":
+            json.dumps(dict(path="data/file1.txt", md5sum=md5sum, size=14,
+                            mimetype="text/plain")) + "\n" +
+            json.dumps(dict(path="data/file 2.txt", md5sum=md5sum)) + "\n",
+        "manifest.json": json.dumps([
+            dict(path="data/file1.txt", md5sum=md5sum, size=14,
+                 mimetype="text/plain"),
+            dict(path="data/file 2.txt", md5sum=md5sum)])
+    }
+    for filename, content in manifests.items():
+        with open(os.path.join(tmpdir, filename), 'w') as manifest:
+            manifest.write(content)
+        entries = list(read_manifest(os.path.join(tmpdir, filename)))
+        assert [entry.path for entry in entries] == [
+            os.path.join(tmpdir, "data/file1.txt"),
+            os.path.join(tmpdir, "data/file 2.txt")]
+        assert all(entry.md5sum == md5sum for entry in entries)
+        if filename != "manifest-md5.txt":
+            assert entries[0] == ManifestEntry(
+                os.path.join(tmpdir, "data/file1.txt"), md5sum, 14,
+                "text/plain")
+            assert entries[1].size is None
+            assert entries[1].mimetype is None
+
+    with pytest.raises(ValueError):
+        list(read_manifest(os.path.join(tmpdir, "manifest.csv"),
+                           manifest_format="md5sum"))
+
+    shutil.rmtree(tmpdir)
@@ -0,0 +1,93 @@
+"""
+Tests for profiling CLI commands
+"""
+import hashlib
+import os
+import pstats
+import shutil
+import tempfile
+import threading
+
+from six import StringIO
+
+from mtclient.argparser import ArgParser
+from mtclient.utils.profiling import (
+    DEFAULT_PROFILE_PATH, categorize, profiled)
+
+
+def hash_data():
+    """
+    Do some hashing for the profilers to measure
+    """
+    data = b"x" * 1024 * 1024
+    for _ in range(20):
+        hashlib.md5(data).hexdigest()
+
+
+def test_categorize():
+    """
+    Test categorizing functions
+    """
+    assert categorize(
+        "/usr/lib/python3/site-packages/requests/sessions.py:send") == \
+        'network'
+    assert categorize("~:<method 'recv_into' of '_socket.socket' objects>") \
+        == 'network'
+    assert categorize("~:<built-in method _hashlib.openssl_md5>") == \
+        'hashing'
+    assert categorize("~:<built-in method posix.stat>") == 'disk I/O'
+    assert categorize("~:<built-in method nt.stat>") == 'disk I/O'
+    assert categorize("/usr/lib/python3.8/os.py:walk") == 'disk I/O'
+    assert categorize("~:<built-in method io.open>") == 'disk I/O'
+    assert categorize(
+        "/usr/lib/python3/site-packages/texttable.py:draw") == 'rendering'
+    assert categorize("/home/user/script.py:main") == 'other'
+    # Module names which merely end with a category's module name:
+    assert categorize("/home/user/mtclient/client.py:run") == 'other'
+    assert categorize("/home/user/photos.py:main") == 'other'
+    assert categorize("/home/user/posix.py:main") == 'other'
+
+
+def test_profiled():
+    """
+    Test profiling with cProfile and with the sampling profiler
+    """
+    tmpdir = tempfile.mkdtemp()
+    try:
+        profile_path = os.path.join(tmpdir, "mytardis.prof")
+        report = StringIO()
+        with profiled(profile_path, stream=report):
+            hash_data()
+        assert pstats.Stats(profile_path).total_calls > 0
+        assert "hash_data" in report.getvalue()
+        assert "hashing" in report.getvalue()
+
+        collapsed_path = os.path.join(tmpdir, "mytardis.collapsed")
+        report = StringIO()
+        with profiled(collapsed_path, stream=report):
+            thread = threading.Thread(target=hash_data)
+            thread.start()
+            thread.join()
+        with open(collapsed_path) as collapsed_file:
+            lines = collapsed_file.read().splitlines()
+        assert lines
+        _, count = lines[0].rsplit(" ", 1)
+        assert int(count) > 0
+        assert any("hash_data" in line for line in lines)
+        assert "Profile written to %s" % collapsed_path in report.getvalue()
+    finally:
+        shutil.rmtree(tmpdir)
+
+
+def test_profile_argparse():
+    """
+    Test parsing --profile with and without a FILE
+    """
+    arg_parser = ArgParser()
+    args = arg_parser.get_args(['--profile', 'dataset', 'list'])
+    assert args.profile == DEFAULT_PROFILE_PATH
+    assert args.model == 'dataset'
+    args = arg_parser.get_args(['--profile=out.collapsed', 'dataset', 'list'])
+    assert args.profile == 'out.collapsed'
+    args = arg_parser.get_args(['dataset', 'list'])
+    assert args.profile is None
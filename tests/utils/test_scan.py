@@ -0,0 +1,42 @@
+"""
+Tests for scanning directories with os.scandir
+"""
+import os
+import shutil
+import tempfile
+
+from mtclient.utils.scan import scan_directory
+
+
+def test_scan_directory():
+    """
+    Test scanning a directory tree, with and without threads
+    """
+    tmpdir = tempfile.mkdtemp()
+    os.makedirs(os.path.join(tmpdir, "subdir1", "subdir2"))
+    expected = {
+        "file1.txt": 5,
+        os.path.join("subdir1", "file2.txt"): 10,
+        os.path.join("subdir1", "subdir2", "file3.txt"): 0,
+    }
+    for relpath, size in expected.items():
+        with open(os.path.join(tmpdir, relpath), 'wb') as datafile:
+            datafile.write(b"x" * size)
+    # Symlinks to directories should be skipped, like os.walk does:
+    os.symlink(os.path.join(tmpdir, "subdir1"),
+               os.path.join(tmpdir, "subdir1-link"))
+
+    for threads in (1, 4):
+        scanned = list(scan_directory(tmpdir, threads=threads))
+        assert dict((entry.relpath, entry.size) for entry in scanned) == \
+            expected
+        for entry in scanned:
+            assert entry.mtime == \
+                os.stat(os.path.join(tmpdir, entry.relpath)).st_mtime
+
+    errors = []
+    assert list(scan_directory(os.path.join(tmpdir, "missing"),
+                               onerror=errors.append)) == []
+    assert len(errors) == 1
+
+    shutil.rmtree(tmpdir)
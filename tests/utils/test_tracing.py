@@ -0,0 +1,118 @@
+"""
+Tests for tracing spans
+"""
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+
+import pytest
+import requests_mock
+
+import mtclient.client
+from mtclient.conf import config
+from mtclient.utils.tracing import activated, span, traced, tracer
+
+
+@traced("add", "first", "second")
+def add(first, second=0):
+    """
+    Add two numbers
+    """
+    return first + second
+
+
+def test_spans():
+    """
+    Test recording nested spans, including spans in a worker thread
+    """
+    with span("unrecorded") as unrecorded:
+        assert unrecorded is None
+    tracer.enabled = True
+    try:
+        with span("parent", dataset_id=1) as parent:
+            assert add(1, second=2) == 3
+
+            def worker():
+                """
+                Start a span in a worker thread
+                """
+                with activated(parent):
+                    with span("worker"):
+                        pass
+            thread = threading.Thread(target=worker)
+            thread.start()
+            thread.join()
+            with pytest.raises(ValueError):
+                with span("failure"):
+                    raise ValueError("Failed")
+        spans = dict((span_.name, span_) for span_ in tracer.spans)
+        assert spans['parent'].parent_id is None
+        assert spans['parent'].attributes == dict(dataset_id=1)
+        assert spans['add'].attributes == dict(first=1, second=2)
+        for name in ('add', 'worker', 'failure'):
+            assert spans[name].parent_id == spans['parent'].span_id
+            assert spans[name].trace_id == spans['parent'].trace_id
+        assert spans['worker'].thread != spans['parent'].thread
+        assert spans['failure'].status == 'error'
+        assert spans['failure'].error == "Failed"
+        assert spans['parent'].end_time >= spans['failure'].end_time
+    finally:
+        tracer.enabled = False
+        tracer.clear()
+
+
+def test_trace_cli():
+    """
+    Test writing a trace of a command and its HTTP requests to a file
+    """
+    mock_schema = {
+        "hidden": False,
+        "id": 1,
+        "immutable": False,
+        "name": "Schema Name",
+        "namespace": "http://schema/namespace",
+        "resource_uri": "/api/v1/schema/1/",
+        "subtype": "",
+        "type": 1
+    }
+    mock_parameter_name_list = {
+        "meta": {
+            "limit": 0,
+            "next": None,
+            "offset": 0,
+            "previous": None,
+            "total_count": 0
+        },
+        "objects": []
+    }
+    tmpdir = tempfile.mkdtemp()
+    trace_path = os.path.join(tmpdir, "trace.json")
+    sys_argv = sys.argv
+    try:
+        with requests_mock.Mocker() as mocker:
+            mocker.get("%s/api/v1/schema/1/?format=json" % config.url,
+                       text=json.dumps(mock_schema))
+            mocker.get("%s/api/v1/parametername/" % config.url,
+                       text=json.dumps(mock_parameter_name_list))
+            sys.argv = ['mytardis', '--trace', trace_path, 'schema', 'get',
+                        '1', '--params', '--json']
+            mtclient.client.run()
+        with open(trace_path) as trace_file:
+            spans = json.load(trace_file)['spans']
+    finally:
+        sys.argv = sys_argv
+        shutil.rmtree(tmpdir)
+    assert not tracer.enabled
+    assert [span_['name'] for span_ in spans] == [
+        "mytardis schema get", "Schema.get", "GET /api/v1/schema/{id}/",
+        "ParameterName.list", "GET /api/v1/parametername/"]
+    span_ids = [span_['span_id'] for span_ in spans]
+    assert [span_['parent_id'] for span_ in spans] == [
+        None, span_ids[0], span_ids[1], span_ids[1], span_ids[3]]
+    assert spans[2]['attributes'] == {
+        'http.method': 'GET', 'http.route': '/api/v1/schema/{id}/',
+        'http.status_code': 200}
+    assert spans[1]['attributes'] == {'id': '1', 'param_names': True}
@@ -0,0 +1,99 @@
+"""
+Tests for watching a directory for new files
+"""
+import os
+import shutil
+import tempfile
+
+from mtclient.utils.watch import DirectoryWatcher
+
+
+def test_directory_watcher_polling():
+    """
+    Test that polling reports each file once, after its size and
+    modification time have stopped changing
+    """
+    tmpdir = tempfile.mkdtemp()
+    os.makedirs(os.path.join(tmpdir, "subdir"))
+    with open(os.path.join(tmpdir, "file1.txt"), 'w') as datafile:
+        datafile.write("Hello, world!\n")
+
+    watcher = DirectoryWatcher(
+        tmpdir, interval=0, settle_time=0, use_inotify=False)
+    batches = watcher.batches(batch_size=1)
+
+    # The first poll finds file1.txt, and the second poll
+    # finds that it hasn't changed since the first poll:
+    batch = next(batches)
+    assert [entry.relpath for entry in batch] == ["file1.txt"]
+    assert batch[0].size == 14
+
+    with open(os.path.join(tmpdir, "subdir", "file2.txt"), 'w') as datafile:
+        datafile.write("Hello again!\n")
+    batch = next(batches)
+    assert [entry.relpath for entry in batch] == \
+        [os.path.join("subdir", "file2.txt")]
+
+    watcher = DirectoryWatcher(
+        tmpdir, interval=0, settle_time=3600, use_inotify=False)
+    assert list(watcher.batches(max_polls=2)) == []
+    watcher.close()
+
+    shutil.rmtree(tmpdir)
+
+
+def test_directory_watcher_inotify_overflow(monkeypatch):
+    """
+    Test that the directory tree is rescanned when the inotify event
+    queue overflows, so files whose events were lost are still reported
+    """
+    import collections
+    import sys
+    import types
+
+    tmpdir = tempfile.mkdtemp()
+    with open(os.path.join(tmpdir, "file1.txt"), 'w') as datafile:
+        datafile.write("Hello, world!\n")
+
+    Event = collections.namedtuple('Event', 'wd mask cookie name')
+    flags = types.SimpleNamespace(
+        CLOSE_WRITE=0x8, MOVED_TO=0x80, CREATE=0x100, Q_OVERFLOW=0x4000,
+        ISDIR=0x40000000)
+
+    class FakeINotify(object):
+        """
+        Reports a queue overflow on the third read
+        """
+        def __init__(self):
+            self.reads = 0
+
+        def add_watch(self, path, mask):  # pylint: disable=unused-argument,no-self-use
+            return 1
+
+        def read(self, timeout=None):  # pylint: disable=unused-argument
+            self.reads += 1
+            if self.reads == 3:
+                return [Event(-1, flags.Q_OVERFLOW, 0, '')]
+            return []
+
+        def close(self):
+            pass
+
+    inotify_simple = types.ModuleType('inotify_simple')
+    inotify_simple.INotify = FakeINotify
+    inotify_simple.flags = flags
+    monkeypatch.setitem(sys.modules, 'inotify_simple', inotify_simple)
+
+    watcher = DirectoryWatcher(tmpdir, interval=0, settle_time=0)
+    batches = watcher.batches(max_polls=4)
+    # The initial scan finds file1.txt, which is reported once its size
+    # and modification time are found not to have changed:
+    assert [entry.relpath for entry in next(batches)] == ["file1.txt"]
+
+    # file2.txt's CLOSE_WRITE event is lost in the overflow:
+    with open(os.path.join(tmpdir, "file2.txt"), 'w') as datafile:
+        datafile.write("Hello again!\n")
+    assert [entry.relpath for entry in next(batches)] == ["file2.txt"]
+    watcher.close()
+
+    shutil.rmtree(tmpdir)
@@ -0,0 +1,35 @@
+"""
+test_stream.py
+
+Tests for the streaming views used for large listings
+"""
+import logging
+
+from six import StringIO
+
+from mtclient.views.stream import render_csv
+
+
+def test_render_csv_fields_from_first_record(caplog):
+    """
+    Test that the CSV header is taken from the first record, so fields
+    which only appear in later records are left out with a warning, and
+    missing fields are left empty
+    """
+    records = [
+        dict(id=1, filename="file1.txt", replicas=[]),
+        dict(id=2, filename="file2.txt", replicas=[], mimetype="text/plain"),
+        dict(id=3, mimetype="text/plain"),
+    ]
+    stream = StringIO()
+    with caplog.at_level(logging.WARNING):
+        render_csv(iter(records), stream)
+    assert stream.getvalue().splitlines() == [
+        "filename,id,replicas",
+        "file1.txt,1,[]",
+        "file2.txt,2,[]",
+        ",3,"]
+    # The warning is only logged once for each field:
+    warnings = [record.getMessage() for record in caplog.records]
+    assert len(warnings) == 1
+    assert "mimetype" in warnings[0]
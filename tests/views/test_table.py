@@ -0,0 +1,82 @@
+"""
+test_table.py
+
+Tests for drawing large tables with FastTable
+"""
+from six import StringIO
+from texttable import Texttable
+
+from mtclient.models.datafile import DataFile
+from mtclient.models.resultset import ResultSet
+from mtclient.views.datafile import render_datafiles_as_table
+from mtclient.views.table import FastTable, SAMPLE_SIZE, new_table
+
+
+def build_table(table):
+    """
+    Add some single-line and multi-line rows to table
+    """
+    table.set_cols_align(['r', 'l', 'l'])
+    table.set_cols_valign(['m', 'm', 'b'])
+    table.header(["ID", "Filename", "URI"])
+    table.add_row([1, "test1.txt", "ds1/test1.txt"])
+    table.add_row([22, "a much longer filename.txt", "uri1\nuri2\nuri3"])
+    table.add_row([333, "multi\nline", "\n"])
+    return table
+
+
+def test_fast_table_matches_texttable():
+    """
+    Test that FastTable draws the same table as Texttable(max_width=0)
+    """
+    expected = build_table(Texttable(max_width=0)).draw()
+    fast_table = build_table(FastTable())
+    assert fast_table.draw() == expected
+    assert list(fast_table.draw_lines()) == expected.split("\n")
+    assert FastTable().draw() is None
+
+
+def test_fast_table_sample_size():
+    """
+    Test computing FastTable's column widths from a sample of the rows
+    """
+    table = FastTable(sample_size=1)
+    table.header(["ID", "Filename"])
+    table.add_row([1, "a.txt"])
+    table.add_row([2, "longer.txt"])
+    lines = list(table.draw_lines())
+    assert lines[0] == "+----+----------+"
+    assert lines[3] == "| 1  | a.txt    |"
+    assert lines[5] == "| 2  | longer.txt |"
+
+
+def test_render_large_datafile_table():
+    """
+    Test that large result sets are drawn with FastTable
+    """
+    assert isinstance(new_table(10), Texttable)
+    assert isinstance(new_table(10, threshold=5), FastTable)
+    assert new_table(10, threshold=5).sample_size == SAMPLE_SIZE
+
+    objects = [
+        dict(id=index, dataset="/api/v1/dataset/1/", directory="",
+             filename="file%s.txt" % index, size=1024, md5sum="d41d8cd9",
+             replicas=[dict(id=index, location="default",
+                            uri="ds1/file%s.txt" % index, verified=True)])
+        for index in range(1, 1202)
+    ]
+    datafiles = ResultSet(DataFile, "/api/v1/dataset_file/", dict(
+        meta=dict(total_count=len(objects), limit=len(objects), offset=0,
+                  next=None),
+        objects=objects))
+    lines = render_datafiles_as_table(datafiles, display_heading=False) \
+        .split("\n")
+    assert lines[1] == ("| DataFile ID |   Filename   | Storage Box | "
+                        "      URI        | Verified |  Size  | MD5 Sum  |")
+    assert lines[3] == ("|           1 | file1.txt    | default     | "
+                        "ds1/file1.txt    | True     |   1 KB | d41d8cd9 |")
+    assert len(lines) == 4 + 2 * len(objects)
+
+    stream = StringIO()
+    assert render_datafiles_as_table(datafiles, stream=stream) is None
+    assert stream.getvalue() == render_datafiles_as_table(datafiles)